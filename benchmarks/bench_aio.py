@@ -0,0 +1,89 @@
+"""`etebase.aio` compared with pushing every blocking call into `run_in_executor`.
+
+Both variants keep `--concurrency` `ItemManager.list` calls in flight on one event loop, and both block a
+thread per call that's running. The executor variant gets as many threads as there are calls (as callers did
+before), while `etebase.aio` caps them at the size of its pool and queues the rest. We report wall time and the
+peak number of threads in the process.
+"""
+
+import argparse
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from etebase import FetchOptions, aio
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+class ThreadCounter:
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(0.001):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_executor(it_mgr, calls: int, concurrency: int):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def one():
+            await loop.run_in_executor(executor, lambda: list(it_mgr.list(FetchOptions().limit(50)).data))
+
+        await _gather_bounded(one, calls, concurrency)
+
+
+async def run_aio(it_mgr: aio.ItemManager, calls: int, concurrency: int):
+    async def one():
+        list((await it_mgr.list(FetchOptions().limit(50))).data)
+
+    await _gather_bounded(one, calls, concurrency)
+
+
+async def _gather_bounded(func, calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            await func()
+
+    await asyncio.gather(*(bounded() for _ in range(calls)))
+
+
+def measure(name: str, coro_func, *args):
+    with ThreadCounter() as counter, Timer() as timer:
+        asyncio.run(coro_func(*args))
+    return {"variant": name, "seconds": timer.elapsed, "peak threads": counter.peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency in seconds")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    with mock_server(latency=args.latency) as server:
+        account = restore_account(server.url)
+        col = populate(account, num_items=50)
+        it_mgr = account.get_collection_manager().get_item_manager(col)
+        results = [
+            measure("executor", run_executor, it_mgr, args.calls, args.concurrency),
+            measure("etebase.aio", run_aio, aio.ItemManager(it_mgr), args.calls, args.concurrency),
+        ]
+    report("{} ItemManager.list calls, {} in flight".format(args.calls, args.concurrency), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Per-item cost of `ItemManager.batch` for batch sizes from 10 to 100k items.
+
+For every batch size we report the time spent marshalling the Python wrappers (the part the Python layer
+controls) and the end-to-end time of `batch()` against the stand-in server, both per item.
+"""
+
+import argparse
+
+from common import Timer, mock_server, report, restore_account, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        col_mgr = restore_account(server.url).get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Benchmark"}, b"")
+        col_mgr.upload(col)
+        it_mgr = col_mgr.get_item_manager(col)
+        for size in args.sizes:
+            items = [it_mgr.create({"type": "bench"}, b"") for _ in range(size)]
+            with Timer() as old_marshal:
+                list(map(lambda x: x._inner, items))
+            with Timer() as marshal:
+                [x._inner for x in items]
+            with Timer() as batch:
+                it_mgr.batch(items)
+            results.append({
+                "items": size,
+                "old marshal us": old_marshal.elapsed / size * 1e6,
+                "marshal us": marshal.elapsed / size * 1e6,
+                "batch us": batch.elapsed / size * 1e6,
+            })
+    report("ItemManager.batch, per item", results)
+
+
+if __name__ == "__main__":
+    main()
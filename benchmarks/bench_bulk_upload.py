@@ -0,0 +1,43 @@
+"""Throughput of `ItemManager.bulk_upload` against the stand-in server.
+
+Imports `--items` new items with different `max_in_flight` settings and compares them with a single
+sequential `batch()` per chunk. The server adds `--latency` ms of delay to every request, so overlapping
+chunks shows up as higher items/s.
+"""
+
+import argparse
+
+from common import Timer, mock_server, report, restore_account, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency", type=float, default=20, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server(args.latency / 1000) as server:
+        col_mgr = restore_account(server.url).get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Benchmark"}, b"")
+        col_mgr.upload(col)
+        it_mgr = col_mgr.get_item_manager(col)
+        entries = [({"type": "bench", "n": i}, b"content") for i in range(args.items)]
+
+        with Timer() as timer:
+            for i in range(0, args.items, args.chunk_size):
+                it_mgr.batch([it_mgr.create(meta, content) for meta, content in entries[i:i + args.chunk_size]])
+        results.append({"mode": "sequential batch", "items/s": args.items / timer.elapsed})
+
+        for in_flight in args.in_flight:
+            with Timer() as timer:
+                uploaded = it_mgr.bulk_upload(entries, chunk_size=args.chunk_size, max_in_flight=in_flight)
+            assert all(result.ok for result in uploaded)
+            results.append({"mode": "bulk_upload x{}".format(in_flight), "items/s": args.items / timer.elapsed})
+    report("Importing {} items".format(args.items), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Decrypt calls and time when repeatedly reading `meta`/`content` over many items.
+
+The items are walked several times in order, which alternates instances on every access. We count how
+often the bindings are asked to decrypt, and compare against the old class-wide `lru_cache(maxsize=1)`.
+Runs fully offline: items are created locally and never uploaded.
+"""
+
+import argparse
+import functools
+
+import etebase
+from etebase import Item
+
+from common import Timer, report, restore_account
+
+
+class CountingInner:
+    """Forwards to a native item, counting the calls that decrypt."""
+
+    counts = {"get_meta_raw": 0, "get_content": 0}
+
+    def __init__(self, inner):
+        self._wrapped = inner
+
+    def __getattr__(self, name):
+        attr = getattr(self._wrapped, name)
+        if name in self.counts:
+            self.counts[name] += 1
+        return attr
+
+
+def _legacy_cached_property(f):
+    return property(functools.lru_cache(maxsize=1)(f))
+
+
+class LegacyItem(Item):
+    @_legacy_cached_property
+    def meta(self):
+        return etebase.msgpack_decode(bytes(self._inner.get_meta_raw()))
+
+    @_legacy_cached_property
+    def content(self):
+        return bytes(self._inner.get_content())
+
+
+def run(name: str, cls, inners, passes: int):
+    items = [cls(CountingInner(inner)) for inner in inners]
+    for key in CountingInner.counts:
+        CountingInner.counts[key] = 0
+    with Timer() as timer:
+        for _ in range(passes):
+            for item in items:
+                item.meta
+                item.content
+    decrypts = sum(CountingInner.counts.values())
+    return {"variant": name, "seconds": timer.elapsed, "decrypts/item": decrypts / len(items)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+
+    col_mgr = restore_account(etebase.DEFAULT_SERVER_URL).get_collection_manager()
+    it_mgr = col_mgr.get_item_manager(col_mgr.create("bench.coltype", {"name": "Benchmark"}, b""))
+    inners = [it_mgr.create({"type": "bench", "name": str(i)}, b"content")._inner for i in range(args.items)]
+    results = [
+        run("lru_cache(1)", LegacyItem, inners, args.passes),
+        run("per-instance", Item, inners, args.passes),
+    ]
+    report("{} items, {} passes over meta+content".format(args.items, args.passes), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Cost of the `fetch(col_uid)` + `get_item_manager(col)` request prologue, with and without the cache.
+
+Creates `--collections` collections and then serves `--requests` requests, each picking a collection at
+random (skewed towards a few hot ones) and getting an item manager for it. The server adds `--latency` ms to
+every request. With `CollectionManager.enable_cache` we also report the hit rates.
+"""
+
+import argparse
+import random
+
+from common import Timer, mock_server, report, restore_account, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--collections", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--cache-size", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--latency", type=float, default=2, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        account = restore_account(server.url)
+        col_mgr = account.get_collection_manager()
+        uids = []
+        for i in range(args.collections):
+            col = col_mgr.create(COL_TYPE, {"name": "Benchmark {}".format(i)}, b"")
+            col_mgr.upload(col)
+            uids.append(col.uid)
+        server.latency = args.latency / 1000
+        rng = random.Random(0)
+        requests = [uids[min(int(rng.expovariate(10 / args.collections)), args.collections - 1)]
+                    for _ in range(args.requests)]
+
+        def run(col_mgr):
+            with Timer() as timer:
+                for uid in requests:
+                    col_mgr.get_item_manager(col_mgr.fetch(uid))
+            return timer.elapsed / args.requests * 1000
+
+        results.append({"cache size": 0, "ms/request": run(account.get_collection_manager()),
+                        "collection hits": 0.0, "manager hits": 0.0})
+        for cache_size in args.cache_size:
+            col_mgr = account.get_collection_manager()
+            col_mgr.enable_cache(cache_size)
+            elapsed = run(col_mgr)
+            stats = col_mgr.cache_stats
+            results.append({
+                "cache size": cache_size,
+                "ms/request": elapsed,
+                "collection hits": stats["collections"].hit_rate,
+                "manager hits": stats["item_managers"].hit_rate,
+            })
+    report("fetch + get_item_manager", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Copies and peak memory when setting and reading large item content.
+
+For every payload size we spawn a fresh interpreter that creates an item from a `bytearray` (through a
+`memoryview`, so no intermediate `bytes`), reads `content` back and reports:
+
+* python copies: peak Python-heap allocations divided by the payload size (from `tracemalloc`), i.e. how
+  many payload-sized Python objects were created along the way.
+* peak RSS growth, in multiples of the payload size, which also covers the allocations made in Rust.
+
+Runs fully offline.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+import etebase
+
+from common import Timer, report, restore_account
+
+MB = 1024 * 1024
+
+
+def measure(size: int):
+    col_mgr = restore_account(etebase.DEFAULT_SERVER_URL).get_collection_manager()
+    it_mgr = col_mgr.get_item_manager(col_mgr.create("bench.coltype", {"name": "Benchmark"}, b""))
+    payload = bytearray(size)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    tracemalloc.start()
+    with Timer() as timer:
+        item = it_mgr.create_raw(etebase.msgpack_encode({}), memoryview(payload))
+        content = item.content
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(content) == size
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - baseline_rss
+    return {
+        "MB": size // MB,
+        "seconds": timer.elapsed,
+        "python copies": python_peak / size,
+        "RSS growth": rss_growth / size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Payload sizes in MB")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(measure(args.single * MB)))
+        return
+
+    results = []
+    for size in args.sizes:
+        out = subprocess.run([sys.executable, __file__, "--single", str(size)], check=True, capture_output=True)
+        results.append(json.loads(out.stdout))
+    report("Item content round trip", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Decrypting a whole `ItemListResponse`: per-item `meta`/`content` compared with `decrypt_all()`.
+
+Lists `--items` items from the stand-in server in a single page and times reading `uid`, `etag`, `meta` and
+`content` of every item through the `Item` wrappers, and the same through one `decrypt_all()` call, which
+decrypts on a Rust thread pool.
+"""
+
+import argparse
+
+from etebase import FetchOptions
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--content-size", type=int, default=256)
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        account = restore_account(server.url)
+        col_mgr = account.get_collection_manager()
+        for num_items in args.items:
+            col = populate(account, num_items, args.content_size)
+            response = col_mgr.get_item_manager(col).list(FetchOptions().limit(num_items))
+
+            with Timer() as per_item:
+                rows = [(item.uid, item.etag, item.meta, item.content) for item in response.data]
+            with Timer() as decrypt_all:
+                decrypted = response.decrypt_all()
+            assert rows == decrypted
+            results.append({
+                "items": num_items,
+                "per item ms": per_item.elapsed * 1000,
+                "decrypt_all ms": decrypt_all.elapsed * 1000,
+                "speedup": per_item.elapsed / decrypt_all.elapsed,
+            })
+    report("Decrypting an ItemListResponse", results)
+
+
+if __name__ == "__main__":
+    main()
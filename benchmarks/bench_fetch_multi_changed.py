@@ -0,0 +1,55 @@
+"""Revalidating a local copy of a collection: `fetch_updates` with the full items vs `fetch_multi_changed` with
+etags.
+
+Uploads `--items` items, changes `--changed` of them on the server, and then asks which ones changed, once
+keeping the `Item`s around for `fetch_updates` and once with just a `{uid: etag}` mapping like one saved by a
+previous run. The server adds `--latency` ms of delay to every request.
+"""
+
+import argparse
+
+from etebase import FetchOptions
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency", type=float, default=20, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        account = restore_account(server.url)
+        col = populate(account, args.items)
+        it_mgr = account.get_collection_manager().get_item_manager(col)
+        items = list(it_mgr.iter_all(FetchOptions().limit(1000)))
+        etags = {item.uid: item.etag for item in items}
+
+        updated = [it_mgr.fetch(item.uid) for item in items[:args.changed]]
+        for item in updated:
+            item.meta = {"type": "bench", "updated": True}
+        it_mgr.batch(updated)
+        server.latency = args.latency / 1000
+
+        with Timer() as timer:
+            changed = []
+            for i in range(0, len(items), args.chunk_size):
+                changed.extend(it_mgr.fetch_updates(items[i:i + args.chunk_size]).data)
+        assert len(changed) == args.changed
+        results.append({"mode": "fetch_updates (sequential)", "items/s": args.items / timer.elapsed})
+
+        for in_flight in args.in_flight:
+            with Timer() as timer:
+                changed = it_mgr.fetch_multi_changed(etags, chunk_size=args.chunk_size, max_in_flight=in_flight)
+            assert len(changed) == args.changed
+            results.append({"mode": "fetch_multi_changed x{}".format(in_flight), "items/s": args.items / timer.elapsed})
+    report("Revalidating {} items".format(args.items), results)
+
+
+if __name__ == "__main__":
+    main()
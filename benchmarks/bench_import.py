@@ -0,0 +1,53 @@
+"""Cold start cost of `import etebase`, with the native extension and msgpack loaded lazily vs on import.
+
+Every case runs `--runs` fresh interpreters, and reports the median wall time of the interpreter (including its
+own startup, shown by the `python` case) and the cumulative `-X importtime` of `etebase` itself.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("python", "pass"),
+    ("import etebase", "import etebase"),
+    # What every `import etebase` paid before the loading was made lazy
+    ("+ native & msgpack", "import etebase; etebase.Utils; etebase.msgpack_encode({})"),
+]
+
+
+def run(code: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                          stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    elapsed = time.perf_counter() - start
+    import_time = 0
+    for line in proc.stderr.splitlines():
+        if line.endswith("| etebase"):
+            import_time = int(line.split("|")[1])
+    return elapsed, import_time / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    for name, code in CASES:
+        runs = [run(code) for _ in range(args.runs)]
+        results.append({"case": name, "wall ms": statistics.median(r[0] for r in runs) * 1000,
+                        "etebase ms": statistics.median(r[1] for r in runs) * 1000})
+    report("Cold start ({} runs, median)".format(args.runs), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Searching item names: listing and scanning `meta` on every query vs `etebase.index.MetadataIndex`.
+
+Indexes `--items` items once (timed separately, as it happens during sync) and then runs the same substring
+and mtime-range queries both ways.
+"""
+
+import argparse
+import random
+
+from etebase import FetchOptions
+from etebase.index import MetadataIndex
+
+from common import Timer, mock_server, report, restore_account, COL_TYPE
+
+WORDS = ["holiday", "tax", "receipt", "notes", "photo", "invoice", "draft", "meeting", "plan", "report"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    results = []
+    with mock_server() as server:
+        col_mgr = restore_account(server.url).get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Search"}, b"")
+        col_mgr.upload(col)
+        it_mgr = col_mgr.get_item_manager(col)
+        for start in range(0, args.items, 1000):
+            it_mgr.batch([
+                it_mgr.create({"type": "file", "name": "{} {} {}".format(rand.choice(WORDS), rand.choice(WORDS), i),
+                               "mtime": i}, b"")
+                for i in range(start, min(start + 1000, args.items))
+            ])
+        queries = [(rand.choice(WORDS)[1:4], rand.randrange(args.items)) for _ in range(args.queries)]
+
+        def scan(word, mtime_from):
+            return [item.uid for item in it_mgr.iter_all(FetchOptions().limit(1000))
+                    if word in item.meta.get("name", "") and item.meta.get("mtime", 0) >= mtime_from]
+
+        with Timer() as timer:
+            for word, mtime_from in queries:
+                scan(word, mtime_from)
+        results.append({"mode": "list + scan meta", "ms/query": timer.elapsed / args.queries * 1e3})
+
+        with MetadataIndex() as index:
+            with Timer() as index_timer:
+                for page in it_mgr.iter_pages(FetchOptions().limit(1000)):
+                    index.update(col.uid, page.data)
+            for use_fts in (True, False):
+                index.has_fts = use_fts
+                with Timer() as timer:
+                    for word, mtime_from in queries:
+                        index.search(name=word, mtime_from=mtime_from)
+                results.append({"mode": "index ({})".format("fts" if use_fts else "like"),
+                                "ms/query": timer.elapsed / args.queries * 1e3})
+    report("Searching {} items (indexing took {:.2f}s)".format(args.items, index_timer.elapsed), results)
+
+
+if __name__ == "__main__":
+    main()
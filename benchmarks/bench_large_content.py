@@ -0,0 +1,57 @@
+"""Memory used when moving a large item between files.
+
+Creates a (sparse) file of `--size` MB, loads it into an item with `Item.set_content_from` (which memory
+maps the file) and writes the decrypted content out again with `Item.write_content_to`. We report the peak
+Python-heap allocations against the `--chunk-size` buffer budget, and the peak RSS growth in multiples of
+the payload size. The encryption itself happens in the etebase crate, which keeps the whole plaintext and
+ciphertext of an item in memory, so the RSS growth is bounded by a small multiple of the payload.
+
+Runs fully offline.
+"""
+
+import argparse
+import resource
+import tempfile
+import tracemalloc
+
+import etebase
+
+from common import Timer, report, restore_account
+
+MB = 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1024, help="Payload size in MB")
+    parser.add_argument("--chunk-size", type=int, default=1, help="Write buffer in MB")
+    args = parser.parse_args()
+    size = args.size * MB
+    chunk_size = args.chunk_size * MB
+
+    col_mgr = restore_account(etebase.DEFAULT_SERVER_URL).get_collection_manager()
+    it_mgr = col_mgr.get_item_manager(col_mgr.create("bench.coltype", {"name": "Benchmark"}, b""))
+    item = it_mgr.create({}, b"")
+
+    with tempfile.TemporaryFile() as src, tempfile.TemporaryFile() as dst:
+        src.truncate(size)
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        tracemalloc.start()
+        with Timer() as timer:
+            item.set_content_from(src)
+            item.write_content_to(dst, chunk_size)
+        _, python_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - baseline_rss
+        assert dst.tell() == size
+
+    report("Moving a {} MB item file to file".format(args.size), [{
+        "seconds": timer.elapsed,
+        "python peak MB": python_peak / MB,
+        "budget MB": chunk_size / MB,
+        "RSS growth": rss_growth / size,
+    }])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Memory held by the Python wrappers of cached items.
+
+Creates `--items` items, then measures (with `tracemalloc`) what wrapping the native items in `Item` costs,
+and what reading `meta` (whose decoded value is cached on the wrapper) adds on top, both per item. The native
+items themselves and the decoded metadata dictionaries are not part of the first figure. Runs fully offline.
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+import etebase
+from etebase import Item
+
+from common import report, restore_account
+
+
+def measure(func) -> int:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    ret = func()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, ret
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    col_mgr = restore_account(etebase.DEFAULT_SERVER_URL).get_collection_manager()
+    it_mgr = col_mgr.get_item_manager(col_mgr.create("bench.coltype", {"name": "Benchmark"}, b""))
+    natives = [it_mgr.create({"type": "bench"}, b"")._inner for _ in range(args.items)]
+
+    wrappers_size, items = measure(lambda: [Item(native) for native in natives])
+    list_size = sys.getsizeof(items)
+    meta_size, _ = measure(lambda: [item.meta for item in items])
+    report("Per cached item", [{
+        "items": args.items,
+        "wrapper bytes": (wrappers_size - list_size) / args.items,
+        "sizeof(Item)": sys.getsizeof(items[0]),
+        "with meta": (wrappers_size - list_size + meta_size) / args.items,
+    }])
+
+
+if __name__ == "__main__":
+    main()
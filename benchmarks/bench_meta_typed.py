@@ -0,0 +1,51 @@
+"""Building a list view (name and mtime of every item): `meta` dicts vs `meta_typed` vs `meta_typed_all()`.
+
+Each mode fetches the same `--items` items page by page (the fetch is included in the timings) and
+reads two fields per item.
+"""
+
+import argparse
+
+from etebase import FetchOptions
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+def list_view(it_mgr, read_page):
+    rows = []
+    stoken = None
+    done = False
+    while not done:
+        page = it_mgr.list(FetchOptions().limit(100).stoken(stoken))
+        rows.extend(read_page(page))
+        stoken = page.stoken
+        done = page.done
+    return rows
+
+
+MODES = {
+    "meta": lambda page: [(item.meta.get("name"), item.meta.get("mtime")) for item in page.data],
+    "meta_typed": lambda page: [(item.meta_typed.name, item.meta_typed.mtime) for item in page.data],
+    "meta_typed_all()": lambda page: [(meta.name, meta.mtime) for meta in page.meta_typed_all()],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        account = restore_account(server.url)
+        it_mgr = account.get_collection_manager().get_item_manager(populate(account, args.items))
+        for mode, read_page in MODES.items():
+            with Timer() as timer:
+                rows = list_view(it_mgr, read_page)
+            assert len(rows) == args.items
+            results.append({"mode": mode, "total s": timer.elapsed, "us/item": timer.elapsed / args.items * 1e6})
+    report("List view of {} items".format(args.items), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Connections opened when many accounts share one `Client`, compared with a `Client` per account.
+
+Restores `--accounts` accounts and has each of them make `--requests` small requests from a pool of
+threads. We report the wall time, the connections the server accepted and the client side `pool_stats`.
+The stand-in server speaks plain HTTP, so the savings on a real (TLS) server are larger than shown here.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from etebase import Client, Account
+
+from common import Timer, mock_server, report, STORED_SESSION, COL_TYPE
+
+
+def run(server_url: str, clients, requests: int, threads: int):
+    def work(client):
+        account = Account.restore(client, STORED_SESSION, None)
+        account.force_server_url(server_url)
+        col_mgr = account.get_collection_manager()
+        for _ in range(requests):
+            col_mgr.list(COL_TYPE)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, clients))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5, help="Requests per account")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=2, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server(args.latency / 1000) as server:
+        def make_client(**kwargs):
+            return Client("etebase_bench", server.url, **kwargs)
+
+        modes = [
+            ("client per account", lambda: [make_client() for _ in range(args.accounts)]),
+            ("shared client", lambda: [make_client()] * args.accounts),
+            ("shared, max {}/host".format(args.threads // 2),
+             lambda: [make_client(max_connections_per_host=args.threads // 2)] * args.accounts),
+        ]
+        for name, make_clients in modes:
+            clients = make_clients()
+            before = dict(server.stats)
+            with Timer() as timer:
+                run(server.url, clients, args.requests, args.threads)
+            unique = {id(client): client for client in clients}.values()
+            results.append({
+                "mode": name,
+                "seconds": timer.elapsed,
+                "requests": server.stats["requests"] - before["requests"],
+                "connections": server.stats["connections"] - before["connections"],
+                "reused (estimated)": sum(client.pool_stats.reused_estimate for client in unique),
+            })
+    report("{} accounts, {} requests each".format(args.accounts, args.requests), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Manager calls against an overloaded server, without a retry policy vs with `etebase.RetryPolicy`.
+
+`--threads` workers each make `--calls` list calls while the stand-in server fails `--error-rate` of the
+requests with a 503 (and a `Retry-After` of `--retry-after` seconds, if given). Reports how many calls
+succeeded, how long they took and how many requests reached the server, also with a shared `RateLimiter`.
+"""
+
+import argparse
+import threading
+
+from etebase import Account, Client, FetchOptions, RateLimiter, RetryPolicy
+
+from common import STORED_SESSION, Timer, mock_server, populate, report, restore_account
+
+
+def run(server, col, policy, threads: int, calls: int):
+    client = Client("etebase_bench", server.url, retry_policy=policy)
+    account = Account.restore(client, STORED_SESSION, None)
+    account.force_server_url(server.url)
+    it_mgr = account.get_collection_manager().get_item_manager(col)
+    ok = []
+
+    def worker():
+        for _ in range(calls):
+            try:
+                it_mgr.list(FetchOptions().limit(10))
+                ok.append(True)
+            except Exception:
+                pass
+
+    requests = server.stats["requests"]
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    with Timer() as timer:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    return {"succeeded": len(ok), "total s": timer.elapsed, "requests": server.stats["requests"] - requests}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument("--rate", type=float, default=200, help="Requests/s allowed by the rate limiter")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        col = populate(restore_account(server.url), 10)
+        server.error_rate = args.error_rate
+        server.retry_after = args.retry_after
+        modes = [
+            ("no retries", None),
+            ("RetryPolicy", RetryPolicy(base_delay=0.01)),
+            ("RetryPolicy + RateLimiter", RetryPolicy(base_delay=0.01, rate_limiter=RateLimiter(args.rate, 10))),
+        ]
+        for mode, policy in modes:
+            results.append(dict(mode=mode, **run(server, col, policy, args.threads, args.calls)))
+    report("{} x {} calls, {:.0%} of the requests failing".format(args.threads, args.calls, args.error_rate),
+           results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Per-request overhead of restoring an account, with and without `etebase.SessionPool`.
+
+Simulates a stateless worker serving `--requests` requests for `--users` users (picked uniformly at random)
+and times getting a collection manager for each request, once restoring the account every time and once
+through a `SessionPool` of `--pool-size` sessions. Runs fully offline.
+"""
+
+import argparse
+import random
+
+import etebase
+from etebase import Account, Client, SessionPool
+
+from common import Timer, report, STORED_SESSION
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--pool-size", type=int, nargs="+", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    client = Client("etebase_bench", etebase.DEFAULT_SERVER_URL)
+    rng = random.Random(0)
+    users = ["user{}".format(rng.randrange(args.users)) for _ in range(args.requests)]
+
+    results = []
+    with Timer() as timer:
+        for _ in users:
+            Account.restore(client, STORED_SESSION, None).get_collection_manager()
+    results.append({"mode": "restore", "us/request": timer.elapsed / args.requests * 1e6, "hit rate": 0.0})
+
+    for pool_size in args.pool_size:
+        pool = SessionPool(client, max_size=pool_size)
+        with Timer() as timer:
+            for user in users:
+                with pool.checkout(user, STORED_SESSION) as session:
+                    session.collection_manager
+        stats = pool.stats
+        results.append({
+            "mode": "pool of {}".format(pool_size),
+            "us/request": timer.elapsed / args.requests * 1e6,
+            "hit rate": stats.hits / (stats.hits + stats.misses),
+        })
+    report("{} requests for {} users".format(args.requests, args.users), results)
+
+
+if __name__ == "__main__":
+    main()
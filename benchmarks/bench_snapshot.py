@@ -0,0 +1,61 @@
+"""Snapshotting a collection to a file and warm-starting from it, per item vs `cache_save_many`/`cache_load_many`.
+
+The per-item variant writes every `cache_save` blob with a length prefix, the bulk one writes the snapshot as
+is, and loads it back from an mmap of the file.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+
+from etebase import FetchOptions
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--content-size", type=int, default=256)
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server, tempfile.TemporaryDirectory() as tmpdir:
+        account = restore_account(server.url)
+        col = populate(account, args.items, args.content_size, batch_size=1000)
+        it_mgr = account.get_collection_manager().get_item_manager(col)
+        items = list(it_mgr.iter_all(FetchOptions().limit(1000)))
+        path = os.path.join(tmpdir, "snapshot")
+
+        with Timer() as save_timer, open(path, "wb") as f:
+            for item in items:
+                cached = it_mgr.cache_save(item)
+                f.write(struct.pack("<I", len(cached)))
+                f.write(cached)
+        with Timer() as load_timer, open(path, "rb") as f:
+            data = f.read()
+            loaded = []
+            pos = 0
+            while pos < len(data):
+                (size,) = struct.unpack_from("<I", data, pos)
+                loaded.append(it_mgr.cache_load(data[pos + 4:pos + 4 + size]))
+                pos += 4 + size
+        assert len(loaded) == len(items)
+        results.append({"mode": "per item", "save s": save_timer.elapsed, "load s": load_timer.elapsed,
+                        "MB": os.path.getsize(path) / 1e6})
+
+        with Timer() as save_timer, open(path, "wb") as f:
+            f.write(it_mgr.cache_save_many(items))
+        with Timer() as load_timer, open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                loaded = it_mgr.cache_load_many(snapshot)
+        assert len(loaded) == len(items)
+        results.append({"mode": "snapshot", "save s": save_timer.elapsed, "load s": load_timer.elapsed,
+                        "MB": os.path.getsize(path) / 1e6})
+    report("Snapshotting {} items".format(len(items)), results)
+
+
+if __name__ == "__main__":
+    main()
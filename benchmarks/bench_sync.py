@@ -0,0 +1,45 @@
+"""Time to sync an account with many collections, serially and with `etebase.sync.AccountSyncer`.
+
+The serial baseline lists the collections and then the items of every collection one after the other. The
+server adds `--latency` ms of delay to every request, so the serial sync grows with the number of
+collections while the parallel one is bounded by the slowest collection (and the worker count).
+"""
+
+import argparse
+
+from etebase.sync import AccountSyncer
+
+from common import Timer, mock_server, report, restore_account, populate, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--collections", type=int, default=100)
+    parser.add_argument("--items", type=int, default=20, help="Items per collection")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 16, 32])
+    parser.add_argument("--latency", type=float, default=20, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        account = restore_account(server.url)
+        for _ in range(args.collections):
+            populate(account, args.items)
+        server.latency = args.latency / 1000
+        col_mgr = account.get_collection_manager()
+
+        with Timer() as timer:
+            items = 0
+            for col in col_mgr.iter_all(COL_TYPE):
+                items += sum(1 for _ in col_mgr.get_item_manager(col).iter_all())
+        results.append({"mode": "serial", "seconds": timer.elapsed, "items": items})
+
+        for workers in args.workers:
+            with Timer() as timer:
+                result = AccountSyncer(col_mgr, COL_TYPE, max_workers=workers).sync()
+            results.append({"mode": "syncer x{}".format(workers), "seconds": timer.elapsed, "items": result.items})
+    report("Syncing {} collections".format(args.collections), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Throughput of concurrent syncers sharing one process.
+
+Every thread restores its own account and repeatedly lists the items of a collection on a stand-in
+server with simulated network latency. With the GIL released around network calls the throughput
+should scale with the number of threads until the server (or the CPU) becomes the bottleneck.
+"""
+
+import argparse
+import threading
+
+from etebase import FetchOptions
+
+from common import Timer, mock_server, populate, report, restore_account
+
+
+def run(server_url: str, col_uid: str, num_threads: int, calls_per_thread: int):
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker():
+        account = restore_account(server_url)
+        col_mgr = account.get_collection_manager()
+        it_mgr = col_mgr.get_item_manager(col_mgr.fetch(col_uid))
+        barrier.wait()
+        for _ in range(calls_per_thread):
+            list(it_mgr.list(FetchOptions().limit(50)).data)
+
+    threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    with Timer() as timer:
+        for thread in threads:
+            thread.join()
+    calls = num_threads * calls_per_thread
+    return {"threads": num_threads, "calls": calls, "seconds": timer.elapsed, "calls/s": calls / timer.elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency in seconds")
+    parser.add_argument("--calls", type=int, default=25, help="Calls per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    with mock_server(latency=args.latency) as server:
+        col = populate(restore_account(server.url), num_items=50)
+        results = [run(server.url, col.uid, num_threads, args.calls) for num_threads in args.threads]
+    report("ItemManager.list throughput (latency={}s)".format(args.latency), results)
+
+
+if __name__ == "__main__":
+    main()
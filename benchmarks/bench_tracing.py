@@ -0,0 +1,46 @@
+"""Overhead of the instrumentation hooks, and an example of the spans they produce.
+
+Times a cheap traced call (`ItemManager.cache_save`) without a tracer and with a callback tracer, then runs a
+`transaction` against the stand-in server and prints its span.
+"""
+
+import argparse
+
+from etebase import Client, Account
+
+from common import Timer, mock_server, report, STORED_SESSION, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--latency", type=float, default=5, help="Server latency in ms")
+    args = parser.parse_args()
+
+    spans = []
+    results = []
+    with mock_server(args.latency / 1000) as server:
+        for name, tracer in [("disabled", None), ("callback", spans.append)]:
+            account = Account.restore(Client("etebase_bench", server.url, tracer=tracer), STORED_SESSION, None)
+            account.force_server_url(server.url)
+            col_mgr = account.get_collection_manager()
+            col = col_mgr.create(COL_TYPE, {"name": "Tracing"}, b"")
+            it_mgr = col_mgr.get_item_manager(col)
+            item = it_mgr.create({"type": "bench"}, b"content")
+            with Timer() as timer:
+                for _ in range(args.calls):
+                    it_mgr.cache_save(item)
+            results.append({"tracer": name, "us/call": timer.elapsed / args.calls * 1e6})
+        report("ItemManager.cache_save", results)
+
+        col_mgr.upload(col)
+        items = [it_mgr.create({"type": "bench"}, b"x" * 1024) for _ in range(100)]
+        it_mgr.transaction(items)
+        span = spans[-1]
+        print(span)
+        for key, value in span.attributes.items():
+            print("  {}: {}".format(key, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Syncing many accounts with `etebase.workers.WorkerPool` on 1 to N worker processes.
+
+Every account fully syncs `--collections` collections of `--items` items each, reading the metadata and
+content of every item. The stand-in server runs in a process of its own, so that it doesn't compete with the
+benchmark for the GIL, but it's still a single (GIL-bound) process: once it's saturated, adding workers
+stops helping, so keep the number of workers below the number of cores minus one to measure the scaling.
+"""
+
+import argparse
+import multiprocessing
+import os
+
+from etebase.sync import AccountSyncer
+from etebase.workers import WorkerPool
+
+from common import STORED_SESSION, COL_TYPE, Timer, populate, report, restore_account
+from mock_server import MockServer
+
+
+def serve(conn):
+    server = MockServer()
+    conn.send(server.url)
+    server.serve_forever()
+
+
+def sync_and_read(session, col_type, checkpoints):
+    def on_items(col, changed, removed):
+        for item in changed:
+            item.meta
+            item.content
+
+    # Start from scratch every time, so every run does the same amount of work
+    return AccountSyncer(session.collection_manager, col_type, {}, on_items=on_items).sync()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=64)
+    parser.add_argument("--collections", type=int, default=4)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16) if n < (os.cpu_count() or 1)] or [1])
+    args = parser.parse_args()
+
+    conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child_conn,), daemon=True)
+    server.start()
+    url = conn.recv()
+
+    account = restore_account(url)
+    for _ in range(args.collections):
+        populate(account, args.items, content_size=1024)
+    accounts = {"account{}".format(i): (STORED_SESSION, {}) for i in range(args.accounts)}
+
+    results = []
+    for num_workers in args.workers:
+        with WorkerPool(COL_TYPE, url, num_workers=num_workers, sync=sync_and_read) as pool:
+            pool.sync(accounts)  # Warm up: start the workers and restore the sessions
+            with Timer() as timer:
+                synced = pool.sync(accounts)
+        errors = [result.error for result in synced.values() if result.error]
+        assert not errors, errors[0]
+        if not results:
+            baseline = timer.elapsed
+        results.append({"workers": num_workers, "accounts/s": args.accounts / timer.elapsed,
+                        "speedup": baseline / timer.elapsed})
+    server.terminate()
+    report("Syncing {} accounts ({} items each)".format(args.accounts, args.collections * args.items), results)
+
+
+if __name__ == "__main__":
+    main()
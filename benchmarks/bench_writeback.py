@@ -0,0 +1,54 @@
+"""An edit burst uploaded with a `transaction` per edit vs through `etebase.writeback.WriteBehindQueue`.
+
+Makes `--edits` edits spread over `--items` items, with `--latency` ms of server delay per request, and
+reports the edits/s and the number of requests each way.
+"""
+
+import argparse
+
+from etebase.writeback import WriteBehindQueue
+
+from common import Timer, mock_server, report, restore_account, COL_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20, help="Server latency in ms")
+    args = parser.parse_args()
+
+    results = []
+    with mock_server() as server:
+        col_mgr = restore_account(server.url).get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Edits"}, b"")
+        col_mgr.upload(col)
+        it_mgr = col_mgr.get_item_manager(col)
+        items = [it_mgr.create({"type": "note", "name": str(i)}, b"") for i in range(args.items)]
+        it_mgr.batch(items)
+        server.latency = args.latency / 1000
+
+        def edit(i):
+            item = items[i % len(items)]
+            item.content = "edit {}".format(i).encode()
+            return item
+
+        requests = server.stats["requests"]
+        with Timer() as timer:
+            for i in range(args.edits):
+                it_mgr.transaction([edit(i)])
+        results.append({"mode": "transaction per edit", "edits/s": args.edits / timer.elapsed,
+                        "requests": server.stats["requests"] - requests})
+
+        requests = server.stats["requests"]
+        with Timer() as timer:
+            with WriteBehindQueue(it_mgr, max_pending=50, max_delay=0.5) as queue:
+                for i in range(args.edits):
+                    queue.put(edit(i))
+        results.append({"mode": "write-behind queue", "edits/s": args.edits / timer.elapsed,
+                        "requests": server.stats["requests"] - requests})
+    report("{} edits of {} items".format(args.edits, args.items), results)
+
+
+if __name__ == "__main__":
+    main()
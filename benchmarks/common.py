@@ -0,0 +1,62 @@
+import contextlib
+import time
+import typing as t
+
+from etebase import Client, Account
+
+from mock_server import MockServer
+
+# The same stored session the smoke test uses. Restoring it doesn't need the server.
+STORED_SESSION = "gqd2ZXJzaW9uAa1lbmNyeXB0ZWREYXRhxQGr_KWyDChQ6tXOJwJKf0Kw3QyR99itPIF3vZ5w6pVXSIq7AWul3fIXjIZOsBEwTVRumw7e9Af38D5oIL2VLNPLlmTOMjzIvuB00z3zDMFbH8pwrg2p_FvAhLHGjUGoXzU2XIxS4If7rQUfEz1zWkHPqWMrj4hACML5fks302dOUw7OsSMekcQaaVqMyj82MY3lG2qj8CL6ykSED7nW6OYWwMBJ1rSDGXhQRd5JuCGl6kgAHxKS6gkkIAWeUKjC6-Th2etk1XPKDiks0SZrQpmuXG8h_TBdd4igjRUqnIk09z5wvJFViXIU4M3pQomyFPk3Slh7KHvWhzxG0zbC2kUngQZ5h-LbVTLuT_TQWjYmHiOIihenrzl7z9MLebUq6vuwusZMRJ1Atau0Y2HcOzulYt4tLRP49d56qFEId3R4xomZ666hy-EFodsbzpxEKHeBUro3_gifOOKR8zkyLKTRz1UipZfKvnWk_RHFgZlSClRsXyaP34wstUavSiz-HNmTEmflNQKM7Awfel108FcSbW9NQAogW2Y2copP-P-R-DiHThrXmgDsWkTQFA"
+COL_TYPE = "bench.coltype"
+
+
+def restore_account(server_url: str) -> Account:
+    client = Client("etebase_bench", server_url)
+    account = Account.restore(client, STORED_SESSION, None)
+    account.force_server_url(server_url)
+    return account
+
+
+def populate(account: Account, num_items: int, content_size: int = 16, batch_size: int = 100):
+    """Create a collection holding `num_items` items on the server and return it."""
+    col_mgr = account.get_collection_manager()
+    col = col_mgr.create(COL_TYPE, {"name": "Benchmark"}, b"")
+    col_mgr.upload(col)
+    it_mgr = col_mgr.get_item_manager(col)
+    content = b"x" * content_size
+    for start in range(0, num_items, batch_size):
+        count = min(batch_size, num_items - start)
+        items = [it_mgr.create({"type": "bench", "name": str(start + i)}, content) for i in range(count)]
+        it_mgr.batch(items)
+    return col
+
+
+@contextlib.contextmanager
+def mock_server(latency: float = 0.0):
+    with MockServer(latency=latency) as server:
+        yield server
+
+
+class Timer:
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._start
+
+
+def report(name: str, results: t.List[t.Dict]):
+    print(name)
+    if not results:
+        return
+    keys = list(results[0].keys())
+    print("  " + "  ".join("{:>14}".format(key) for key in keys))
+    for row in results:
+        print("  " + "  ".join(
+            "{:>14.3f}".format(row[key]) if isinstance(row[key], float) else "{:>14}".format(row[key])
+            for key in keys))
@@ -0,0 +1,459 @@
+"""A small in-process stand-in for the Etebase server.
+
+It implements just enough of the REST API for the benchmarks to run offline: collections, items,
+batch/transaction with etag checks, stoken based pagination and chunk storage. Encrypted payloads
+are stored opaquely (exactly like the real server does), signatures and auth tokens are not
+verified. An optional per-request latency lets us emulate a remote server, and errors (e.g. 429 or 503
+with a `Retry-After`) can be injected to emulate an overloaded one.
+"""
+
+import random
+import re
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+
+API_PREFIX = "/api/v1/"
+DEFAULT_LIMIT = 50
+
+
+def _pack(content) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)
+
+
+def _unpack(content: bytes):
+    return msgpack.unpackb(content, raw=False)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, detail: str = ""):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class Storage:
+    """In-memory state of the stand-in server, guarded by a single lock."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counter = 0
+        # col_uid -> {"collection": dict, "stoken": int}
+        self.collections: t.Dict[str, t.Dict] = {}
+        # col_uid -> {item_uid: {"item": dict, "stoken": int, "revisions": [dict]}}
+        self.items: t.Dict[str, t.Dict[str, t.Dict]] = {}
+        # (col_uid, item_uid, chunk_uid) -> bytes
+        self.chunks: t.Dict[t.Tuple[str, str, str], bytes] = {}
+        # username -> signup body
+        self.users: t.Dict[str, t.Dict] = {}
+
+    def next_stoken(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def _store_chunks(self, col_uid: str, item: t.Dict):
+        chunks = []
+        for chunk_uid, chunk_content in item["content"]["chunks"]:
+            if chunk_content is not None:
+                self.chunks[(col_uid, item["uid"], chunk_uid)] = chunk_content
+            chunks.append([chunk_uid, None])
+        return chunks
+
+    def _with_chunks(self, col_uid: str, item: t.Dict, prefetch: str) -> t.Dict:
+        ret = dict(item)
+        content = dict(item["content"])
+        if prefetch == "medium":
+            content["chunks"] = [[chunk_uid, None] for chunk_uid, _ in content["chunks"]]
+        else:
+            content["chunks"] = [
+                [chunk_uid, self.chunks.get((col_uid, item["uid"], chunk_uid))]
+                for chunk_uid, _ in content["chunks"]
+            ]
+        ret["content"] = content
+        ret["etag"] = content["uid"]
+        return ret
+
+    def save_item(self, col_uid: str, item: t.Dict, stoken: int):
+        content = dict(item["content"])
+        content["chunks"] = self._store_chunks(col_uid, item)
+        stored = {
+            "uid": item["uid"],
+            "version": item["version"],
+            "encryptionKey": item.get("encryptionKey"),
+            "content": content,
+        }
+        entry = self.items.setdefault(col_uid, {}).get(item["uid"])
+        revisions = entry["revisions"] if entry is not None else []
+        revisions.insert(0, stored)
+        self.items[col_uid][item["uid"]] = {"item": stored, "stoken": stoken, "revisions": revisions}
+        if item["uid"] == col_uid:
+            self.collections[col_uid]["collection"]["item"] = stored
+        self.collections[col_uid]["stoken"] = stoken
+
+    def current_etag(self, col_uid: str, item_uid: str) -> t.Optional[str]:
+        entry = self.items.get(col_uid, {}).get(item_uid)
+        return entry["item"]["content"]["uid"] if entry is not None else None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def _respond(self, status: int, body: t.Optional[bytes] = None, content_type="application/msgpack",
+                 headers: t.Optional[t.Dict[str, str]] = None):
+        body = body or b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        query = {key: value[-1] for key, value in parse_qs(url.query).items()}
+        body = self._body()
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        fault = self.server.next_fault()
+        if fault is not None:
+            status, retry_after = fault
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+            self._respond(status, _pack({"code": "error", "detail": "Injected error"}), headers=headers)
+            return
+        try:
+            if not url.path.startswith(API_PREFIX):
+                raise HttpError(404)
+            path = url.path[len(API_PREFIX):]
+            for route_method, pattern, handler in ROUTES:
+                if route_method != method:
+                    continue
+                match = pattern.fullmatch(path)
+                if match is not None:
+                    status, ret = handler(self.server.storage, query, body, *match.groups())
+                    break
+            else:
+                raise HttpError(404)
+        except HttpError as e:
+            self._respond(e.status, _pack({"code": "error", "detail": e.detail}))
+            return
+        if isinstance(ret, (bytes, bytearray)):
+            self._respond(status, ret, "application/octet-stream")
+        else:
+            self._respond(status, _pack(ret) if ret is not None else None)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def _limit(query) -> int:
+    return int(query.get("limit", DEFAULT_LIMIT))
+
+
+def _paginate(entries: t.List[t.Tuple[int, t.Any]], query) -> t.Tuple[t.List[t.Any], str, bool]:
+    since = int(query.get("stoken") or 0)
+    entries = sorted((entry for entry in entries if entry[0] > since), key=lambda x: x[0])
+    limit = _limit(query)
+    page = entries[:limit]
+    stoken = page[-1][0] if page else since
+    return [value for _, value in page], str(stoken), len(entries) <= limit
+
+
+# Authentication
+
+
+def is_etebase(storage: Storage, query, body):
+    return 200, None
+
+
+def signup(storage: Storage, query, body):
+    signup_body = _unpack(body)
+    username = signup_body["user"]["username"]
+    with storage.lock:
+        if username in storage.users:
+            raise HttpError(409, "User already exists")
+        storage.users[username] = signup_body
+    return 201, _login_response(signup_body)
+
+
+def _login_response(signup_body):
+    return {
+        "token": "mock-token-" + signup_body["user"]["username"],
+        "user": {
+            "username": signup_body["user"]["username"],
+            "email": signup_body["user"]["email"],
+            "pubkey": signup_body["pubkey"],
+            "encryptedContent": signup_body["encryptedContent"],
+        },
+    }
+
+
+def login_challenge(storage: Storage, query, body):
+    username = _unpack(body)["username"]
+    with storage.lock:
+        user = storage.users.get(username)
+    if user is None:
+        raise HttpError(401, "User not found")
+    return 200, {"challenge": b"\0" * 32, "salt": user["salt"], "version": 1}
+
+
+def login(storage: Storage, query, body):
+    response = _unpack(_unpack(body)["response"])
+    with storage.lock:
+        user = storage.users.get(response["username"])
+    if user is None:
+        raise HttpError(401, "User not found")
+    return 200, _login_response(user)
+
+
+def logout(storage: Storage, query, body):
+    return 204, None
+
+
+# Collections
+
+
+def _collection_response(storage: Storage, entry, prefetch: str):
+    ret = dict(entry["collection"])
+    ret["item"] = storage._with_chunks(ret["item"]["uid"], ret["item"], prefetch)
+    ret["accessLevel"] = 1
+    ret["stoken"] = str(entry["stoken"])
+    return ret
+
+
+def collection_list_multi(storage: Storage, query, body):
+    col_types = _unpack(body)["collectionTypes"]
+    prefetch = query.get("prefetch", "auto")
+    with storage.lock:
+        entries = [
+            (entry["stoken"], _collection_response(storage, entry, prefetch))
+            for entry in storage.collections.values()
+            if entry["collection"].get("collectionType") in col_types
+        ]
+    data, stoken, done = _paginate(entries, query)
+    return 200, {"data": data, "stoken": stoken, "done": done, "removedMemberships": None}
+
+
+def collection_create(storage: Storage, query, body):
+    collection = _unpack(body)
+    col_uid = collection["item"]["uid"]
+    with storage.lock:
+        if col_uid in storage.collections:
+            raise HttpError(409, "Collection already exists")
+        stoken = storage.next_stoken()
+        storage.collections[col_uid] = {"collection": collection, "stoken": stoken}
+        storage.save_item(col_uid, collection["item"], stoken)
+    return 201, None
+
+
+def collection_fetch(storage: Storage, query, body, col_uid: str):
+    with storage.lock:
+        entry = storage.collections.get(col_uid)
+        if entry is None:
+            raise HttpError(404, "Collection not found")
+        return 200, _collection_response(storage, entry, query.get("prefetch", "auto"))
+
+
+# Items
+
+
+def _get_items(storage: Storage, col_uid: str) -> t.Dict[str, t.Dict]:
+    if col_uid not in storage.collections:
+        raise HttpError(404, "Collection not found")
+    return storage.items.setdefault(col_uid, {})
+
+
+def item_list(storage: Storage, query, body, col_uid: str):
+    prefetch = query.get("prefetch", "auto")
+    with storage.lock:
+        entries = [
+            (entry["stoken"], storage._with_chunks(col_uid, entry["item"], prefetch))
+            for item_uid, entry in _get_items(storage, col_uid).items()
+            if item_uid != col_uid
+        ]
+    data, stoken, done = _paginate(entries, query)
+    return 200, {"data": data, "stoken": stoken, "done": done}
+
+
+def item_fetch(storage: Storage, query, body, col_uid: str, item_uid: str):
+    with storage.lock:
+        entry = _get_items(storage, col_uid).get(item_uid)
+        if entry is None:
+            raise HttpError(404, "Item not found")
+        return 200, storage._with_chunks(col_uid, entry["item"], query.get("prefetch", "auto"))
+
+
+def item_revisions(storage: Storage, query, body, col_uid: str, item_uid: str):
+    with storage.lock:
+        entry = _get_items(storage, col_uid).get(item_uid)
+        if entry is None:
+            raise HttpError(404, "Item not found")
+        revisions = [storage._with_chunks(col_uid, rev, query.get("prefetch", "auto")) for rev in entry["revisions"]]
+    start = int(query.get("iterator") or 0)
+    limit = _limit(query)
+    data = revisions[start:start + limit]
+    done = start + limit >= len(revisions)
+    return 200, {"data": data, "iterator": str(start + len(data)), "done": done}
+
+
+def item_fetch_updates(storage: Storage, query, body, col_uid: str):
+    prefetch = query.get("prefetch", "auto")
+    wanted = _unpack(body)
+    with storage.lock:
+        items = _get_items(storage, col_uid)
+        data = [
+            storage._with_chunks(col_uid, items[dep["uid"]]["item"], prefetch)
+            for dep in wanted
+            if dep["uid"] in items and storage.current_etag(col_uid, dep["uid"]) != dep.get("etag")
+        ]
+        stoken = str(storage.collections[col_uid]["stoken"])
+    return 200, {"data": data, "stoken": stoken, "done": True}
+
+
+def _item_batch(storage: Storage, body, col_uid: str, check_etags: bool):
+    batch = _unpack(body)
+    with storage.lock:
+        _get_items(storage, col_uid)
+        if check_etags:
+            for item in batch["items"]:
+                if storage.current_etag(col_uid, item["uid"]) != item.get("etag"):
+                    raise HttpError(409, "Wrong etag for item " + item["uid"])
+            for dep in batch.get("deps") or []:
+                if storage.current_etag(col_uid, dep["uid"]) != dep.get("etag"):
+                    raise HttpError(409, "Wrong etag for dependency " + dep["uid"])
+        for item in batch["items"]:
+            storage.save_item(col_uid, item, storage.next_stoken())
+    return 200, None
+
+
+def item_batch(storage: Storage, query, body, col_uid: str):
+    return _item_batch(storage, body, col_uid, check_etags=False)
+
+
+def item_transaction(storage: Storage, query, body, col_uid: str):
+    return _item_batch(storage, body, col_uid, check_etags=True)
+
+
+def chunk_upload(storage: Storage, query, body, col_uid: str, item_uid: str, chunk_uid: str):
+    with storage.lock:
+        if (col_uid, item_uid, chunk_uid) in storage.chunks:
+            raise HttpError(409, "Chunk already exists")
+        storage.chunks[(col_uid, item_uid, chunk_uid)] = body
+    return 201, None
+
+
+def chunk_download(storage: Storage, query, body, col_uid: str, item_uid: str, chunk_uid: str):
+    with storage.lock:
+        chunk = storage.chunks.get((col_uid, item_uid, chunk_uid))
+    if chunk is None:
+        raise HttpError(404, "Chunk not found")
+    return 200, chunk
+
+
+_UID = r"([^/]+)"
+ROUTES = [
+    ("GET", r"authentication/is_etebase/", is_etebase),
+    ("POST", r"authentication/signup/", signup),
+    ("POST", r"authentication/login_challenge/", login_challenge),
+    ("POST", r"authentication/login/", login),
+    ("POST", r"authentication/logout/", logout),
+    ("POST", r"collection/list_multi/", collection_list_multi),
+    ("POST", r"collection/", collection_create),
+    ("GET", r"collection/{uid}/", collection_fetch),
+    ("GET", r"collection/{uid}/item/", item_list),
+    ("POST", r"collection/{uid}/item/fetch_updates/", item_fetch_updates),
+    ("POST", r"collection/{uid}/item/batch/", item_batch),
+    ("POST", r"collection/{uid}/item/transaction/", item_transaction),
+    ("GET", r"collection/{uid}/item/{uid}/", item_fetch),
+    ("GET", r"collection/{uid}/item/{uid}/revision/", item_revisions),
+    ("PUT", r"collection/{uid}/item/{uid}/chunk/{uid}/", chunk_upload),
+    ("GET", r"collection/{uid}/item/{uid}/chunk/{uid}/download/", chunk_download),
+]
+ROUTES = [(method, re.compile(pattern.replace("{uid}", _UID)), handler) for method, pattern, handler in ROUTES]
+
+
+class MockServer(ThreadingHTTPServer):
+    """A threaded stand-in server listening on localhost.
+
+    Use it as a context manager; `url` is suitable for passing to `etebase.Client`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.latency = latency
+        self.storage = Storage()
+        self.stats = {"requests": 0, "connections": 0, "faults": 0}
+        self.stats_lock = threading.Lock()
+        # Errors returned instead of handling the next requests, then a fraction of all the requests
+        self.faults: t.List[t.Tuple[int, t.Optional[float]]] = []
+        self.error_rate = 0.0
+        self.error_status = 503
+        self.retry_after: t.Optional[float] = None
+        self._thread: t.Optional[threading.Thread] = None
+
+    def inject(self, status: int, count: int = 1, retry_after: t.Optional[float] = None):
+        """Fail the next `count` requests with `status`"""
+        with self.stats_lock:
+            self.faults.extend([(status, retry_after)] * count)
+
+    def next_fault(self) -> t.Optional[t.Tuple[int, t.Optional[float]]]:
+        with self.stats_lock:
+            if self.faults:
+                fault = self.faults.pop(0)
+            elif self.error_rate and random.random() < self.error_rate:
+                fault = (self.error_status, self.retry_after)
+            else:
+                return None
+            self.stats["faults"] += 1
+            return fault
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}/".format(self.server_address[1])
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,246 @@
+"""The benchmark suite: times the core operations of the bindings against the stand-in server.
+
+Every case is run `--repeat` times (after a warm-up run) and we record the min, median and mean wall time,
+plus the median per unit (item, collection, ...) where that makes sense. Results are written as JSON with
+`--output`, and `--compare` checks them against an earlier run, exiting with status 1 if any case got slower
+by more than `--threshold`, so the suite can gate releases of the bindings and of the etebase crate.
+
+Runs fully offline, for example:
+
+    python suite.py --output new.json --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import typing as t
+
+import etebase
+from etebase import Account, Client, FetchOptions, User
+
+from common import Timer, mock_server, populate, report, restore_account, COL_TYPE
+
+# name -> (setup, default repeat). `setup(ctx)` prepares the data and returns `(run, units)`, where `run` is
+# the callable we time and `units` the number of things it processes.
+CASES: t.Dict[str, t.Tuple[t.Callable[["Context"], t.Tuple[t.Callable[[], t.Any], int]], int]] = {}
+
+
+def case(name: str, repeat: int=5):
+    def decorator(setup):
+        CASES[name] = (setup, repeat)
+        return setup
+    return decorator
+
+
+class Context:
+    def __init__(self, server):
+        self.server = server
+        self.account = restore_account(server.url)
+        self.col_mgr = self.account.get_collection_manager()
+        self._populated: t.Dict[int, etebase.Collection] = {}
+
+    def populated(self, num_items: int, content_size: int=16) -> etebase.Collection:
+        if num_items not in self._populated:
+            self._populated[num_items] = populate(self.account, num_items, content_size)
+        return self._populated[num_items]
+
+
+@case("account.signup+login", repeat=3)
+def account_login(ctx: Context):
+    client = Client("etebase_bench", ctx.server.url)
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        username = "bench{}".format(next(counter))
+        Account.signup(client, User(username, username + "@localhost"), "password")
+        Account.login(client, username, "password")
+
+    return run, 1
+
+
+@case("account.restore", repeat=20)
+def account_restore(ctx: Context):
+    client = Client("etebase_bench", ctx.server.url)
+    stored = ctx.account.save(None)
+    return lambda: Account.restore(client, stored, None), 1
+
+
+@case("collections.list")
+def collections_list(ctx: Context):
+    for i in range(20):
+        ctx.col_mgr.upload(ctx.col_mgr.create(COL_TYPE, {"name": "List {}".format(i)}, b""))
+
+    def run():
+        return sum(1 for _ in ctx.col_mgr.iter_all(COL_TYPE, FetchOptions().limit(100)))
+
+    return run, run()
+
+
+@case("items.list_paginated")
+def items_list(ctx: Context):
+    it_mgr = ctx.col_mgr.get_item_manager(ctx.populated(1000))
+    return lambda: sum(1 for _ in it_mgr.iter_all(FetchOptions().limit(100))), 1000
+
+
+def _batch_case(method: str, size: int):
+    def setup(ctx: Context):
+        col = ctx.col_mgr.create(COL_TYPE, {"name": "Batch"}, b"")
+        ctx.col_mgr.upload(col)
+        it_mgr = ctx.col_mgr.get_item_manager(col)
+
+        def run():
+            items = [it_mgr.create({"type": "bench"}, b"content") for _ in range(size)]
+            getattr(it_mgr, method)(items)
+
+        return run, size
+    return setup
+
+
+for _size in (10, 100, 1000):
+    case("items.batch[{}]".format(_size))(_batch_case("batch", _size))
+    case("items.transaction[{}]".format(_size))(_batch_case("transaction", _size))
+
+
+@case("items.fetch_multi[100]")
+def items_fetch_multi(ctx: Context):
+    it_mgr = ctx.col_mgr.get_item_manager(ctx.populated(1000))
+    uids = [item.uid for item in it_mgr.iter_all(FetchOptions().limit(100))][::10]
+    return lambda: list(it_mgr.fetch_multi(uids).data), len(uids)
+
+
+@case("items.cache_save+load")
+def items_cache(ctx: Context):
+    it_mgr = ctx.col_mgr.get_item_manager(ctx.populated(1000))
+    items = list(it_mgr.iter_all(FetchOptions().limit(1000)))
+
+    def run():
+        for item in items:
+            it_mgr.cache_load(it_mgr.cache_save(item))
+
+    return run, len(items)
+
+
+@case("items.cache_save_many+load_many")
+def items_snapshot(ctx: Context):
+    it_mgr = ctx.col_mgr.get_item_manager(ctx.populated(1000))
+    items = list(it_mgr.iter_all(FetchOptions().limit(1000)))
+    return lambda: it_mgr.cache_load_many(it_mgr.cache_save_many(items)), len(items)
+
+
+def _content_case(size: int):
+    def setup(ctx: Context):
+        col = ctx.col_mgr.create(COL_TYPE, {"name": "Content"}, b"")
+        ctx.col_mgr.upload(col)
+        it_mgr = ctx.col_mgr.get_item_manager(col)
+        payload = bytes(size)
+
+        def run():
+            item = it_mgr.create({"type": "bench"}, payload)
+            it_mgr.batch([item])
+            assert len(it_mgr.fetch(item.uid).content) == size
+
+        return run, 1
+    return setup
+
+
+for _size in (1, 10):
+    case("items.content_roundtrip[{}MB]".format(_size), repeat=3)(_content_case(_size * 1024 * 1024))
+
+
+def run_case(ctx: Context, name: str, repeat: t.Optional[int]) -> t.Dict[str, t.Any]:
+    setup, default_repeat = CASES[name]
+    run, units = setup(ctx)
+    run()  # Warm up
+    timings = []
+    for _ in range(repeat or default_repeat):
+        with Timer() as timer:
+            run()
+        timings.append(timer.elapsed)
+    median = statistics.median(timings)
+    return {
+        "repeat": len(timings),
+        "units": units,
+        "min": min(timings),
+        "median": median,
+        "mean": statistics.mean(timings),
+        "median_per_unit": median / units if units else None,
+    }
+
+
+def metadata() -> t.Dict[str, t.Any]:
+    try:
+        from importlib.metadata import version
+        bindings_version = version("etebase")
+    except Exception:
+        bindings_version = None
+    return {
+        "etebase": bindings_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results: t.Dict[str, t.Dict], baseline: t.Dict[str, t.Dict], threshold: float) -> t.List[str]:
+    """Print how every case did compared with `baseline`, returns the names of the cases that regressed"""
+    rows = []
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        rows.append({"case": name, "baseline s": baseline[name]["median"], "now s": result["median"],
+                     "ratio": ratio, "status": "REGRESSED" if regressed else "ok"})
+    report("Compared with baseline", rows)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", nargs="+", default=[], help="Only run cases containing any of these")
+    parser.add_argument("--repeat", type=int, help="Override the number of timed runs of every case")
+    parser.add_argument("--latency", type=float, default=0, help="Server latency in ms")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, as a fraction")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.filter or any(f in name for f in args.filter)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = {}
+    with mock_server() as server:
+        ctx = Context(server)
+        server.latency = args.latency / 1000
+        for name in names:
+            results[name] = run_case(ctx, name, args.repeat)
+
+    report("Benchmark suite", [
+        {"case": name, "median s": result["median"], "min s": result["min"], "units": result["units"],
+         "us/unit": result["median_per_unit"] * 1e6}
+        for name, result in results.items()
+    ])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,139 @@
-import typing as t
+import collections
+import collections.abc
+import contextlib
+import contextvars
 import functools
+import importlib
+import io
+import itertools
+import mmap
+import os
+import random
+import stat
+import threading
+import time
+import typing as t
+import warnings
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class _LazyModule:
+    """Stands in for a module until one of its attributes is used, then imports it and takes its place"""
+    __slots__ = ("_global_name", "_name")
+
+    def __init__(self, global_name: str, name: str):
+        self._global_name = global_name
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name, __name__)
+        globals()[self._global_name] = module
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return "<lazy module {!r}>".format(self._name)
+
+
+# The native extension and msgpack are only loaded on first use, which keeps `import etebase` fast for
+# short-lived processes (CLI tools, serverless handlers) that may never need them.
+if t.TYPE_CHECKING:
+    import msgpack
+    from . import etebase_python
+    from .etebase_python import CollectionAccessLevel, PrefetchOption, Utils  # noqa
+else:
+    msgpack = _LazyModule("msgpack", "msgpack")
+    etebase_python = _LazyModule("etebase_python", ".etebase_python")
+
+# Re-exported from the native module, loaded by `__getattr__` on first use
+_NATIVE_EXPORTS = ("CollectionAccessLevel", "PrefetchOption", "Utils")
+
+
+def __getattr__(name):
+    if name in _NATIVE_EXPORTS:
+        value = getattr(etebase_python, name)
+    elif name == "DEFAULT_SERVER_URL":
+        value = etebase_python.Client.get_default_server_url()
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NATIVE_EXPORTS) | {"DEFAULT_SERVER_URL"})
+
+
+Buffer = t.Union[bytes, bytearray, memoryview]
 
-import msgpack
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
-from .etebase_python import CollectionAccessLevel, PrefetchOption, Utils  # noqa
-from . import etebase_python
 
+class cached_property:
+    """A property that is computed once per instance and then cached on that instance.
 
-def cached_property(f):
-    return property(functools.lru_cache(maxsize=1)(f))
+    Unlike `functools.cached_property` this supports setters, works with `__slots__` (the class needs a
+    `_cached_<name>` slot per cached property), and the cached value of a single instance can be dropped with
+    `cache_clear(instance)`.
+    """
+
+    def __init__(self, fget, fset=None):
+        self.fget = fget
+        self.fset = fset
+        self.attrname = "_cached_" + fget.__name__
+        self.__doc__ = fget.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.attrname)
+        except AttributeError:
+            value = self.fget(instance)
+            setattr(instance, self.attrname, value)
+            return value
+
+    def __set__(self, instance, value):
+        if self.fset is None:
+            raise AttributeError("can't set attribute")
+        self.fset(instance, value)
+
+    def setter(self, fset):
+        return type(self)(self.fget, fset)
+
+    def cache_clear(self, instance):
+        try:
+            delattr(instance, self.attrname)
+        except AttributeError:
+            pass
+
+
+class _LazyList(collections.abc.Sequence):
+    """The wrappers of a list of native objects, created on first access and then kept"""
+
+    __slots__ = ("_native", "_wrap", "_wrapped")
+
+    def __init__(self, native: t.List, wrap: t.Callable):
+        self._native = native
+        self._wrap = wrap
+        self._wrapped = [None] * len(native)
+
+    def __len__(self):
+        return len(self._native)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._native)))]
+        ret = self._wrapped[index]
+        if ret is None:
+            ret = self._wrapped[index] = self._wrap(self._native[index])
+        return ret
+
+    def __iter__(self):
+        for i in range(len(self._native)):
+            yield self[i]
+
+    def __repr__(self):
+        return "[{}]".format(", ".join(repr(x) for x in self))
 
 
 def msgpack_encode(content: t.Union[t.Dict, t.List]) -> bytes:
@@ -25,7 +150,357 @@ def _inner(it):
     return getattr(it, "_inner", None)
 
 
-DEFAULT_SERVER_URL = etebase_python.Client.get_default_server_url()
+@contextlib.contextmanager
+def _map_file(fileobj, fileno: int) -> t.Iterator[Buffer]:
+    # Like `read()`, start from the current position and leave the file at its end
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        rest = view[fileobj.tell():]
+        try:
+            yield rest
+        finally:
+            # The map can only be closed once no views of it are left
+            rest.release()
+            view.release()
+    fileobj.seek(0, io.SEEK_END)
+
+
+def _read_buffer(fileobj) -> t.ContextManager[Buffer]:
+    """Expose the rest of `fileobj` as a buffer, memory mapping regular files instead of reading them"""
+    if isinstance(fileobj, (bytes, bytearray, memoryview, mmap.mmap)):
+        return contextlib.nullcontext(fileobj)
+    try:
+        fileno = fileobj.fileno()
+        file_stat = os.fstat(fileno)
+    except (AttributeError, OSError, ValueError):
+        file_stat = None
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+        # Not backed by a (non-empty, and thus mappable) regular file
+        return contextlib.nullcontext(fileobj.read())
+    return _map_file(fileobj, fileno)
+
+
+def _iter_pages(fetch, fetch_options: t.Optional["FetchOptions"], cursor: str, prefetch_next: bool):
+    """Yield the list responses returned by `fetch`, following the `cursor` ("stoken" or "iterator").
+
+    `fetch_options` is updated in place as we go. When `prefetch_next` is set, the next page is fetched in
+    the background while the caller processes the current one.
+    """
+    fetch_options = fetch_options if fetch_options is not None else FetchOptions()
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch_next else None
+    try:
+        response = fetch(fetch_options)
+        while True:
+            next_page = None
+            if not response.done:
+                getattr(fetch_options, cursor)(getattr(response, cursor))
+                if executor is not None:
+                    next_page = executor.submit(fetch, fetch_options)
+            yield response
+            if response.done:
+                return
+            response = next_page.result() if next_page is not None else fetch(fetch_options)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _map_chunks(func, iterable: t.Iterable, chunk_size: int, max_in_flight: int):
+    """Call `func(start, chunk)` for consecutive chunks of `iterable` on a thread pool, yielding the results.
+
+    At most `max_in_flight` chunks are in progress (or read from `iterable`) at a time. Results are yielded in
+    completion order.
+    """
+    iterable = iter(iterable)
+    stack = getattr(_trace_state, "stack", None)
+    if stack:
+        # Traced calls made by the workers are children of the traced call in progress here (for OpenTelemetry
+        # through the context), and the requests of the workers are added to it once they all finished
+        parent = stack[-1][0]
+        worker_stats = []
+
+        def run(start: int, chunk: t.List):
+            _trace_state.stack = [(parent, [0] * 7)]
+            before = etebase_python.Transport.thread_stats()
+            try:
+                return func(start, chunk)
+            finally:
+                after = etebase_python.Transport.thread_stats()
+                worker_stats.append([y - x for x, y in zip(before, after)])
+                del _trace_state.stack
+
+        def submit(executor: ThreadPoolExecutor, start: int, chunk: t.List):
+            return executor.submit(contextvars.copy_context().run, run, start, chunk)
+    else:
+        worker_stats = None
+
+        def submit(executor: ThreadPoolExecutor, start: int, chunk: t.List):
+            return executor.submit(func, start, chunk)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            in_flight = set()
+            for start in itertools.count(0, chunk_size):
+                chunk = list(itertools.islice(iterable, chunk_size))
+                if not chunk:
+                    break
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                in_flight.add(submit(executor, start, chunk))
+            for future in in_flight:
+                yield future.result()
+    finally:
+        if worker_stats:
+            for _, totals in stack:
+                for stats in worker_stats:
+                    totals[:] = (x + y for x, y in zip(totals, stats))
+
+
+class Span:
+    """What one traced call cost, handed to callback tracers once the call returned.
+
+    All times are in seconds. `native_time` is the time spent in the bindings with the GIL released, of which
+    `http_time` went to HTTP requests (`http_wait_time` waiting for a free connection and `http_headers_time`
+    until the response headers arrived). The rest of the native time (`crypto_time`) is encryption,
+    decryption and serialization, and `python_time` is what's left: the Python layer and waiting for the GIL.
+
+    Calls that spread their work over worker threads (`fetch_multi_changed`, `bulk_upload`) include the work of
+    those threads, so their `native_time` can exceed their `duration`.
+    """
+
+    __slots__ = ("name", "parent", "duration", "native_time", "http_requests", "http_wait_time", "http_headers_time",
+                 "http_time", "bytes_sent", "bytes_received", "items", "error")
+
+    def __init__(self, name: str, parent: t.Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.duration = 0.0
+        self.native_time = 0.0
+        self.http_requests = 0
+        self.http_wait_time = 0.0
+        self.http_headers_time = 0.0
+        self.http_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.items: t.Optional[int] = None
+        self.error: t.Optional[BaseException] = None
+
+    @property
+    def crypto_time(self) -> float:
+        return max(self.native_time - self.http_time, 0.0)
+
+    @property
+    def python_time(self) -> float:
+        return max(self.duration - self.native_time, 0.0)
+
+    @property
+    def attributes(self) -> t.Dict[str, t.Any]:
+        ret = {
+            "etebase.duration": self.duration,
+            "etebase.native_time": self.native_time,
+            "etebase.crypto_time": self.crypto_time,
+            "etebase.python_time": self.python_time,
+            "etebase.http.requests": self.http_requests,
+            "etebase.http.wait_time": self.http_wait_time,
+            "etebase.http.headers_time": self.http_headers_time,
+            "etebase.http.time": self.http_time,
+            "etebase.http.bytes_sent": self.bytes_sent,
+            "etebase.http.bytes_received": self.bytes_received,
+        }
+        if self.items is not None:
+            ret["etebase.items"] = self.items
+        return ret
+
+    def __repr__(self):
+        return "<Span {} {:.3f}ms http={:.3f}ms crypto={:.3f}ms python={:.3f}ms>".format(
+            self.name, self.duration * 1000, self.http_time * 1000, self.crypto_time * 1000, self.python_time * 1000)
+
+
+# Either a callable that gets a `Span` after every call, or an OpenTelemetry `Tracer`
+Tracer = t.Any
+
+_trace_state = threading.local()
+
+
+def _call_traced(tracer: Tracer, name: str, func, args, kwargs):
+    # Every traced call in progress on this thread, with the stats of the worker threads it used
+    stack = getattr(_trace_state, "stack", None)
+    if stack is None:
+        stack = _trace_state.stack = []
+    span = Span(name, stack[-1][0] if stack else None)
+    if args and isinstance(args[0], (list, tuple)):
+        span.items = len(args[0])
+    # OpenTelemetry tracers get a span that's current for the duration of the call, so that nested calls
+    # (and whatever the callee traces) are parented correctly.
+    start_span = getattr(tracer, "start_as_current_span", None)
+    otel_context = start_span(name) if start_span is not None else contextlib.nullcontext()
+    worker_stats = [0] * 7
+    stack.append((name, worker_stats))
+    before = etebase_python.Transport.thread_stats()
+    start = time.perf_counter()
+    try:
+        with otel_context as otel_span:
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                span.error = e
+                raise
+            finally:
+                span.duration = time.perf_counter() - start
+                after = etebase_python.Transport.thread_stats()
+                (native, span.http_requests, http_wait, http_headers, http_total, span.bytes_sent,
+                 span.bytes_received) = (y - x + w for x, y, w in zip(before, after, worker_stats))
+                span.native_time = native / 1e9
+                span.http_wait_time = http_wait / 1e9
+                span.http_headers_time = http_headers / 1e9
+                span.http_time = http_total / 1e9
+                if otel_span is not None:
+                    _report_span(lambda: [otel_span.set_attribute(key, value)
+                                          for key, value in span.attributes.items()])
+    finally:
+        stack.pop()
+        if start_span is None:
+            _report_span(lambda: tracer(span))
+
+
+def _report_span(report):
+    """Call `report`, without letting a broken tracer replace the result (or the exception) of the traced call"""
+    try:
+        report()
+    except Exception as e:
+        warnings.warn("Tracer failed: {!r}".format(e), RuntimeWarning, stacklevel=3)
+
+
+def _traced(func):
+    """Report the calls of a manager method to the tracer of the manager, if it has one"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tracer = self._tracer
+        if tracer is None:
+            return func(self, *args, **kwargs)
+        return _call_traced(tracer, name, functools.partial(func, self), args, kwargs)
+
+    return wrapper
+
+
+class RateLimiter:
+    """A token bucket: allows `rate` calls per second on average, and bursts of up to `burst` calls"""
+
+    def __init__(self, rate: float, burst: int=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting for one to be available if needed"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve the token right away (possibly going negative), so waiters are served in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RetryPolicy:
+    """How manager calls are retried when the server is overloaded or unreachable.
+
+    Failed calls are retried up to `max_attempts` times in total, with exponential backoff and full jitter
+    (a random delay between 0 and `base_delay * 2 ** attempt`, capped at `max_delay`), or after the
+    `Retry-After` the server asked for plus up to `base_delay` of jitter. Calls are only retried after
+    responses with one of `retry_statuses`, for which the server didn't process the request. Idempotent calls
+    (reads, and transactions, which fail with a conflict instead of being applied twice) are also retried after
+    `idempotent_retry_statuses`, where 0 stands for a request that failed without a response.
+
+    With a `rate_limiter`, every attempt first takes a token from it. Share one policy between all the clients
+    of a process to limit the process as a whole.
+    """
+
+    def __init__(self, max_attempts: int=5, base_delay: float=0.1, max_delay: float=30.0,
+                 retry_statuses: t.Collection[int]=(429, 503),
+                 idempotent_retry_statuses: t.Collection[int]=(0, 502, 504),
+                 rate_limiter: t.Optional[RateLimiter]=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.idempotent_retry_statuses = idempotent_retry_statuses
+        self.rate_limiter = rate_limiter
+
+    def delay(self, attempt: int, retry_after: t.Optional[float]) -> t.Optional[float]:
+        """How long to wait before retrying after the failed `attempt` (0-based), None to give up"""
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry(self, status: int, idempotent: bool) -> bool:
+        return status in self.retry_statuses or (idempotent and status in self.idempotent_retry_statuses)
+
+    def _requests(self) -> int:
+        """The number of requests made by the calling thread so far"""
+        return etebase_python.Transport.thread_stats()[1]
+
+    def _last_response(self) -> t.Tuple[int, t.Optional[float]]:
+        """The status and Retry-After of the last response received by the calling thread"""
+        return etebase_python.Transport.last_status(), etebase_python.Transport.last_retry_after()
+
+    def call(self, func: t.Callable[[], t.Any], idempotent: bool=True):
+        for attempt in itertools.count():
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            requests = self._requests()
+            try:
+                return func()
+            except Exception as e:
+                # Errors raised before any request was made (e.g. bad arguments) are never retried
+                if self._requests() == requests:
+                    raise
+                status, retry_after = self._last_response()
+                # The bindings raise untyped exceptions, so we record what the server answered for callers to
+                # tell errors apart (see `session.is_auth_error`). Nested calls keep the innermost status.
+                if not hasattr(e, "http_status"):
+                    e.http_status = status
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                delay = self.delay(attempt, retry_after) if self.should_retry(status, idempotent) else None
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+
+# The policy of managers without one, for code that needs its settings
+_NO_RETRIES = RetryPolicy(max_attempts=1)
+
+
+def _retried(idempotent: bool=True):
+    """Retry the calls of a manager method according to the retry policy of the manager, if it has one"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            policy = self._retry_policy
+            if policy is not None:
+                return policy.call(functools.partial(func, self, *args, **kwargs), idempotent)
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as e:
+                # Only failures pay for the `http_status`. Without counting requests up front we can't tell
+                # whether this call made one, so one failing before its first request gets an earlier status.
+                if not hasattr(e, "http_status"):
+                    e.http_status = etebase_python.Transport.last_status()
+                raise
+
+        return wrapper
+    return decorator
 
 
 def random_bytes(size: int):
@@ -39,14 +514,56 @@ def pretty_fingerprint(content):
 class Base64Url:
     @classmethod
     def from_base64(cls, value):
-        return bytes(Utils.from_base64(value))
+        return bytes(etebase_python.Utils.from_base64(value))
+
+    @classmethod
+    def to_base64(cls, value):
+        return etebase_python.Utils.to_base64(value)
+
+
+class PoolStats(t.NamedTuple):
+    """The requests made through a `Client`'s transport, and estimates of its connections.
 
-    to_base64 = Utils.to_base64
+    The HTTP client doesn't expose its connection pool, so `opened_estimate`, `reused_estimate` and
+    `idle_estimate` come from a model of its pooling policy. They can drift from the real pool, e.g. when the
+    server closes idle connections. `requests` and `in_flight` are exact.
+    """
+    requests: int
+    opened_estimate: int
+    reused_estimate: int
+    in_flight: int
+    idle_estimate: int
 
 
 class Client:
-    def __init__(self, client_name, server_url=DEFAULT_SERVER_URL):
-        self._inner = etebase_python.Client.new(client_name, server_url)
+    """The server to talk to, and the pooled HTTP transport shared by everything created from this client.
+
+    `max_connections_per_host` (0 for no limit) caps the requests in flight to a host over HTTP/1.1, while
+    requests multiplexed over HTTP/2 aren't capped. Up to `max_idle_per_host` connections are kept alive for
+    `idle_timeout` seconds (0 for ever). With `http2`, HTTP/2 is offered to HTTPS servers and used if they pick
+    it. `http2_prior_knowledge` uses HTTP/2 without asking first, also over plain HTTP (h2c), which only works
+    with servers known to speak it. See `pool_stats` for what the pool did.
+    """
+    __slots__ = ("_inner", "_transport", "tracer", "retry_policy", "__weakref__")
+
+    def __init__(self, client_name, server_url=None, max_connections_per_host: int=0,
+                 max_idle_per_host: int=32, idle_timeout: float=90.0, http2: bool=False,
+                 tracer: t.Optional[Tracer]=None, retry_policy: t.Optional[RetryPolicy]=None,
+                 http2_prior_knowledge: bool=False):
+        # Accounts logged in or restored with this client (and their managers) report to `tracer`, and retry
+        # failed calls according to `retry_policy`
+        self.tracer = tracer
+        self.retry_policy = retry_policy
+        if server_url is None:
+            server_url = etebase_python.Client.get_default_server_url()
+        # Every Account (and manager) created from this client shares the transport and its connection pool
+        self._transport = etebase_python.Transport(client_name, max_connections_per_host, max_idle_per_host,
+                                                   idle_timeout, http2, http2_prior_knowledge)
+        self._inner = etebase_python.Client.new_with_transport(server_url, self._transport)
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        return PoolStats(*self._transport.stats())
 
     @property
     def server_url(self) -> str:
@@ -58,6 +575,8 @@ class Client:
 
 
 class User:
+    __slots__ = ("_inner",)
+
     def __init__(self, username: str, email: str):
         self._inner = etebase_python.User(username, email)
 
@@ -79,8 +598,31 @@ class User:
 
 
 class Account:
-    def __init__(self, inner: etebase_python.Account):
+    __slots__ = ("_inner", "_tracer", "_retry_policy", "__weakref__")
+
+    def __init__(self, inner: "etebase_python.Account", tracer: t.Optional[Tracer]=None,
+                 retry_policy: t.Optional[RetryPolicy]=None):
         self._inner = inner
+        self._tracer = tracer
+        self._retry_policy = retry_policy
+
+    @property
+    def tracer(self) -> t.Optional[Tracer]:
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, value: t.Optional[Tracer]):
+        # Only affects the managers created after setting it
+        self._tracer = value
+
+    @property
+    def retry_policy(self) -> t.Optional[RetryPolicy]:
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value: t.Optional[RetryPolicy]):
+        # Only affects the managers created after setting it
+        self._retry_policy = value
 
     @classmethod
     def is_etebase_server(cls, client: Client):
@@ -88,48 +630,59 @@ class Account:
 
     @classmethod
     def login(cls, client: Client, username: str, password: str):
-        return cls(etebase_python.Account.login(client._inner, username, password))
+        return cls(etebase_python.Account.login(client._inner, username, password), client.tracer, client.retry_policy)
 
     @classmethod
     def login_key(cls, client: Client, username: str, key: bytes):
-        return cls(etebase_python.Account.login_key(client._inner, username, key))
+        return cls(etebase_python.Account.login_key(client._inner, username, key), client.tracer, client.retry_policy)
 
     @classmethod
     def signup(cls, client: Client, user: User, password: str):
-        return cls(etebase_python.Account.signup(client._inner, user._inner, password))
+        return cls(etebase_python.Account.signup(client._inner, user._inner, password), client.tracer,
+                   client.retry_policy)
 
     @classmethod
     def signup_key(cls, client: Client, user: User, key: bytes):
-        return cls(etebase_python.Account.signup_key(client._inner, user._inner, key))
+        return cls(etebase_python.Account.signup_key(client._inner, user._inner, key), client.tracer,
+                   client.retry_policy)
 
+    @_traced
+    @_retried()
     def fetch_token(self):
         self._inner.fetch_token()
 
     def force_server_url(self, api_base: str):
         self._inner.force_server_url(api_base)
 
+    @_traced
+    @_retried(idempotent=False)
     def change_password(self, password: str):
         self._inner.change_password(password)
 
+    @_traced
+    @_retried(idempotent=False)
     def logout(self):
         self._inner.logout()
 
     def get_collection_manager(self):
-        return CollectionManager(self._inner.get_collection_manager())
+        return CollectionManager(self._inner.get_collection_manager(), self._tracer, self._retry_policy)
 
     def get_invitation_manager(self):
-        return CollectionInvitationManager(self._inner.get_invitation_manager())
+        return CollectionInvitationManager(self._inner.get_invitation_manager(), self._tracer, self._retry_policy)
 
     def save(self, encryption_key: t.Optional[bytes]):
         return self._inner.save(encryption_key)
 
     @classmethod
     def restore(cls, client: Client, account_data_stored: str, encryption_key: t.Optional[bytes]):
-        return cls(etebase_python.Account.restore(client._inner, account_data_stored, encryption_key))
+        return cls(etebase_python.Account.restore(client._inner, account_data_stored, encryption_key),
+                   client.tracer, client.retry_policy)
 
 
 class RemovedCollection:
-    def __init__(self, inner: etebase_python.RemovedCollection):
+    __slots__ = ("_inner",)
+
+    def __init__(self, inner: "etebase_python.RemovedCollection"):
         self._inner = inner
 
     @property
@@ -138,84 +691,193 @@ class RemovedCollection:
 
 
 class CollectionListResponse:
-    def __init__(self, inner: etebase_python.CollectionListResponse):
+    __slots__ = ("_inner", "_cached_stoken", "_cached_data", "_cached_done", "_cached_removed_memberships")
+
+    def __init__(self, inner: "etebase_python.CollectionListResponse"):
         self._inner = inner
 
     @cached_property
     def stoken(self):
         return self._inner.get_stoken()
 
-    @property
+    @cached_property
     def data(self):
-        return map(lambda x: Collection(x), self._inner.get_data())
+        return _LazyList(self._inner.get_data(), Collection)
 
     @cached_property
     def done(self):
         return self._inner.is_done()
 
-    @property
+    @cached_property
     def removed_memberships(self):
-        return map(lambda x: RemovedCollection(x), self._inner.get_removed_memberships())
+        return _LazyList(self._inner.get_removed_memberships(), RemovedCollection)
 
 
 class ItemListResponse:
-    def __init__(self, inner: etebase_python.ItemListResponse):
+    __slots__ = ("_inner", "_cached_stoken", "_cached_data", "_cached_done")
+
+    def __init__(self, inner: "etebase_python.ItemListResponse"):
         self._inner = inner
 
     @cached_property
     def stoken(self):
         return self._inner.get_stoken()
 
-    @property
+    @cached_property
     def data(self):
-        return map(lambda x: Item(x), self._inner.get_data())
+        return _LazyList(self._inner.get_data(), Item)
 
     @cached_property
     def done(self):
         return self._inner.is_done()
 
+    def decrypt_all(self, with_content: bool=True) -> t.List[t.Tuple[str, str, t.Any, t.Optional[bytes]]]:
+        return [(uid, etag, msgpack_decode(meta), content)
+                for uid, etag, meta, content in self._inner.decrypt_all(with_content)]
+
+    def meta_typed_all(self) -> t.List["ItemMetadata"]:
+        """The `meta_typed` of every item in `data`, decrypted in parallel"""
+        return [ItemMetadata(meta) for meta in self._inner.meta_all()]
+
 
 class ItemRevisionsListResponse:
-    def __init__(self, inner: etebase_python.ItemRevisionsListResponse):
+    __slots__ = ("_inner", "_cached_iterator", "_cached_data", "_cached_done")
+
+    def __init__(self, inner: "etebase_python.ItemRevisionsListResponse"):
         self._inner = inner
 
     @cached_property
     def iterator(self):
         return self._inner.get_iterator()
 
-    @property
+    @cached_property
     def data(self):
-        return map(lambda x: Item(x), self._inner.get_data())
+        return _LazyList(self._inner.get_data(), Item)
 
     @cached_property
     def done(self):
         return self._inner.is_done()
 
 
+class BulkUploadResult:
+    __slots__ = ("index", "uid", "error")
+
+    def __init__(self, index: int, uid: t.Optional[str], error: t.Optional[Exception]=None):
+        self.index = index
+        self.uid = uid
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "BulkUploadResult(index={!r}, uid={!r}, error={!r})".format(self.index, self.uid, self.error)
+
+
+class CacheStats(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _LRUCache:
+    """A thread safe, size bounded LRU mapping of `key -> (etag, value)` with optional expiry"""
+
+    __slots__ = ("max_size", "max_age", "_entries", "_lock", "_hits", "_misses", "_evictions")
+
+    def __init__(self, max_size: int, max_age: t.Optional[float]=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries: "collections.OrderedDict[str, t.Tuple[float, str, t.Any]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str, etag: t.Optional[str]=None):
+        """Return the value of `key`, or `None` if it's missing, expired or (if given) has a different etag"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                added, entry_etag, value = entry
+                if (self.max_age is None or time.monotonic() - added < self.max_age) and \
+                        (etag is None or etag == entry_etag):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def etag(self, key: str) -> t.Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def put(self, key: str, etag: str, value: t.Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), etag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
+
+
 class FetchOptions:
+    __slots__ = ("_inner", "_values")
+
     def __init__(self):
         self._inner = etebase_python.FetchOptions()
+        # The native options can't be read back, so what was set is kept for `copy`
+        self._values: t.Dict[str, t.Any] = {}
 
     def limit(self, value: int):
         self._inner.limit(value)
+        self._values["limit"] = value
         return self
 
-    def prefetch(self, value: PrefetchOption):
+    def prefetch(self, value: "PrefetchOption"):
         self._inner.prefetch(value)
+        self._values["prefetch"] = value
         return self
 
     def with_collection(self, value: bool):
         self._inner.with_collection(value)
+        self._values["with_collection"] = value
         return self
 
     def iterator(self, value: t.Optional[str]):
         self._inner.iterator(value)
+        self._values["iterator"] = value
         return self
 
     def stoken(self, value: t.Optional[str]):
         self._inner.stoken(value)
+        self._values["stoken"] = value
         return self
 
+    def copy(self) -> "FetchOptions":
+        """A new `FetchOptions` with the same options set, for changing without affecting this one"""
+        ret = FetchOptions()
+        for name, value in self._values.items():
+            getattr(ret, name)(value)
+        return ret
+
 
 def _verify_col_meta(meta: t.Dict):
     if "name" not in meta:
@@ -224,37 +886,125 @@ def _verify_col_meta(meta: t.Dict):
 
 
 class CollectionManager:
-    def __init__(self, inner: etebase_python.CollectionManager):
+    __slots__ = ("_inner", "_tracer", "_retry_policy", "_collections_cache", "_item_managers_cache", "__weakref__")
+
+    def __init__(self, inner: "etebase_python.CollectionManager", tracer: t.Optional[Tracer]=None,
+                 retry_policy: t.Optional[RetryPolicy]=None):
         self._inner = inner
+        self._tracer = tracer
+        self._retry_policy = retry_policy
+        self._collections_cache: t.Optional[_LRUCache] = None
+        self._item_managers_cache: t.Optional[_LRUCache] = None
 
-    def fetch(self, col_uid: str, fetch_options: t.Optional[FetchOptions]=None):
-        return Collection(self._inner.fetch(col_uid, _inner(fetch_options)))
+    def enable_cache(self, max_size: int=256, max_age: t.Optional[float]=None):
+        """Serve `fetch` and `get_item_manager` from memory for the `max_size` most recently used collections.
 
-    def create(self, col_type: str, meta: t.Dict, content: bytes):
+        Cached collections are updated by what `list` returns and dropped on `upload`/`transaction`. Changes
+        made by other clients are only noticed through `list`, so set `max_age` (seconds) to bound staleness.
+        """
+        self._collections_cache = _LRUCache(max_size, max_age)
+        self._item_managers_cache = _LRUCache(max_size)
+
+    @property
+    def cache_stats(self) -> t.Optional[t.Dict[str, CacheStats]]:
+        if self._collections_cache is None:
+            return None
+        return {
+            "collections": self._collections_cache.stats(),
+            "item_managers": self._item_managers_cache.stats(),
+        }
+
+    def _cache_put(self, col: "Collection"):
+        self._collections_cache.put(col.uid, col.etag, self.cache_save(col))
+
+    def _cache_update(self, response: "CollectionListResponse"):
+        cache = self._collections_cache
+        for col in response.data:
+            if col.deleted:
+                cache.pop(col.uid)
+            elif cache.etag(col.uid) not in (None, col.etag):
+                self._cache_put(col)
+        for removed in response.removed_memberships:
+            cache.pop(removed.uid)
+
+    @_traced
+    @_retried()
+    def fetch(self, col_uid: str, fetch_options: t.Optional[FetchOptions]=None):
+        if self._collections_cache is None:
+            return Collection(self._inner.fetch(col_uid, _inner(fetch_options)))
+        if fetch_options is None:
+            cached = self._collections_cache.get(col_uid)
+            if cached is not None:
+                return self.cache_load(cached)
+        col = Collection(self._inner.fetch(col_uid, _inner(fetch_options)))
+        self._cache_put(col)
+        return col
+
+    @_traced
+    def create(self, col_type: str, meta: t.Dict, content: Buffer):
         meta_packed = msgpack_encode(_verify_col_meta(meta))
         return self.create_raw(col_type, meta_packed, content)
 
-    def create_raw(self, col_type: str, meta: bytes, content: bytes):
+    @_traced
+    def create_raw(self, col_type: str, meta: Buffer, content: Buffer):
         return Collection(self._inner.create_raw(col_type, meta, content))
 
+    @_traced
     def get_item_manager(self, col: "Collection"):
-        return ItemManager(self._inner.get_item_manager(col._inner))
-
+        if self._item_managers_cache is None:
+            return ItemManager(self._inner.get_item_manager(col._inner), self._tracer, self._retry_policy)
+        item_mgr = self._item_managers_cache.get(col.uid, col.etag)
+        if item_mgr is None:
+            item_mgr = ItemManager(self._inner.get_item_manager(col._inner), self._tracer, self._retry_policy)
+            self._item_managers_cache.put(col.uid, col.etag, item_mgr)
+        return item_mgr
+
+    @_traced
+    @_retried()
     def list(self, col_type: t.Union[str, t.List[str]], fetch_options: t.Optional[FetchOptions]=None):
         if isinstance(col_type, str):
-            return CollectionListResponse(self._inner.list(col_type, _inner(fetch_options)))
+            ret = CollectionListResponse(self._inner.list(col_type, _inner(fetch_options)))
         else:
-            return CollectionListResponse(self._inner.list_multi(list(col_type), _inner(fetch_options)))
-
+            ret = CollectionListResponse(self._inner.list_multi(list(col_type), _inner(fetch_options)))
+        if self._collections_cache is not None:
+            self._cache_update(ret)
+        return ret
+
+    def iter_pages(self, col_type: t.Union[str, t.List[str]], fetch_options: t.Optional[FetchOptions]=None,
+                   prefetch_next: bool=False):
+        return _iter_pages(lambda options: self.list(col_type, options), fetch_options, "stoken", prefetch_next)
+
+    def iter_all(self, col_type: t.Union[str, t.List[str]], fetch_options: t.Optional[FetchOptions]=None,
+                 prefetch_next: bool=False):
+        for page in self.iter_pages(col_type, fetch_options, prefetch_next):
+            yield from page.data
+
+    def _cache_invalidate(self, collection: "Collection"):
+        if self._collections_cache is not None:
+            self._collections_cache.pop(collection.uid)
+            self._item_managers_cache.pop(collection.uid)
+
+    @_traced
+    @_retried(idempotent=False)
     def upload(self, collection: "Collection", fetch_options: t.Optional[FetchOptions]=None):
-        self._inner.upload(collection._inner, _inner(fetch_options))
+        try:
+            self._inner.upload(collection._inner, _inner(fetch_options))
+        finally:
+            self._cache_invalidate(collection)
 
+    @_traced
+    @_retried()
     def transaction(self, collection: "Collection", fetch_options: t.Optional[FetchOptions]=None):
-        self._inner.transaction(collection._inner, _inner(fetch_options))
+        try:
+            self._inner.transaction(collection._inner, _inner(fetch_options))
+        finally:
+            self._cache_invalidate(collection)
 
+    @_traced
     def cache_load(self, cached: bytes):
         return Collection(self._inner.cache_load(cached))
 
+    @_traced
     def cache_save(self, collection: "Collection", with_content: bool=True):
         if with_content:
             return bytes(self._inner.cache_save_with_content(collection._inner))
@@ -262,64 +1012,251 @@ class CollectionManager:
             return bytes(self._inner.cache_save(collection._inner))
 
     def get_member_manager(self, collection: "Collection"):
-        return CollectionMemberManager(self._inner.get_member_manager(collection._inner))
+        return CollectionMemberManager(self._inner.get_member_manager(collection._inner), self._tracer,
+                                       self._retry_policy)
 
 
 class ItemManager:
-    def __init__(self, inner: etebase_python.ItemManager):
+    __slots__ = ("_inner", "_tracer", "_retry_policy", "__weakref__")
+
+    def __init__(self, inner: "etebase_python.ItemManager", tracer: t.Optional[Tracer]=None,
+                 retry_policy: t.Optional[RetryPolicy]=None):
         self._inner = inner
+        self._tracer = tracer
+        self._retry_policy = retry_policy
 
+    @_traced
+    @_retried()
     def fetch(self, col_uid, fetch_options: t.Optional[FetchOptions]=None):
         return Item(self._inner.fetch(col_uid, _inner(fetch_options)))
 
-    def create(self, meta: t.Dict, content: bytes):
+    @_traced
+    def create(self, meta: t.Dict, content: Buffer):
         meta_packed = msgpack_encode(meta)
         return self.create_raw(meta_packed, content)
 
-    def create_raw(self, meta: bytes, content: bytes):
+    @_traced
+    def create_raw(self, meta: Buffer, content: Buffer):
         return Item(self._inner.create_raw(meta, content))
 
+    @_traced
+    @_retried()
     def list(self, fetch_options: t.Optional[FetchOptions]=None):
         return ItemListResponse(self._inner.list(_inner(fetch_options)))
 
+    @_traced
+    @_retried()
     def item_revisions(self, item: "Item", fetch_options: t.Optional[FetchOptions]=None):
         return ItemRevisionsListResponse(self._inner.item_revisions(item._inner, _inner(fetch_options)))
 
+    def iter_pages(self, fetch_options: t.Optional[FetchOptions]=None, prefetch_next: bool=False):
+        return _iter_pages(self.list, fetch_options, "stoken", prefetch_next)
+
+    def iter_all(self, fetch_options: t.Optional[FetchOptions]=None, prefetch_next: bool=False):
+        for page in self.iter_pages(fetch_options, prefetch_next):
+            yield from page.data
+
+    def iter_revisions(self, item: "Item", fetch_options: t.Optional[FetchOptions]=None, prefetch_next: bool=False):
+        pages = _iter_pages(lambda options: self.item_revisions(item, options), fetch_options, "iterator",
+                            prefetch_next)
+        for page in pages:
+            yield from page.data
+
+    @_traced
+    @_retried()
     def fetch_updates(self, items: t.List["Item"], fetch_options: t.Optional[FetchOptions]=None):
-        items_inner = list(map(lambda x: x._inner, items))
+        items_inner = [x._inner for x in items]
         return ItemListResponse(self._inner.fetch_updates(items_inner, _inner(fetch_options)))
 
+    @_traced
+    @_retried()
     def fetch_multi(self, items_uids: t.List[str], fetch_options: t.Optional[FetchOptions]=None):
         return ItemListResponse(self._inner.fetch_multi(items_uids, _inner(fetch_options)))
 
+    @_traced
+    def fetch_multi_changed(self, etags: t.Union[t.Mapping[str, str], t.Iterable[t.Tuple[str, str]]],
+                            chunk_size: int=100, max_in_flight: int=4) -> t.List["Item"]:
+        """Like `fetch_multi`, but only returns the items whose etag differs from the `{uid: etag}` (or `(uid, etag)`
+        pairs) we have.
+
+        The filtering happens on the client: every item is still downloaded (with its metadata, but without its
+        content), so this saves keeping the `Item`s around for `fetch_updates`, not bandwidth. To only get what
+        changed from the server, keep the stoken of `list` (or `fetch_updates`) instead.
+
+        The input is read lazily and fetched in chunks of `chunk_size` on a worker pool, with up to
+        `max_in_flight` requests in progress. Items the server doesn't return (e.g. no longer accessible) are
+        skipped. Use `download_content` for the content of the ones that need it.
+        """
+        # The crate can only send the etags of full items to fetch_updates, so we fetch the (metadata only)
+        # items and compare the etags here instead. Unchanged items are dropped right away.
+        def process(start: int, chunk: t.List[t.Tuple[str, str]]):
+            expected = dict(chunk)
+            fetch_options = FetchOptions().limit(len(expected))
+            fetch_options.prefetch(etebase_python.PrefetchOption.Medium)
+            response = self.fetch_multi(list(expected), fetch_options)
+            return [item for item in response.data if item.etag != expected[item.uid]]
+
+        if isinstance(etags, collections.abc.Mapping):
+            etags = etags.items()
+        changed = []
+        for chunk_changed in _map_chunks(process, etags, chunk_size, max_in_flight):
+            changed.extend(chunk_changed)
+        return changed
+
+    @_traced
+    @_retried(idempotent=False)
     def batch(self, items: t.List["Item"], deps: t.List["Item"]=None, fetch_options: t.Optional[FetchOptions]=None):
-        items_inner = list(map(lambda x: x._inner, items))
-        deps_inner = list(map(lambda x: x._inner, deps)) if deps is not None else None
+        items_inner = [x._inner for x in items]
+        deps_inner = [x._inner for x in deps] if deps is not None else None
         self._inner.batch(items_inner, deps_inner, _inner(fetch_options))
 
+    @_traced
+    @_retried()
     def transaction(self, items: t.List["Item"], deps: t.List["Item"]=None, fetch_options: t.Optional[FetchOptions]=None):
-        items_inner = list(map(lambda x: x._inner, items))
-        deps_inner = list(map(lambda x: x._inner, deps)) if deps is not None else None
+        items_inner = [x._inner for x in items]
+        deps_inner = [x._inner for x in deps] if deps is not None else None
         self._inner.transaction(items_inner, deps_inner, _inner(fetch_options))
 
+    @_traced
+    @_retried()
     def download_content(self, item: "Item"):
         self._inner.download_content(item._inner)
 
+    @_traced
+    @_retried()
     def upload_content(self, item: "Item"):
         self._inner.upload_content(item._inner)
 
+    @_traced
+    def download_content_to(self, item: "Item", fileobj: t.BinaryIO, chunk_size: int=DEFAULT_CHUNK_SIZE):
+        if item.missing_content:
+            self.download_content(item)
+        item.write_content_to(fileobj, chunk_size)
+
+    @_traced
+    def upload_content_from(self, item: "Item", fileobj):
+        item.set_content_from(fileobj)
+        self.upload_content(item)
+
+    @_traced
     def cache_load(self, cached: bytes):
         return Item(self._inner.cache_load(cached))
 
+    @_traced
     def cache_save(self, item: "Item", with_content: bool=True):
         if with_content:
             return bytes(self._inner.cache_save_with_content(item._inner))
         else:
             return bytes(self._inner.cache_save(item._inner))
 
+    @_traced
+    def cache_save_many(self, items: t.Iterable["Item"], with_content: bool=True) -> bytes:
+        """Save `items` into a single snapshot, for writing to a file and restoring with `cache_load_many`"""
+        return self._inner.cache_save_many([item._inner for item in items], with_content)
+
+    @_traced
+    def cache_load_many(self, snapshot: Buffer) -> t.List["Item"]:
+        """Load all the items of a `cache_save_many` snapshot, which can be any bytes-like object (e.g. an mmap)"""
+        return [Item(item) for item in self._inner.cache_load_many(snapshot)]
+
+    @_traced
+    def bulk_upload(self, entries: t.Iterable[t.Tuple[t.Dict, Buffer]], chunk_size: int=100, max_in_flight: int=4,
+                    fetch_options: t.Optional[FetchOptions]=None):
+        """Create and upload new items from `(meta, content)` pairs, returns a `BulkUploadResult` per entry.
+
+        Every chunk is encrypted and sent with one `batch()` call on a worker pool, with up to `max_in_flight`
+        chunks in progress. Failed chunks are retried according to the manager's retry policy (never without
+        one): `batch()` itself retries when the server didn't process the request, and when the request failed
+        without a response (or with a 502/504) only the items the server doesn't have yet are sent again.
+        """
+        policy = self._retry_policy or _NO_RETRIES
+
+        def upload(items: t.List["Item"]) -> t.Optional[Exception]:
+            for attempt in itertools.count():
+                try:
+                    self.batch(items, None, fetch_options)
+                    return None
+                except Exception as e:
+                    error = e
+                status = getattr(error, "http_status", None)
+                # Only the failures `batch()` doesn't retry by itself because the batch may have been applied
+                if (status is None or attempt + 1 >= policy.max_attempts or policy.should_retry(status, False)
+                        or not policy.should_retry(status, True)):
+                    return error
+                delay = policy.delay(attempt, None)
+                if delay is None:
+                    return error
+                time.sleep(delay)
+                # Replaying items the server already has would fail with a conflict, so leave them out
+                try:
+                    uploaded = self.fetch_multi([item.uid for item in items], FetchOptions().limit(len(items)))
+                except Exception:
+                    return error
+                uploaded_uids = {item.uid for item in uploaded.data}
+                items = [item for item in items if item.uid not in uploaded_uids]
+                if not items:
+                    return None
+
+        def process(start: int, chunk: t.List[t.Tuple[t.Dict, Buffer]]):
+            results = []
+            items = []
+            for index, (meta, content) in enumerate(chunk, start):
+                try:
+                    item = self.create(meta, content)
+                except Exception as e:
+                    results.append(BulkUploadResult(index, None, e))
+                else:
+                    items.append((index, item))
+            if items:
+                error = upload([item for _, item in items])
+                results.extend(BulkUploadResult(index, item.uid, error) for index, item in items)
+            return results
+
+        results = []
+        for chunk_results in _map_chunks(process, entries, chunk_size, max_in_flight):
+            results.extend(chunk_results)
+        results.sort(key=lambda x: x.index)
+        return results
+
+
+class ItemMetadata:
+    """The standard metadata fields, decoded natively without going through msgpack in Python.
+
+    Every field is only converted to a Python object when first accessed, and other fields of the metadata are
+    ignored, so this is cheaper than `meta` for views that only need a couple of fields.
+    """
+    __slots__ = ("_inner", "_cached_item_type", "_cached_name", "_cached_mtime", "_cached_description",
+                 "_cached_color")
+
+    def __init__(self, inner: "etebase_python.ItemMetadata"):
+        self._inner = inner
+
+    @cached_property
+    def item_type(self) -> t.Optional[str]:
+        return self._inner.get_item_type()
+
+    @cached_property
+    def name(self) -> t.Optional[str]:
+        return self._inner.get_name()
+
+    @cached_property
+    def mtime(self) -> t.Optional[int]:
+        return self._inner.get_mtime()
+
+    @cached_property
+    def description(self) -> t.Optional[str]:
+        return self._inner.get_description()
+
+    @cached_property
+    def color(self) -> t.Optional[str]:
+        return self._inner.get_color()
+
 
 class Collection:
-    def __init__(self, inner: etebase_python.Collection):
+    __slots__ = ("_inner", "_cached_meta", "_cached_meta_raw", "_cached_meta_typed", "_cached_content",
+                 "_cached_collection_type")
+
+    def __init__(self, inner: "etebase_python.Collection"):
         self._inner = inner
 
     def verify(self):
@@ -327,12 +1264,13 @@ class Collection:
 
     @cached_property
     def meta(self):
-        return msgpack_decode(bytes(self._inner.get_meta_raw()))
+        return msgpack_decode(self._inner.get_meta_raw())
 
     @meta.setter
     def meta(self, value: t.Any):
-        self.__class__.meta.fget.cache_clear()
-        self.__class__.meta_raw.fget.cache_clear()
+        self.__class__.meta.cache_clear(self)
+        self.__class__.meta_raw.cache_clear(self)
+        self.__class__.meta_typed.cache_clear(self)
         value = msgpack_encode(_verify_col_meta(value))
         self._inner.set_meta_raw(value)
 
@@ -341,18 +1279,23 @@ class Collection:
         return self._inner.get_meta_raw()
 
     @meta_raw.setter
-    def meta_raw(self, value: bytes):
-        self.__class__.meta.fget.cache_clear()
-        self.__class__.meta_raw.fget.cache_clear()
+    def meta_raw(self, value: Buffer):
+        self.__class__.meta.cache_clear(self)
+        self.__class__.meta_raw.cache_clear(self)
+        self.__class__.meta_typed.cache_clear(self)
         self._inner.set_meta_raw(value)
 
+    @cached_property
+    def meta_typed(self) -> ItemMetadata:
+        return ItemMetadata(self._inner.get_meta())
+
     @cached_property
     def content(self):
-        return bytes(self._inner.get_content())
+        return self._inner.get_content()
 
     @content.setter
-    def content(self, value: bytes):
-        self.__class__.content.fget.cache_clear()
+    def content(self, value: Buffer):
+        self.__class__.content.cache_clear(self)
         self._inner.set_content(value)
 
     def delete(self):
@@ -388,7 +1331,9 @@ class Collection:
 
 
 class Item:
-    def __init__(self, inner: etebase_python.Item):
+    __slots__ = ("_inner", "_cached_meta", "_cached_meta_raw", "_cached_meta_typed", "_cached_content")
+
+    def __init__(self, inner: "etebase_python.Item"):
         self._inner = inner
 
     def verify(self):
@@ -396,12 +1341,13 @@ class Item:
 
     @cached_property
     def meta(self):
-        return msgpack_decode(bytes(self._inner.get_meta_raw()))
+        return msgpack_decode(self._inner.get_meta_raw())
 
     @meta.setter
     def meta(self, value: t.Any):
-        self.__class__.meta.fget.cache_clear()
-        self.__class__.meta_raw.fget.cache_clear()
+        self.__class__.meta.cache_clear(self)
+        self.__class__.meta_raw.cache_clear(self)
+        self.__class__.meta_typed.cache_clear(self)
         value = msgpack_encode(value)
         self._inner.set_meta_raw(value)
 
@@ -410,20 +1356,41 @@ class Item:
         return self._inner.get_meta_raw()
 
     @meta_raw.setter
-    def meta_raw(self, value: bytes):
-        self.__class__.meta.fget.cache_clear()
-        self.__class__.meta_raw.fget.cache_clear()
+    def meta_raw(self, value: Buffer):
+        self.__class__.meta.cache_clear(self)
+        self.__class__.meta_raw.cache_clear(self)
+        self.__class__.meta_typed.cache_clear(self)
         self._inner.set_meta_raw(value)
 
+    @cached_property
+    def meta_typed(self) -> ItemMetadata:
+        return ItemMetadata(self._inner.get_meta())
+
     @cached_property
     def content(self):
-        return bytes(self._inner.get_content())
+        return self._inner.get_content()
 
     @content.setter
-    def content(self, value: bytes):
-        self.__class__.content.fget.cache_clear()
+    def content(self, value: Buffer):
+        self.__class__.content.cache_clear(self)
         self._inner.set_content(value)
 
+    def set_content_from(self, fileobj):
+        with _read_buffer(fileobj) as buf:
+            self.content = buf
+
+    def write_content_to(self, fileobj: t.BinaryIO, chunk_size: int=DEFAULT_CHUNK_SIZE):
+        """Write the content to `fileobj`, holding at most `chunk_size` bytes of it in Python at a time.
+
+        The bindings can only decrypt the content as a whole, so it's kept once in native memory meanwhile.
+        """
+        reader = self._inner.get_content_reader()
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                break
+            fileobj.write(chunk)
+
     def delete(self):
         self._inner.delete()
 
@@ -445,7 +1412,9 @@ class Item:
 
 
 class UserProfile:
-    def __init__(self, inner: etebase_python.UserProfile):
+    __slots__ = ("_inner",)
+
+    def __init__(self, inner: "etebase_python.UserProfile"):
         self._inner = inner
 
     @property
@@ -454,16 +1423,18 @@ class UserProfile:
 
 
 class InvitationListResponse:
-    def __init__(self, inner: etebase_python.InvitationListResponse):
+    __slots__ = ("_inner", "_cached_iterator", "_cached_data", "_cached_done")
+
+    def __init__(self, inner: "etebase_python.InvitationListResponse"):
         self._inner = inner
 
     @cached_property
     def iterator(self):
         return self._inner.get_iterator()
 
-    @property
+    @cached_property
     def data(self):
-        return map(lambda x: SignedInvitation(x), self._inner.get_data())
+        return _LazyList(self._inner.get_data(), SignedInvitation)
 
     @cached_property
     def done(self):
@@ -471,27 +1442,46 @@ class InvitationListResponse:
 
 
 class CollectionInvitationManager:
-    def __init__(self, inner: etebase_python.CollectionInvitationManager):
+    __slots__ = ("_inner", "_tracer", "_retry_policy", "__weakref__")
+
+    def __init__(self, inner: "etebase_python.CollectionInvitationManager", tracer: t.Optional[Tracer]=None,
+                 retry_policy: t.Optional[RetryPolicy]=None):
         self._inner = inner
+        self._tracer = tracer
+        self._retry_policy = retry_policy
 
+    @_traced
+    @_retried()
     def list_incoming(self, fetch_options: t.Optional[FetchOptions]=None):
         return InvitationListResponse(self._inner.list_incoming(_inner(fetch_options)))
 
+    @_traced
+    @_retried()
     def list_outgoing(self, fetch_options: t.Optional[FetchOptions]=None):
         return InvitationListResponse(self._inner.list_outgoing(_inner(fetch_options)))
 
+    @_traced
+    @_retried(idempotent=False)
     def accept(self, signed_invitation: "SignedInvitation"):
         self._inner.accept(signed_invitation._inner)
 
+    @_traced
+    @_retried(idempotent=False)
     def reject(self, signed_invitation: "SignedInvitation"):
         self._inner.reject(signed_invitation._inner)
 
+    @_traced
+    @_retried()
     def fetch_user_profile(self, username: str):
         return UserProfile(self._inner.fetch_user_profile(username))
 
+    @_traced
+    @_retried(idempotent=False)
     def invite(self, collection: Collection, username: str, pubkey: bytes, access_level: "CollectionAccessLevel"):
         self._inner.invite(collection._inner, username, pubkey, access_level)
 
+    @_traced
+    @_retried(idempotent=False)
     def disinvite(self, signed_invitation: "SignedInvitation"):
         self._inner.disinvite(signed_invitation._inner)
 
@@ -501,7 +1491,9 @@ class CollectionInvitationManager:
 
 
 class SignedInvitation:
-    def __init__(self, inner: etebase_python.SignedInvitation):
+    __slots__ = ("_inner",)
+
+    def __init__(self, inner: "etebase_python.SignedInvitation"):
         self._inner = inner
 
     @property
@@ -530,7 +1522,9 @@ class SignedInvitation:
 
 
 class CollectionMember:
-    def __init__(self, inner: etebase_python.CollectionMember):
+    __slots__ = ("_inner",)
+
+    def __init__(self, inner: "etebase_python.CollectionMember"):
         self._inner = inner
 
     @property
@@ -543,16 +1537,18 @@ class CollectionMember:
 
 
 class MemberListResponse:
-    def __init__(self, inner: etebase_python.MemberListResponse):
+    __slots__ = ("_inner", "_cached_iterator", "_cached_data", "_cached_done")
+
+    def __init__(self, inner: "etebase_python.MemberListResponse"):
         self._inner = inner
 
     @cached_property
     def iterator(self):
         return self._inner.get_iterator()
 
-    @property
+    @cached_property
     def data(self):
-        return map(lambda x: CollectionMember(x), self._inner.get_data())
+        return _LazyList(self._inner.get_data(), CollectionMember)
 
     @cached_property
     def done(self):
@@ -560,17 +1556,33 @@ class MemberListResponse:
 
 
 class CollectionMemberManager:
-    def __init__(self, inner: etebase_python.CollectionMemberManager):
+    __slots__ = ("_inner", "_tracer", "_retry_policy", "__weakref__")
+
+    def __init__(self, inner: "etebase_python.CollectionMemberManager", tracer: t.Optional[Tracer]=None,
+                 retry_policy: t.Optional[RetryPolicy]=None):
         self._inner = inner
+        self._tracer = tracer
+        self._retry_policy = retry_policy
 
+    @_traced
+    @_retried()
     def list(self, fetch_options: t.Optional[FetchOptions]=None):
         return MemberListResponse(self._inner.list(_inner(fetch_options)))
 
+    @_traced
+    @_retried(idempotent=False)
     def remove(self, username: str):
         self._inner.remove(username)
 
+    @_traced
+    @_retried(idempotent=False)
     def leave(self):
         self._inner.leave()
 
-    def modify_access_level(self, username: str, access_level: CollectionAccessLevel):
+    @_traced
+    @_retried()
+    def modify_access_level(self, username: str, access_level: "CollectionAccessLevel"):
         self._inner.modify_access_level(username, access_level)
+
+
+from .session import SessionPool  # noqa: E402
@@ -0,0 +1,266 @@
+"""Asyncio flavour of the Etebase API.
+
+The classes here mirror `Account`, `CollectionManager`, `ItemManager`, `CollectionInvitationManager` and
+`CollectionMemberManager`, but every method that talks to the server (or runs the login KDF) is a coroutine.
+
+The underlying bindings are blocking, so every call runs on a thread of a shared pool and keeps that thread
+busy until it's done: there's one blocked thread per call in flight, and at most `DEFAULT_MAX_WORKERS` calls
+are in flight at once, with further calls waiting in the pool's queue. The bindings release the GIL during the
+calls, so the event loop (and the other calls) keep running meanwhile. Use `set_executor` to change the limit,
+e.g. `set_executor(ThreadPoolExecutor(max_workers=100))`.
+
+Cancelling a call that's still queued means it never runs. A call that already started can't be interrupted:
+the awaiting task is cancelled right away, but the call completes in the background (an upload still goes
+through) and its result is discarded. Purely local operations (creating items, cache save/load) stay
+synchronous.
+"""
+
+import asyncio
+import functools
+import typing as t
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from . import (
+    Client,
+    User,
+    FetchOptions,
+    Collection,
+    Item,
+    SignedInvitation,
+)
+from . import (
+    Account as SyncAccount,
+    CollectionManager as SyncCollectionManager,
+    ItemManager as SyncItemManager,
+    CollectionInvitationManager as SyncCollectionInvitationManager,
+    CollectionMemberManager as SyncCollectionMemberManager,
+)
+
+if t.TYPE_CHECKING:
+    from .etebase_python import CollectionAccessLevel
+
+# The maximum number of calls in flight at once with the default pool
+DEFAULT_MAX_WORKERS = 32
+
+_executor: t.Optional[Executor] = None
+
+
+def set_executor(executor: t.Optional[Executor]):
+    """Set the executor used to run the blocking calls. Passing `None` restores the default pool."""
+    global _executor
+    _executor = executor
+
+
+def get_executor() -> Executor:
+    """The executor running the blocking calls, a pool of `DEFAULT_MAX_WORKERS` threads unless set otherwise"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="etebase-aio")
+    return _executor
+
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+class Account:
+    def __init__(self, account: SyncAccount):
+        self._sync = account
+
+    @property
+    def sync(self) -> SyncAccount:
+        """The underlying blocking `Account`."""
+        return self._sync
+
+    @classmethod
+    async def is_etebase_server(cls, client: Client) -> bool:
+        return await _run(SyncAccount.is_etebase_server, client)
+
+    @classmethod
+    async def login(cls, client: Client, username: str, password: str):
+        return cls(await _run(SyncAccount.login, client, username, password))
+
+    @classmethod
+    async def login_key(cls, client: Client, username: str, key: bytes):
+        return cls(await _run(SyncAccount.login_key, client, username, key))
+
+    @classmethod
+    async def signup(cls, client: Client, user: User, password: str):
+        return cls(await _run(SyncAccount.signup, client, user, password))
+
+    @classmethod
+    async def signup_key(cls, client: Client, user: User, key: bytes):
+        return cls(await _run(SyncAccount.signup_key, client, user, key))
+
+    async def fetch_token(self):
+        await _run(self._sync.fetch_token)
+
+    def force_server_url(self, api_base: str):
+        self._sync.force_server_url(api_base)
+
+    async def change_password(self, password: str):
+        await _run(self._sync.change_password, password)
+
+    async def logout(self):
+        await _run(self._sync.logout)
+
+    def get_collection_manager(self):
+        return CollectionManager(self._sync.get_collection_manager())
+
+    def get_invitation_manager(self):
+        return CollectionInvitationManager(self._sync.get_invitation_manager())
+
+    def save(self, encryption_key: t.Optional[bytes]):
+        return self._sync.save(encryption_key)
+
+    @classmethod
+    def restore(cls, client: Client, account_data_stored: str, encryption_key: t.Optional[bytes]):
+        return cls(SyncAccount.restore(client, account_data_stored, encryption_key))
+
+
+class CollectionManager:
+    def __init__(self, manager: SyncCollectionManager):
+        self._sync = manager
+
+    @property
+    def sync(self) -> SyncCollectionManager:
+        """The underlying blocking `CollectionManager`."""
+        return self._sync
+
+    async def fetch(self, col_uid: str, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.fetch, col_uid, fetch_options)
+
+    def create(self, col_type: str, meta: t.Dict, content: bytes):
+        return self._sync.create(col_type, meta, content)
+
+    def create_raw(self, col_type: str, meta: bytes, content: bytes):
+        return self._sync.create_raw(col_type, meta, content)
+
+    def get_item_manager(self, col: Collection):
+        return ItemManager(self._sync.get_item_manager(col))
+
+    async def list(self, col_type: t.Union[str, t.List[str]], fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.list, col_type, fetch_options)
+
+    async def upload(self, collection: Collection, fetch_options: t.Optional[FetchOptions]=None):
+        await _run(self._sync.upload, collection, fetch_options)
+
+    async def transaction(self, collection: Collection, fetch_options: t.Optional[FetchOptions]=None):
+        await _run(self._sync.transaction, collection, fetch_options)
+
+    def cache_load(self, cached: bytes):
+        return self._sync.cache_load(cached)
+
+    def cache_save(self, collection: Collection, with_content: bool=True):
+        return self._sync.cache_save(collection, with_content)
+
+    def get_member_manager(self, collection: Collection):
+        return CollectionMemberManager(self._sync.get_member_manager(collection))
+
+
+class ItemManager:
+    def __init__(self, manager: SyncItemManager):
+        self._sync = manager
+
+    @property
+    def sync(self) -> SyncItemManager:
+        """The underlying blocking `ItemManager`."""
+        return self._sync
+
+    async def fetch(self, item_uid: str, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.fetch, item_uid, fetch_options)
+
+    def create(self, meta: t.Dict, content: bytes):
+        return self._sync.create(meta, content)
+
+    def create_raw(self, meta: bytes, content: bytes):
+        return self._sync.create_raw(meta, content)
+
+    async def list(self, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.list, fetch_options)
+
+    async def item_revisions(self, item: Item, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.item_revisions, item, fetch_options)
+
+    async def fetch_updates(self, items: t.List[Item], fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.fetch_updates, items, fetch_options)
+
+    async def fetch_multi(self, items_uids: t.List[str], fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.fetch_multi, items_uids, fetch_options)
+
+    async def batch(self, items: t.List[Item], deps: t.List[Item]=None, fetch_options: t.Optional[FetchOptions]=None):
+        await _run(self._sync.batch, items, deps, fetch_options)
+
+    async def transaction(self, items: t.List[Item], deps: t.List[Item]=None,
+                          fetch_options: t.Optional[FetchOptions]=None):
+        await _run(self._sync.transaction, items, deps, fetch_options)
+
+    async def download_content(self, item: Item):
+        await _run(self._sync.download_content, item)
+
+    async def upload_content(self, item: Item):
+        await _run(self._sync.upload_content, item)
+
+    def cache_load(self, cached: bytes):
+        return self._sync.cache_load(cached)
+
+    def cache_save(self, item: Item, with_content: bool=True):
+        return self._sync.cache_save(item, with_content)
+
+
+class CollectionInvitationManager:
+    def __init__(self, manager: SyncCollectionInvitationManager):
+        self._sync = manager
+
+    @property
+    def sync(self) -> SyncCollectionInvitationManager:
+        """The underlying blocking `CollectionInvitationManager`."""
+        return self._sync
+
+    async def list_incoming(self, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.list_incoming, fetch_options)
+
+    async def list_outgoing(self, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.list_outgoing, fetch_options)
+
+    async def accept(self, signed_invitation: SignedInvitation):
+        await _run(self._sync.accept, signed_invitation)
+
+    async def reject(self, signed_invitation: SignedInvitation):
+        await _run(self._sync.reject, signed_invitation)
+
+    async def fetch_user_profile(self, username: str):
+        return await _run(self._sync.fetch_user_profile, username)
+
+    async def invite(self, collection: Collection, username: str, pubkey: bytes, access_level: "CollectionAccessLevel"):
+        await _run(self._sync.invite, collection, username, pubkey, access_level)
+
+    async def disinvite(self, signed_invitation: SignedInvitation):
+        await _run(self._sync.disinvite, signed_invitation)
+
+    @property
+    def pubkey(self):
+        return self._sync.pubkey
+
+
+class CollectionMemberManager:
+    def __init__(self, manager: SyncCollectionMemberManager):
+        self._sync = manager
+
+    @property
+    def sync(self) -> SyncCollectionMemberManager:
+        """The underlying blocking `CollectionMemberManager`."""
+        return self._sync
+
+    async def list(self, fetch_options: t.Optional[FetchOptions]=None):
+        return await _run(self._sync.list, fetch_options)
+
+    async def remove(self, username: str):
+        await _run(self._sync.remove, username)
+
+    async def leave(self):
+        await _run(self._sync.leave)
+
+    async def modify_access_level(self, username: str, access_level: "CollectionAccessLevel"):
+        await _run(self._sync.modify_access_level, username, access_level)
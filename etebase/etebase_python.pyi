@@ -2,6 +2,8 @@ import typing as t
 
 from enum import Enum
 
+Buffer = t.Union[bytes, bytearray, memoryview]
+
 class Utils:
     @classmethod
     def from_base64(cls, value: str) -> bytes: ...
@@ -16,9 +18,24 @@ class Utils:
     def pretty_fingerprint(cls, value: bytes) -> str: ...
 
 
+class Transport:
+    def __init__(self, client_name: str, max_connections_per_host: int, max_idle_per_host: int, idle_timeout: float,
+                 http2: bool, http2_prior_knowledge: bool) -> "Transport": ...
+
+    def stats(self) -> t.List[int]: ...
+    @classmethod
+    def thread_stats(cls) -> t.List[int]: ...
+    @classmethod
+    def last_status(cls) -> int: ...
+    @classmethod
+    def last_retry_after(cls) -> t.Optional[float]: ...
+
+
 class Client:
     @classmethod
     def new(cls, client_name: str, server_url: str) -> "Client": ...
+    @classmethod
+    def new_with_transport(cls, server_url: str, transport: Transport) -> "Client": ...
 
     def set_server_url(self, server_url: str): ...
 
@@ -76,6 +93,8 @@ class ItemListResponse:
     def get_stoken(self) -> str: ...
     def get_data(self) -> t.List["Item"]: ...
     def is_done(self) -> bool: ...
+    def decrypt_all(self, with_content: bool) -> t.List[t.Tuple[str, str, bytes, t.Optional[bytes]]]: ...
+    def meta_all(self) -> t.List["ItemMetadata"]: ...
 
 
 class ItemRevisionsListResponse:
@@ -112,8 +131,8 @@ class ItemMetadata:
 
 class CollectionManager:
     def fetch(self, col_uid: str, fetch_options: t.Optional[FetchOptions]) -> "Collection": ...
-    def create(self, collection_type: str, meta: ItemMetadata, content: bytes) -> "Collection": ...
-    def create_raw(self, collection_type: str, meta: bytes, content: bytes) -> "Collection": ...
+    def create(self, collection_type: str, meta: ItemMetadata, content: Buffer) -> "Collection": ...
+    def create_raw(self, collection_type: str, meta: Buffer, content: Buffer) -> "Collection": ...
     def get_item_manager(self, col: "Collection") -> "ItemManager": ...
     def list(self, collection_type: str, fetch_options: t.Optional[FetchOptions]) -> CollectionListResponse: ...
     def list_multi(self, collection_types: t.List[str], fetch_options: t.Optional[FetchOptions]) -> CollectionListResponse: ...
@@ -128,8 +147,8 @@ class CollectionManager:
 
 class ItemManager:
     def fetch(self, item_uid: str, fetch_options: t.Optional[FetchOptions]) -> "Item": ...
-    def create(self, meta: ItemMetadata, content: bytes) -> "Item": ...
-    def create_raw(self, meta: bytes, content: bytes) -> "Item": ...
+    def create(self, meta: ItemMetadata, content: Buffer) -> "Item": ...
+    def create_raw(self, meta: Buffer, content: Buffer) -> "Item": ...
     def list(self, fetch_options: t.Optional[FetchOptions]) -> ItemListResponse: ...
     def item_revisions(self, item: "Item", fetch_options: t.Optional[FetchOptions]) -> ItemRevisionsListResponse: ...
     def fetch_updates(self, items: t.List["Item"], fetch_options: t.Optional[FetchOptions]) -> ItemListResponse: ...
@@ -141,6 +160,8 @@ class ItemManager:
     def cache_load(self, cached: bytes) -> "Item": ...
     def cache_save(self, item: "Item") -> bytes: ...
     def cache_save_with_content(self, item: "Item") -> bytes: ...
+    def cache_save_many(self, items: t.List["Item"], with_content: bool) -> bytes: ...
+    def cache_load_many(self, snapshot: Buffer) -> t.List["Item"]: ...
 
 
 class CollectionAccessLevel(int, Enum):
@@ -154,9 +175,9 @@ class Collection:
 
     def set_meta(self, meta: ItemMetadata): ...
     def get_meta(self) -> ItemMetadata: ...
-    def set_meta_raw(self, meta: bytes): ...
+    def set_meta_raw(self, meta: Buffer): ...
     def get_meta_raw(self) -> bytes: ...
-    def set_content(self, content: bytes): ...
+    def set_content(self, content: Buffer): ...
     def get_content(self) -> bytes: ...
     def delete(self): ...
     def is_deleted(self) -> bool: ...
@@ -173,10 +194,11 @@ class Item:
 
     def set_meta(self, meta: ItemMetadata): ...
     def get_meta(self) -> ItemMetadata: ...
-    def set_meta_raw(self, meta: bytes): ...
+    def set_meta_raw(self, meta: Buffer): ...
     def get_meta_raw(self) -> bytes: ...
-    def set_content(self, content: bytes): ...
+    def set_content(self, content: Buffer): ...
     def get_content(self) -> bytes: ...
+    def get_content_reader(self) -> "ContentReader": ...
     def delete(self): ...
     def is_deleted(self) -> bool: ...
     def is_missing_content(self) -> bool: ...
@@ -184,6 +206,11 @@ class Item:
     def get_etag(self) -> str: ...
 
 
+class ContentReader:
+    def read(self, size: int) -> bytes: ...
+    def len(self) -> int: ...
+
+
 class UserProfile:
     def get_pubkey(self) -> bytes: ...
 
@@ -0,0 +1,175 @@
+"""A local, searchable index of item metadata (type, name and mtime), kept in SQLite.
+
+The index is updated incrementally from synced pages: hook `on_items` and `remove_collection` up to an
+`etebase.sync.AccountSyncer` (or call `update` with the pages from any other sync loop). Entries are keyed by
+collection and item uid, and items whose etag didn't change since they were indexed aren't decrypted again.
+Queries by name (substring or prefix), type and mtime range then run on the index alone, without listing or
+decrypting anything.
+
+Name substring search uses an FTS5 trigram index when the SQLite library supports it, and falls back to a
+`LIKE` scan otherwise. Note that the indexed metadata is stored decrypted, so keep the index file wherever you
+keep the rest of the account's local data.
+"""
+
+import sqlite3
+import threading
+import typing as t
+
+from . import Collection, Item
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    col_uid TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    item_type TEXT,
+    name TEXT COLLATE NOCASE,
+    mtime INTEGER,
+    PRIMARY KEY (col_uid, uid)
+);
+CREATE INDEX IF NOT EXISTS entries_name ON entries (name);
+CREATE INDEX IF NOT EXISTS entries_mtime ON entries (mtime);
+CREATE INDEX IF NOT EXISTS entries_item_type ON entries (item_type, mtime);
+"""
+
+# Kept in sync with `entries` by triggers. REPLACE doesn't fire delete triggers, so we never use it on entries.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    name, content='entries', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+"""
+
+# Trigram FTS can only match queries of at least this many characters
+_FTS_MIN_LENGTH = 3
+
+
+class IndexEntry(t.NamedTuple):
+    col_uid: str
+    uid: str
+    etag: str
+    item_type: t.Optional[str]
+    name: t.Optional[str]
+    mtime: t.Optional[int]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class MetadataIndex:
+    def __init__(self, path: str=":memory:", use_fts: bool=True):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+            self.has_fts = use_fts and self._create_fts()
+
+    def _create_fts(self) -> bool:
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            # No FTS5, or too old for the trigram tokenizer (SQLite < 3.34)
+            return False
+        return True
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def update(self, col_uid: str, items: t.Iterable[Item], removed: t.Iterable[str]=()) -> int:
+        """Index the changed `items` of a collection and drop the `removed` uids, returns the number of updates
+
+        Deleted items are dropped too. Items already indexed with the same etag are skipped without decrypting
+        their metadata.
+        """
+        items = list(items)
+        deletes = list(removed)
+        indexed = {}
+        with self._lock:
+            # Stay well below SQLite's limit on the number of query parameters
+            for start in range(0, len(items), 500):
+                uids = [item.uid for item in items[start:start + 500]]
+                query = "SELECT uid, etag FROM entries WHERE col_uid = ? AND uid IN ({})".format(
+                    ",".join("?" * len(uids)))
+                indexed.update(self._db.execute(query, [col_uid] + uids).fetchall())
+        upserts = []
+        for item in items:
+            if item.deleted:
+                deletes.append(item.uid)
+            elif indexed.get(item.uid) != item.etag:
+                meta = item.meta_typed
+                upserts.append((col_uid, item.uid, item.etag, meta.item_type, meta.name, meta.mtime))
+        replaced = [upsert[1] for upsert in upserts if upsert[1] in indexed]
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM entries WHERE col_uid = ? AND uid = ?",
+                                 ((col_uid, uid) for uid in deletes + replaced))
+            self._db.executemany(
+                "INSERT INTO entries (col_uid, uid, etag, item_type, name, mtime) VALUES (?, ?, ?, ?, ?, ?)",
+                upserts)
+        return len(upserts) + len(deletes)
+
+    def on_items(self, col: Collection, changed: t.List[Item], removed: t.List[Item]):
+        """`AccountSyncer` callback"""
+        self.update(col.uid, changed + removed)
+
+    def remove_collection(self, col_uid: str):
+        """Drop all the entries of a collection, also usable as the `on_collection_removed` of `AccountSyncer`"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries WHERE col_uid = ?", (col_uid,))
+
+    def etags(self, col_uid: str) -> t.Dict[str, str]:
+        with self._lock:
+            rows = self._db.execute("SELECT uid, etag FROM entries WHERE col_uid = ?", (col_uid,)).fetchall()
+        return dict(rows)
+
+    def search(self, name: t.Optional[str]=None, name_prefix: t.Optional[str]=None,
+               item_type: t.Optional[str]=None, mtime_from: t.Optional[int]=None, mtime_to: t.Optional[int]=None,
+               col_uid: t.Optional[str]=None, limit: t.Optional[int]=None) -> t.List[IndexEntry]:
+        """Find entries matching all of the given filters, most recently modified first
+
+        `name` matches anywhere in the name and `name_prefix` at its start, both case-insensitively. The mtime
+        range includes `mtime_from` and excludes `mtime_to`.
+        """
+        where = []
+        params: t.List[t.Any] = []
+        if name is not None:
+            if self.has_fts and len(name) >= _FTS_MIN_LENGTH:
+                where.append("rowid IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+                params.append('"{}"'.format(name.replace('"', '""')))
+            else:
+                where.append("name LIKE ? ESCAPE '\\'")
+                params.append("%{}%".format(_escape_like(name)))
+        if name_prefix is not None:
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append("{}%".format(_escape_like(name_prefix)))
+        for column, op, value in (("item_type", "=", item_type), ("mtime", ">=", mtime_from),
+                                  ("mtime", "<", mtime_to), ("col_uid", "=", col_uid)):
+            if value is not None:
+                where.append("{} {} ?".format(column, op))
+                params.append(value)
+        query = "SELECT col_uid, uid, etag, item_type, name, mtime FROM entries"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY mtime DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [IndexEntry(*row) for row in rows]
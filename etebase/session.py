@@ -0,0 +1,131 @@
+"""A size bounded pool of restored accounts, for servers that act on behalf of many users.
+
+`Account.restore` decrypts the stored session every time it's called, so a worker handling requests for the
+same users over and over keeps the restored accounts (and the managers created from them) around instead.
+Tokens are only refreshed after a request failed with an authentication error, or once they are older than
+`token_ttl` seconds if that's set.
+"""
+
+import collections
+import contextlib
+import threading
+import time
+import typing as t
+
+from . import Client, Account, Collection, CollectionManager, ItemManager
+
+
+class SessionPoolStats(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    refreshes: int
+    size: int
+
+
+def is_auth_error(e: Exception) -> bool:
+    # The server's messages can't tell a rejected token from other errors mentioning tokens (e.g. a bad stoken),
+    # so we go by the status manager calls record on their errors
+    return getattr(e, "http_status", None) == 401
+
+
+class Session:
+    def __init__(self, account: Account):
+        self.account = account
+        self.lock = threading.RLock()
+        self.token_time = time.monotonic()
+        self._col_mgr: t.Optional[CollectionManager] = None
+        self._item_managers: t.Dict[str, ItemManager] = {}
+
+    @property
+    def collection_manager(self) -> CollectionManager:
+        if self._col_mgr is None:
+            self._col_mgr = self.account.get_collection_manager()
+        return self._col_mgr
+
+    def get_item_manager(self, col: Collection) -> ItemManager:
+        item_mgr = self._item_managers.get(col.uid)
+        if item_mgr is None:
+            item_mgr = self.collection_manager.get_item_manager(col)
+            self._item_managers[col.uid] = item_mgr
+        return item_mgr
+
+
+class SessionPool:
+    def __init__(self, client: Client, max_size: int=1024, encryption_key: t.Optional[bytes]=None,
+                 token_ttl: t.Optional[float]=None,
+                 is_auth_error: t.Callable[[Exception], bool]=is_auth_error):
+        self.client = client
+        self.max_size = max_size
+        self.encryption_key = encryption_key
+        self.token_ttl = token_ttl
+        self.is_auth_error = is_auth_error
+        self._sessions: "collections.OrderedDict[str, Session]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._refreshes = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @property
+    def stats(self) -> SessionPoolStats:
+        with self._lock:
+            return SessionPoolStats(self._hits, self._misses, self._evictions, self._refreshes, len(self._sessions))
+
+    def _restore(self, stored_session: str) -> Account:
+        return Account.restore(self.client, stored_session, self.encryption_key)
+
+    def _get(self, key: str, stored_session: str) -> Session:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                self._hits += 1
+                return session
+            self._misses += 1
+        # Restore without holding the lock, if another thread beat us to it we use its session
+        session = Session(self._restore(stored_session))
+        with self._lock:
+            session = self._sessions.setdefault(key, session)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+                self._evictions += 1
+        return session
+
+    def _refresh(self, session: Session):
+        session.account.fetch_token()
+        session.token_time = time.monotonic()
+        with self._lock:
+            self._refreshes += 1
+
+    @contextlib.contextmanager
+    def checkout(self, key: str, stored_session: str) -> t.Iterator[Session]:
+        """Get the session of `key`, restoring it from `stored_session` if needed, for exclusive use"""
+        session = self._get(key, stored_session)
+        with session.lock:
+            if self.token_ttl is not None and time.monotonic() - session.token_time >= self.token_ttl:
+                self._refresh(session)
+            yield session
+
+    def run(self, key: str, stored_session: str, func: t.Callable[[Session], t.Any]):
+        """Call `func` with the session of `key`, refreshing the token and retrying once on auth errors"""
+        with self.checkout(key, stored_session) as session:
+            try:
+                return func(session)
+            except Exception as e:
+                if not self.is_auth_error(e):
+                    raise
+                self._refresh(session)
+                return func(session)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
@@ -0,0 +1,177 @@
+"""A persistent local store of collections and items, built on `cache_save`/`cache_load`.
+
+The store keeps the cached (still encrypted) form of every collection and item in SQLite together with the
+stoken of every list it synced, so a restarted process resumes incremental sync from where it stopped instead
+of fetching (and decrypting) whole accounts again. Each fetched page is written in a single transaction
+together with its stoken, so an interrupted sync never skips changes.
+"""
+
+import sqlite3
+import threading
+import typing as t
+
+from . import FetchOptions, CollectionManager, ItemManager, Collection, Item
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stokens (
+    key TEXT PRIMARY KEY,
+    stoken TEXT
+);
+CREATE TABLE IF NOT EXISTS collections (
+    uid TEXT PRIMARY KEY,
+    col_type TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    cached BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS collections_col_type ON collections (col_type);
+CREATE TABLE IF NOT EXISTS items (
+    col_uid TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    cached BLOB NOT NULL,
+    PRIMARY KEY (col_uid, uid)
+);
+"""
+
+
+def _collections_key(col_type: t.Union[str, t.List[str]]) -> str:
+    if isinstance(col_type, str):
+        return "collections:" + col_type
+    return "collections:" + ",".join(sorted(col_type))
+
+
+def _items_key(col_uid: str) -> str:
+    return "items:" + col_uid
+
+
+def _with_stoken(fetch_options: t.Optional[FetchOptions], stoken: t.Optional[str]) -> FetchOptions:
+    # Paging updates the options in place, so the caller's options (e.g. limit and prefetch) are copied
+    fetch_options = fetch_options.copy() if fetch_options is not None else FetchOptions()
+    return fetch_options.stoken(stoken)
+
+
+class LocalStore:
+    def __init__(self, path: str, with_content: bool=True):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.with_content = with_content
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_stoken(self, key: str) -> t.Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT stoken FROM stokens WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def collections_stoken(self, col_type: t.Union[str, t.List[str]]) -> t.Optional[str]:
+        return self._get_stoken(_collections_key(col_type))
+
+    def items_stoken(self, col_uid: str) -> t.Optional[str]:
+        return self._get_stoken(_items_key(col_uid))
+
+    def _write_collections(self, col_mgr: CollectionManager, collections: t.Iterable[Collection],
+                           removed: t.Iterable[str]=(), stoken_key: t.Optional[str]=None,
+                           stoken: t.Optional[str]=None):
+        upserts = []
+        deletes = list(removed)
+        for col in collections:
+            if col.deleted:
+                deletes.append(col.uid)
+            else:
+                upserts.append((col.uid, col.collection_type, col.etag, col_mgr.cache_save(col, self.with_content)))
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO collections (uid, col_type, etag, cached) VALUES (?, ?, ?, ?)", upserts)
+            self._db.executemany("DELETE FROM collections WHERE uid = ?", ((uid,) for uid in deletes))
+            self._db.executemany("DELETE FROM items WHERE col_uid = ?", ((uid,) for uid in deletes))
+            self._db.executemany("DELETE FROM stokens WHERE key = ?", ((_items_key(uid),) for uid in deletes))
+            if stoken_key is not None:
+                self._db.execute("INSERT OR REPLACE INTO stokens (key, stoken) VALUES (?, ?)", (stoken_key, stoken))
+        return len(upserts) + len(deletes)
+
+    def _write_items(self, item_mgr: ItemManager, col_uid: str, items: t.Iterable[Item],
+                     stoken_key: t.Optional[str]=None, stoken: t.Optional[str]=None):
+        upserts = []
+        deletes = []
+        for item in items:
+            if item.deleted:
+                deletes.append((col_uid, item.uid))
+            else:
+                upserts.append((col_uid, item.uid, item.etag, item_mgr.cache_save(item, self.with_content)))
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items (col_uid, uid, etag, cached) VALUES (?, ?, ?, ?)", upserts)
+            self._db.executemany("DELETE FROM items WHERE col_uid = ? AND uid = ?", deletes)
+            if stoken_key is not None:
+                self._db.execute("INSERT OR REPLACE INTO stokens (key, stoken) VALUES (?, ?)", (stoken_key, stoken))
+        return len(upserts) + len(deletes)
+
+    def save_collections(self, col_mgr: CollectionManager, collections: t.Iterable[Collection]):
+        self._write_collections(col_mgr, collections)
+
+    def save_items(self, item_mgr: ItemManager, col_uid: str, items: t.Iterable[Item]):
+        self._write_items(item_mgr, col_uid, items)
+
+    def sync_collections(self, col_mgr: CollectionManager, col_type: t.Union[str, t.List[str]],
+                         fetch_options: t.Optional[FetchOptions]=None, prefetch_next: bool=False) -> int:
+        """Fetch the collections changed since the last sync, returns the number of changes"""
+        key = _collections_key(col_type)
+        fetch_options = _with_stoken(fetch_options, self._get_stoken(key))
+        changed = 0
+        for page in col_mgr.iter_pages(col_type, fetch_options, prefetch_next):
+            removed = (removed.uid for removed in page.removed_memberships)
+            changed += self._write_collections(col_mgr, page.data, removed, key, page.stoken)
+        return changed
+
+    def sync_items(self, col_mgr: CollectionManager, col: Collection, fetch_options: t.Optional[FetchOptions]=None,
+                   prefetch_next: bool=False) -> int:
+        """Fetch the items of `col` changed since the last sync, returns the number of changes"""
+        key = _items_key(col.uid)
+        if col.stoken is not None and col.stoken == self._get_stoken(key):
+            return 0
+        item_mgr = col_mgr.get_item_manager(col)
+        fetch_options = _with_stoken(fetch_options, self._get_stoken(key))
+        changed = 0
+        for page in item_mgr.iter_pages(fetch_options, prefetch_next):
+            changed += self._write_items(item_mgr, col.uid, page.data, key, page.stoken)
+        return changed
+
+    def get_collection(self, col_mgr: CollectionManager, col_uid: str) -> t.Optional[Collection]:
+        with self._lock:
+            row = self._db.execute("SELECT cached FROM collections WHERE uid = ?", (col_uid,)).fetchone()
+        return col_mgr.cache_load(row[0]) if row is not None else None
+
+    def list_collections(self, col_mgr: CollectionManager,
+                         col_type: t.Optional[str]=None) -> t.List[Collection]:
+        with self._lock:
+            if col_type is None:
+                rows = self._db.execute("SELECT cached FROM collections").fetchall()
+            else:
+                rows = self._db.execute("SELECT cached FROM collections WHERE col_type = ?", (col_type,)).fetchall()
+        return [col_mgr.cache_load(row[0]) for row in rows]
+
+    def get_item(self, item_mgr: ItemManager, col_uid: str, item_uid: str) -> t.Optional[Item]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cached FROM items WHERE col_uid = ? AND uid = ?", (col_uid, item_uid)).fetchone()
+        return item_mgr.cache_load(row[0]) if row is not None else None
+
+    def list_items(self, item_mgr: ItemManager, col_uid: str) -> t.List[Item]:
+        with self._lock:
+            rows = self._db.execute("SELECT cached FROM items WHERE col_uid = ?", (col_uid,)).fetchall()
+        return [item_mgr.cache_load(row[0]) for row in rows]
+
+    def etags(self, col_uid: str) -> t.Dict[str, str]:
+        with self._lock:
+            rows = self._db.execute("SELECT uid, etag FROM items WHERE col_uid = ?", (col_uid,)).fetchall()
+        return dict(rows)
@@ -0,0 +1,121 @@
+"""Sync all the collections of an account, fetching the items of many collections in parallel.
+
+`AccountSyncer` lists the collections changed since the last sync and fans out the item syncs of the changed
+collections onto a worker pool, so a sync takes about as long as the slowest collection instead of the sum of
+all of them. Changes are handed to callbacks page by page, and the stoken of every list is checkpointed right
+after its page was delivered, so a failed or interrupted sync resumes where it stopped.
+
+`on_collection` gets every changed collection, `on_collection_removed` the uid of every collection that was
+deleted or that we lost access to, and `on_items` every page of changed and removed items. Callbacks run on
+the worker threads, but never concurrently with each other.
+
+Stokens are kept in a mapping, in memory by default. Pass any `MutableMapping[str, str]` (for example a
+`shelve` or `dbm` backed one) to keep them across restarts.
+"""
+
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from . import FetchOptions, CollectionManager, Collection, Item
+
+COLLECTIONS_KEY = "collections"
+
+
+def _items_key(col_uid: str) -> str:
+    return "items:" + col_uid
+
+
+class SyncResult:
+    def __init__(self):
+        self.collections = 0
+        self.items = 0
+        self.errors: t.Dict[str, Exception] = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return "<SyncResult collections={} items={} errors={}>".format(
+            self.collections, self.items, len(self.errors))
+
+
+class AccountSyncer:
+    def __init__(self, col_mgr: CollectionManager, col_type: t.Union[str, t.List[str]],
+                 checkpoints: t.Optional[t.MutableMapping[str, str]]=None, max_workers: int=8,
+                 limit: t.Optional[int]=None, prefetch_next: bool=False,
+                 on_collection: t.Optional[t.Callable[[Collection], t.Any]]=None,
+                 on_collection_removed: t.Optional[t.Callable[[str], t.Any]]=None,
+                 on_items: t.Optional[t.Callable[[Collection, t.List[Item], t.List[Item]], t.Any]]=None):
+        self.col_mgr = col_mgr
+        self.col_type = col_type
+        self.checkpoints = checkpoints if checkpoints is not None else {}
+        self.max_workers = max_workers
+        self.limit = limit
+        self.prefetch_next = prefetch_next
+        self.on_collection = on_collection
+        self.on_collection_removed = on_collection_removed
+        self.on_items = on_items
+        self._lock = threading.Lock()
+
+    def _fetch_options(self, stoken: t.Optional[str]) -> FetchOptions:
+        fetch_options = FetchOptions().stoken(stoken)
+        if self.limit is not None:
+            fetch_options.limit(self.limit)
+        return fetch_options
+
+    def _remove_collection(self, col_uid: str):
+        with self._lock:
+            if self.on_collection_removed is not None:
+                self.on_collection_removed(col_uid)
+            self.checkpoints.pop(_items_key(col_uid), None)
+
+    def sync_collection(self, col: Collection) -> int:
+        """Fetch the items of `col` changed since the last sync, returns the number of changes"""
+        stoken = self.checkpoints.get(_items_key(col.uid))
+        if col.stoken is not None and col.stoken == stoken:
+            return 0
+        item_mgr = self.col_mgr.get_item_manager(col)
+        changed = 0
+        for page in item_mgr.iter_pages(self._fetch_options(stoken), self.prefetch_next):
+            items = list(page.data)
+            with self._lock:
+                if self.on_items is not None:
+                    self.on_items(col, [x for x in items if not x.deleted], [x for x in items if x.deleted])
+                self.checkpoints[_items_key(col.uid)] = page.stoken
+            changed += len(items)
+        return changed
+
+    def sync(self) -> SyncResult:
+        """Sync the collection list and then the items of every changed collection"""
+        result = SyncResult()
+        fetch_options = self._fetch_options(self.checkpoints.get(COLLECTIONS_KEY))
+        stoken = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="etebase-sync") as executor:
+            pending = {}
+            for page in self.col_mgr.iter_pages(self.col_type, fetch_options, self.prefetch_next):
+                for removed in page.removed_memberships:
+                    self._remove_collection(removed.uid)
+                    result.collections += 1
+                for col in page.data:
+                    result.collections += 1
+                    if col.deleted:
+                        self._remove_collection(col.uid)
+                        continue
+                    if self.on_collection is not None:
+                        with self._lock:
+                            self.on_collection(col)
+                    pending[col.uid] = executor.submit(self.sync_collection, col)
+                stoken = page.stoken
+            for col_uid, future in pending.items():
+                try:
+                    result.items += future.result()
+                except Exception as e:
+                    result.errors[col_uid] = e
+        # Only move the collection list forward once all of its collections are synced, otherwise the
+        # collections that failed wouldn't be listed as changed next time.
+        if result.ok:
+            with self._lock:
+                self.checkpoints[COLLECTIONS_KEY] = stoken
+        return result
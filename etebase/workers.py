@@ -0,0 +1,234 @@
+"""Sync many accounts on a pool of worker processes, so syncing isn't limited to the one core the GIL allows.
+
+Accounts are assigned to the workers by consistent hashing of their key, so every account keeps going to the
+same worker and its restored session (kept in a `SessionPool` in that worker) is reused from one sync to the
+next. Workers share nothing: only the saved session (`Account.save`) and the stokens of an account are sent to
+its worker over a pipe, and only its new stokens and change counts come back.
+
+If a worker dies, a new one takes its place on the ring, so its accounts (and only those) lose their restored
+sessions. The account it was syncing fails, as it may be what killed the worker, and the ones sent to it after
+that one are sent to the new worker.
+
+The sync itself is done by `sync_account` (an `etebase.sync.AccountSyncer` over the collections of
+`col_type`), pass a different module level function as `sync` to e.g. also store what changed.
+"""
+
+import bisect
+import collections
+import hashlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import typing as t
+
+from . import Client
+from .session import Session, SessionPool
+from .sync import AccountSyncer, SyncResult
+
+
+class AccountResult(t.NamedTuple):
+    key: str
+    checkpoints: t.Dict[str, str]
+    collections: int
+    items: int
+    error: t.Optional[str]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys to nodes, with `replicas` points on the ring per node"""
+
+    def __init__(self, nodes: t.Iterable[int]=(), replicas: int=64):
+        self.replicas = replicas
+        self._points: t.List[int] = []
+        self._nodes: t.List[int] = []
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self):
+        return len(set(self._nodes))
+
+    def add(self, node: int):
+        for replica in range(self.replicas):
+            point = _hash("{}:{}".format(node, replica))
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def remove(self, node: int):
+        keep = [i for i, x in enumerate(self._nodes) if x != node]
+        self._points = [self._points[i] for i in keep]
+        self._nodes = [self._nodes[i] for i in keep]
+
+    def node_for(self, key: str) -> int:
+        if not self._points:
+            raise RuntimeError("No nodes left")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._nodes[index]
+
+
+def sync_account(session: Session, col_type: t.Union[str, t.List[str]],
+                 checkpoints: t.Dict[str, str]) -> SyncResult:
+    return AccountSyncer(session.collection_manager, col_type, checkpoints, max_workers=4).sync()
+
+
+def _worker_main(conn, client_name: str, server_url: t.Optional[str], col_type: t.Union[str, t.List[str]],
+                 sync: t.Callable[[Session, t.Union[str, t.List[str]], t.Dict[str, str]], SyncResult],
+                 max_sessions: int):
+    client = Client(client_name) if server_url is None else Client(client_name, server_url)
+    pool = SessionPool(client, max_size=max_sessions)
+
+    def run(session: Session, checkpoints: t.Dict[str, str]) -> SyncResult:
+        if server_url is not None:
+            session.account.force_server_url(server_url)
+        return sync(session, col_type, checkpoints)
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        key, stored_session, checkpoints = task
+        try:
+            result = pool.run(key, stored_session, lambda session: run(session, checkpoints))
+            error = "; ".join("{}: {!r}".format(uid, e) for uid, e in result.errors.items()) or None
+            conn.send((key, checkpoints, result.collections, result.items, error))
+        except Exception as e:
+            conn.send((key, checkpoints, 0, 0, repr(e)))
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "in_flight", "outbox")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        # Keys sent to the worker (in order, so the first one is being synced), and the ones waiting to be sent
+        self.in_flight: t.Deque[str] = collections.deque()
+        self.outbox: t.Deque[str] = collections.deque()
+
+
+class WorkerPool:
+    def __init__(self, col_type: t.Union[str, t.List[str]], server_url: t.Optional[str]=None,
+                 num_workers: t.Optional[int]=None, client_name: str="etebase-workers",
+                 sync: t.Callable[[Session, t.Union[str, t.List[str]], t.Dict[str, str]], SyncResult]=sync_account,
+                 max_sessions: int=1024, max_in_flight: int=2, mp_context: t.Optional[str]=None):
+        # Only a few accounts are sent to a worker ahead of time, so that neither side ever blocks on a full pipe
+        # and little has to move when a worker dies.
+        self.max_in_flight = max_in_flight
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._worker_args = (client_name, server_url, col_type, sync, max_sessions)
+        self._workers: t.Dict[int, _Worker] = {
+            node: self._spawn(node) for node in range(num_workers or os.cpu_count() or 1)}
+        self.ring = HashRing(self._workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spawn(self, node: int) -> _Worker:
+        conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, name="etebase-worker-{}".format(node), daemon=True,
+                                    args=(child_conn,) + self._worker_args)
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._workers)
+
+    def sync(self, accounts: t.Mapping[str, t.Tuple[str, t.Mapping[str, str]]]) -> t.Dict[str, AccountResult]:
+        """Sync every account of `accounts`, a mapping of key to (saved session, checkpoints)
+
+        Returns the result of every account by key, with its new checkpoints to pass the next time.
+        """
+        ret: t.Dict[str, AccountResult] = {}
+
+        def send(worker: _Worker):
+            while worker.outbox and len(worker.in_flight) < self.max_in_flight:
+                key = worker.outbox.popleft()
+                stored_session, checkpoints = accounts[key]
+                worker.in_flight.append(key)
+                try:
+                    worker.conn.send((key, stored_session, dict(checkpoints)))
+                except OSError:
+                    # The worker died, it's replaced once we notice
+                    return
+
+        def assign(keys: t.Iterable[str]):
+            touched = set()
+            for key in keys:
+                node = self.ring.node_for(key)
+                self._workers[node].outbox.append(key)
+                touched.add(node)
+            for node in touched:
+                send(self._workers[node])
+
+        def receive(worker: _Worker):
+            key, checkpoints, collections, items, error = worker.conn.recv()
+            worker.in_flight.popleft()
+            ret[key] = AccountResult(key, checkpoints, collections, items, error)
+
+        def replace(node: int):
+            worker = self._workers[node]
+            # Whatever the worker sent before dying is still in the pipe
+            while worker.in_flight and worker.conn.poll():
+                try:
+                    receive(worker)
+                except (EOFError, OSError):
+                    break
+            worker.conn.close()
+            # A broken pipe doesn't always mean the process exited
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.process.join()
+            if worker.in_flight:
+                key = worker.in_flight.popleft()
+                ret[key] = AccountResult(key, dict(accounts[key][1]), 0, 0, "The worker died")
+            self._workers[node] = self._spawn(node)
+            assign(list(worker.in_flight) + list(worker.outbox))
+
+        for node, worker in list(self._workers.items()):
+            if not worker.process.is_alive():
+                replace(node)
+        assign(accounts)
+        while any(worker.in_flight for worker in self._workers.values()):
+            waiting = {}
+            for node, worker in self._workers.items():
+                if worker.in_flight:
+                    waiting[worker.conn] = node
+                    waiting[worker.process.sentinel] = node
+            for ready in multiprocessing.connection.wait(list(waiting)):
+                node = waiting[ready]
+                worker = self._workers.get(node)
+                if worker is None:
+                    continue
+                if ready is worker.conn:
+                    try:
+                        receive(worker)
+                    except (EOFError, OSError):
+                        replace(node)
+                        continue
+                    send(worker)
+                elif not worker.process.is_alive():
+                    replace(node)
+        return ret
+
+    def close(self):
+        for worker in self._workers.values():
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers.values():
+            worker.process.join()
+            worker.conn.close()
+        self._workers.clear()
@@ -0,0 +1,225 @@
+"""A write-behind queue that turns bursts of item edits into a few batched uploads.
+
+Edited items are `put()` on the queue instead of being uploaded right away. Repeated edits of the same item
+are coalesced into a single upload of its latest state, and everything pending is flushed with one
+`transaction` (or `batch`) call once `max_pending` items are waiting or the oldest edit is `max_delay`
+seconds old, so a burst of edits costs a handful of round trips however many edits it contains.
+
+When a flush hits an etag conflict, the conflicting items are isolated by splitting the flush, so the rest
+are still uploaded. Every conflicting item is handed to `on_conflict` and dropped from the queue, for the
+application to merge with the server's version and `put()` again. Other errors (e.g. the network being down)
+keep the items queued for the next flush.
+
+With a `path`, pending edits are also kept in SQLite (in their encrypted `cache_save` form) and are loaded
+back, to be uploaded, when the queue is created again after a crash. Use one file per collection.
+"""
+
+import sqlite3
+import threading
+import time
+import typing as t
+
+from . import ItemManager, Item
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    uid TEXT PRIMARY KEY,
+    is_dep INTEGER NOT NULL,
+    cached BLOB NOT NULL
+);
+"""
+
+
+def is_conflict(e: Exception) -> bool:
+    # The bindings don't have typed exceptions, so we go by the server's message
+    message = str(e).lower()
+    return "conflict" in message or "etag" in message
+
+
+class FlushResult:
+    def __init__(self):
+        self.uploaded: t.List[str] = []
+        self.conflicts: t.Dict[str, Exception] = {}
+
+    @property
+    def ok(self):
+        return not self.conflicts
+
+    def __repr__(self):
+        return "<FlushResult uploaded={} conflicts={}>".format(len(self.uploaded), len(self.conflicts))
+
+
+class _Pending:
+    __slots__ = ("item", "is_dep", "version", "time")
+
+    def __init__(self, item: Item, is_dep: bool, version: int):
+        self.item = item
+        self.is_dep = is_dep
+        self.version = version
+        self.time = time.monotonic()
+
+
+class WriteBehindQueue:
+    def __init__(self, item_mgr: ItemManager, path: t.Optional[str]=None, max_pending: int=100,
+                 max_delay: t.Optional[float]=1.0, use_transaction: bool=True,
+                 on_conflict: t.Optional[t.Callable[[Item, Exception], t.Any]]=None,
+                 on_error: t.Optional[t.Callable[[Exception], t.Any]]=None,
+                 is_conflict: t.Callable[[Exception], bool]=is_conflict):
+        self.item_mgr = item_mgr
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.use_transaction = use_transaction
+        self.on_conflict = on_conflict
+        self.on_error = on_error
+        self.is_conflict = is_conflict
+        self._pending: t.Dict[str, _Pending] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.executescript(_SCHEMA)
+            for uid, is_dep, cached in self._db.execute("SELECT uid, is_dep, cached FROM pending").fetchall():
+                self._version += 1
+                self._pending[uid] = _Pending(item_mgr.cache_load(cached), bool(is_dep), self._version)
+        self._thread = None
+        if max_delay is not None:
+            self._thread = threading.Thread(target=self._run, name="etebase-writeback", daemon=True)
+            self._thread.start()
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return sum(1 for pending in self._pending.values() if not pending.is_dep)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put(self, item: Item, deps: t.Iterable[Item]=()):
+        """Queue the current state of `item` for upload, replacing any queued edit of the same item
+
+        `deps` are items that weren't changed but have to still be at their current version on the server for
+        the upload to go through (only checked when using transactions).
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The queue is closed")
+            self._set(item, False)
+            for dep in deps:
+                pending = self._pending.get(dep.uid)
+                if pending is None or pending.is_dep:
+                    self._set(dep, True)
+            if self._count() >= self.max_pending:
+                self._wakeup.notify()
+
+    def _set(self, item: Item, is_dep: bool):
+        self._version += 1
+        previous = self._pending.get(item.uid)
+        self._pending[item.uid] = _Pending(item, is_dep, self._version)
+        if previous is not None:
+            # Coalesced edits keep their place in line
+            self._pending[item.uid].time = previous.time
+        if self._db is not None:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO pending (uid, is_dep, cached) VALUES (?, ?, ?)",
+                                 (item.uid, is_dep, self.item_mgr.cache_save(item)))
+
+    def _upload(self, items: t.List[Item], deps: t.List[Item], result: FlushResult):
+        try:
+            if self.use_transaction:
+                self.item_mgr.transaction(items, deps or None)
+            else:
+                self.item_mgr.batch(items)
+        except Exception as e:
+            if not self.is_conflict(e):
+                raise
+            if len(items) == 1:
+                result.conflicts[items[0].uid] = e
+                return
+            # Split to find the conflicting items, the deps are checked with every half
+            middle = len(items) // 2
+            self._upload(items[:middle], deps, result)
+            self._upload(items[middle:], deps, result)
+            return
+        result.uploaded.extend(item.uid for item in items)
+
+    def flush(self) -> FlushResult:
+        """Upload everything pending now. Raises (keeping the items queued) on errors other than conflicts"""
+        result = FlushResult()
+        with self._flush_lock:
+            with self._lock:
+                snapshot = dict(self._pending)
+            items = [pending.item for pending in snapshot.values() if not pending.is_dep]
+            deps = [pending.item for pending in snapshot.values() if pending.is_dep]
+            if not items:
+                return result
+            try:
+                self._upload(items, deps, result)
+            finally:
+                # Even if a part of a split flush failed, the parts that went through are done
+                self._remove(snapshot, result.uploaded + list(result.conflicts))
+            self._remove(snapshot, [dep.uid for dep in deps])
+        if self.on_conflict is not None:
+            for uid, e in result.conflicts.items():
+                self.on_conflict(snapshot[uid].item, e)
+        return result
+
+    def _remove(self, snapshot: t.Dict[str, _Pending], uids: t.List[str]):
+        with self._lock:
+            # Items edited again while we were uploading stay queued
+            removed = [uid for uid in uids if uid in self._pending
+                       and self._pending[uid].version == snapshot[uid].version]
+            for uid in removed:
+                del self._pending[uid]
+            if self._db is not None:
+                with self._db:
+                    self._db.executemany("DELETE FROM pending WHERE uid = ?", ((uid,) for uid in removed))
+
+    def _next_deadline(self) -> t.Optional[float]:
+        times = [pending.time for pending in self._pending.values() if not pending.is_dep]
+        return min(times) + self.max_delay if times else None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._count() >= self.max_pending:
+                        break
+                    deadline = self._next_deadline()
+                    now = time.monotonic()
+                    if deadline is not None and deadline <= now:
+                        break
+                    self._wakeup.wait(deadline - now if deadline is not None else None)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                # Back off before retrying, instead of spinning on a server that's down
+                with self._lock:
+                    self._wakeup.wait(self.max_delay)
+
+    def close(self, flush: bool=True):
+        """Stop the background flushes, and upload what's still pending (unless `flush` is False)"""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            if flush:
+                self.flush()
+        finally:
+            if self._db is not None:
+                self._db.close()
@@ -59,4 +59,392 @@ mod fixes {
     }
 }
 
+mod stats {
+    use std::cell::Cell;
+    use std::time::Duration;
+
+    /// Per thread counters, read by the instrumentation in the Python layer.
+    ///
+    /// The manager calls run on the calling thread (with the GIL released), so the difference between two
+    /// snapshots taken on a thread is exactly what the calls made in between cost. Updating them is a couple of
+    /// thread-local adds, cheap enough to always keep them on.
+    #[derive(Default, Clone, Copy)]
+    pub struct ThreadStats {
+        /// Time spent in the native code of blocking calls (network and crypto)
+        pub native: Duration,
+        pub http_requests: u64,
+        /// Time spent waiting for a free connection when the per-host limit is reached
+        pub http_wait: Duration,
+        /// Time until the response headers arrived
+        pub http_headers: Duration,
+        /// Time until the whole response body was read
+        pub http_total: Duration,
+        pub bytes_sent: u64,
+        pub bytes_received: u64,
+        /// The status of the last response, 0 if the last request failed without one
+        pub last_status: u16,
+        /// The `Retry-After` of the last response, if it had one (in seconds, dates aren't supported)
+        pub last_retry_after: Option<Duration>,
+    }
+
+    thread_local! {
+        static STATS: Cell<ThreadStats> = Cell::new(ThreadStats::default());
+    }
+
+    pub fn update<F: FnOnce(&mut ThreadStats)>(f: F) {
+        STATS.with(|stats| {
+            let mut value = stats.get();
+            f(&mut value);
+            stats.set(value);
+        });
+    }
+
+    pub fn snapshot() -> ThreadStats {
+        STATS.with(|stats| stats.get())
+    }
+}
+
+mod gil {
+    use cpython::Python;
+    use std::time::Instant;
+
+    struct AssertSend<T>(T);
+    unsafe impl<T> Send for AssertSend<T> {}
+
+    /// Run `f` with the GIL released so other Python threads can make progress.
+    ///
+    /// This is meant for the blocking parts of the bindings (network, KDF and bulk crypto). The
+    /// closure must not touch any Python objects, and any lock it takes has to be released before
+    /// it returns, otherwise we risk a deadlock when re-acquiring the GIL.
+    pub fn without_gil<T, F: FnOnce() -> T>(f: F) -> T {
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+        let f = AssertSend(f);
+        let start = Instant::now();
+        let ret = py.allow_threads(move || AssertSend((f.0)()));
+        let elapsed = start.elapsed();
+        crate::stats::update(|stats| stats.native += elapsed);
+        ret.0
+    }
+}
+
+mod buffer {
+    use cpython::{buffer::PyBuffer, PyBytes, PyObject, Python, PythonObject};
+    use etebase::error::Error;
+
+    /// Copy `bytes` straight into a Python `bytes` object.
+    ///
+    /// Returning a `Vec<u8>` would instead build a list of ints, which the Python layer then had to copy
+    /// again into `bytes`.
+    pub fn to_py_bytes(bytes: &[u8]) -> PyObject {
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+        PyBytes::new(py, bytes).into_object()
+    }
+
+    /// Call `f` with the contents of any object supporting the buffer protocol, without copying them.
+    pub fn with_buffer<T, F: FnOnce(&[u8]) -> Result<T, Error>>(obj: &PyObject, f: F) -> Result<T, Error> {
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+        let buf = PyBuffer::get(py, obj).map_err(|_| Error::ProgrammingError("Expected a bytes-like object"))?;
+        if !buf.is_c_contiguous() {
+            buf.release(py);
+            return Err(Error::ProgrammingError("Expected a contiguous buffer"));
+        }
+        // The buffer is exported (and thus kept alive and un-resizable) until we release it below.
+        let slice = unsafe { std::slice::from_raw_parts(buf.buf_ptr() as *const u8, buf.len_bytes()) };
+        let ret = f(slice);
+        buf.release(py);
+        ret
+    }
+}
+
+mod parallel {
+    use std::num::NonZeroUsize;
+    use std::thread;
+
+    use etebase::error::Error;
+
+    /// Below this many items per thread, starting the threads costs more than they save
+    const MIN_ITEMS_PER_THREAD: usize = 16;
+
+    /// Map `f` over `items` on one scoped thread per core (each taking a contiguous run of the items), keeping
+    /// their order.
+    ///
+    /// Returns the error of the first failing item, the same one going through the items one by one would raise.
+    pub fn try_map<T, U, F>(items: Vec<T>, f: F) -> Result<Vec<U>, Error>
+    where
+        T: Send,
+        U: Send,
+        F: Fn(T) -> Result<U, Error> + Sync,
+    {
+        let threads = thread::available_parallelism().map_or(1, NonZeroUsize::get)
+            .min(items.len() / MIN_ITEMS_PER_THREAD);
+        if threads <= 1 {
+            return items.into_iter().map(f).collect();
+        }
+        let chunk_size = (items.len() + threads - 1) / threads;
+        let mut items = items.into_iter();
+        let mut chunks = Vec::with_capacity(threads);
+        loop {
+            let chunk: Vec<T> = items.by_ref().take(chunk_size).collect();
+            if chunk.is_empty() {
+                break;
+            }
+            chunks.push(chunk);
+        }
+        let f = &f;
+        let results: Vec<Vec<Result<U, Error>>> = thread::scope(|scope| {
+            let handles: Vec<_> = chunks.into_iter()
+                .map(|chunk| scope.spawn(move || chunk.into_iter().map(f).collect::<Vec<_>>()))
+                .collect();
+            handles.into_iter().map(|handle| handle.join().unwrap()).collect()
+        });
+        results.into_iter().flatten().collect()
+    }
+}
+
+mod transport {
+    use std::collections::HashMap;
+    use std::sync::{Arc, Condvar, Mutex};
+    use std::time::{Duration, Instant};
+
+    use etebase::error::Error;
+    use etebase::http_custom_client::{ClientImplementation, Response};
+    use reqwest::blocking::RequestBuilder;
+    use reqwest::header;
+
+    #[derive(Default)]
+    struct Host {
+        in_flight: usize,
+        /// When each idle connection was last used, oldest first
+        idle: Vec<Instant>,
+    }
+
+    #[derive(Default)]
+    struct Pool {
+        hosts: HashMap<String, Host>,
+        requests: u64,
+        opened: u64,
+        reused: u64,
+    }
+
+    #[derive(Clone, Copy)]
+    pub struct PoolStats {
+        pub requests: u64,
+        pub opened_estimate: u64,
+        pub reused_estimate: u64,
+        pub in_flight: u64,
+        pub idle_estimate: u64,
+    }
+
+    /// A pooled HTTP transport that can be shared by many `etebase::Client`s.
+    ///
+    /// reqwest keeps connections alive and reuses them, but neither exposes its pool nor tells us when it
+    /// connects. The connection counts are therefore estimates from a model of its policy (reuse an idle
+    /// connection to the same host if it didn't time out, keep at most `max_idle_per_host` of them around, one
+    /// connection per host with HTTP/2), which drifts from the real pool when e.g. the server closes an idle
+    /// connection or reqwest retries a request on a stale one. Only the requests are counted for real.
+    ///
+    /// `max_connections_per_host` caps the requests in flight to a host, which reqwest doesn't do itself. That
+    /// is the number of HTTP/1.1 connections; hosts we expect to reach over HTTP/2 aren't capped, as all their
+    /// requests are multiplexed over one connection.
+    pub struct Transport {
+        client: reqwest::blocking::Client,
+        max_connections_per_host: usize,
+        max_idle_per_host: usize,
+        idle_timeout: Option<Duration>,
+        http2: bool,
+        http2_prior_knowledge: bool,
+        pool: Mutex<Pool>,
+        released: Condvar,
+    }
+
+    fn host_key(url: &str) -> Result<String, Error> {
+        let url = reqwest::Url::parse(url).map_err(|e| Error::UrlParse(e.to_string()))?;
+        Ok(format!("{}://{}:{}", url.scheme(), url.host_str().unwrap_or(""), url.port_or_known_default().unwrap_or(0)))
+    }
+
+    impl Host {
+        fn expire(&mut self, idle_timeout: Option<Duration>) {
+            if let Some(timeout) = idle_timeout {
+                self.idle.retain(|last_used| last_used.elapsed() < timeout);
+            }
+        }
+    }
+
+    impl Transport {
+        /// `max_connections_per_host` of 0 means no limit, an `idle_timeout` of 0 keeps idle connections forever.
+        ///
+        /// With `http2`, HTTP/2 is offered to HTTPS servers through ALPN, and HTTP/1.1 is used with the ones
+        /// that don't pick it. `http2_prior_knowledge` speaks HTTP/2 to every server without asking first
+        /// (h2c on plain HTTP), which fails with servers that only speak HTTP/1.1.
+        pub fn new(client_name: &str, max_connections_per_host: usize, max_idle_per_host: usize, idle_timeout: f64,
+                   http2: bool, http2_prior_knowledge: bool) -> Result<Self, Error> {
+            let idle_timeout = if idle_timeout > 0.0 { Some(Duration::from_secs_f64(idle_timeout)) } else { None };
+            let mut builder = reqwest::blocking::Client::builder()
+                .user_agent(format!("{} etebase-python/{}", client_name, env!("CARGO_PKG_VERSION")))
+                .pool_max_idle_per_host(max_idle_per_host)
+                .pool_idle_timeout(idle_timeout)
+                .tcp_keepalive(Some(Duration::from_secs(60)));
+            if http2_prior_knowledge {
+                builder = builder.http2_prior_knowledge();
+            } else if !http2 {
+                builder = builder.http1_only();
+            }
+            let client = builder.build().map_err(|e| Error::Generic(e.to_string()))?;
+            Ok(Self {
+                client,
+                max_connections_per_host,
+                max_idle_per_host,
+                idle_timeout,
+                http2,
+                http2_prior_knowledge,
+                pool: Mutex::new(Pool::default()),
+                released: Condvar::new(),
+            })
+        }
+
+        /// Whether we expect the requests to the host of `key` to share one HTTP/2 connection. Negotiated
+        /// HTTP/2 is assumed to be picked by every HTTPS server.
+        fn multiplexed(&self, key: &str) -> bool {
+            self.http2_prior_knowledge || (self.http2 && key.starts_with("https:"))
+        }
+
+        fn checkout(&self, key: &str) {
+            let multiplexed = self.multiplexed(key);
+            let mut pool = self.pool.lock().unwrap();
+            let max = self.max_connections_per_host;
+            while !multiplexed && max > 0 && pool.hosts.get(key).map_or(0, |host| host.in_flight) >= max {
+                pool = self.released.wait(pool).unwrap();
+            }
+            let pool = &mut *pool;
+            let host = pool.hosts.entry(key.to_owned()).or_default();
+            host.expire(self.idle_timeout);
+            let reused = if multiplexed {
+                host.in_flight > 0 || !host.idle.is_empty()
+            } else {
+                host.idle.pop().is_some()
+            };
+            if multiplexed {
+                host.idle.clear();
+            }
+            host.in_flight += 1;
+            pool.requests += 1;
+            if reused {
+                pool.reused += 1;
+            } else {
+                pool.opened += 1;
+            }
+        }
+
+        fn checkin(&self, key: &str, keep: bool) {
+            let multiplexed = self.multiplexed(key);
+            let mut pool = self.pool.lock().unwrap();
+            if let Some(host) = pool.hosts.get_mut(key) {
+                host.in_flight -= 1;
+                let max_idle = if multiplexed { 1 } else { self.max_idle_per_host };
+                if keep && host.idle.len() < max_idle && !(multiplexed && host.in_flight > 0) {
+                    host.idle.push(Instant::now());
+                }
+            }
+            self.released.notify_all();
+        }
+
+        pub fn stats(&self) -> PoolStats {
+            let mut pool = self.pool.lock().unwrap();
+            let (mut in_flight, mut idle) = (0, 0);
+            for host in pool.hosts.values_mut() {
+                host.expire(self.idle_timeout);
+                in_flight += host.in_flight as u64;
+                idle += host.idle.len() as u64;
+            }
+            PoolStats {
+                requests: pool.requests,
+                opened_estimate: pool.opened,
+                reused_estimate: pool.reused,
+                in_flight,
+                idle_estimate: idle,
+            }
+        }
+
+        fn send(&self, url: &str, builder: RequestBuilder, auth_token: Option<&str>, sent: usize) -> Response {
+            let key = match host_key(url) {
+                Ok(key) => key,
+                Err(err) => return Response::new_err(err),
+            };
+            let mut builder = builder.header(header::ACCEPT, "application/msgpack");
+            if let Some(auth_token) = auth_token {
+                builder = builder.header(header::AUTHORIZATION, format!("Token {}", auth_token));
+            }
+            let start = Instant::now();
+            self.checkout(&key);
+            let sending = Instant::now();
+            let mut headers = Duration::default();
+            let mut received = 0;
+            let mut last_status = 0;
+            let mut last_retry_after = None;
+            // The connection only goes back to the pool once the whole body was read
+            let ret = builder.send().and_then(|resp| {
+                headers = sending.elapsed();
+                let status = resp.status().as_u16();
+                last_status = status;
+                last_retry_after = resp.headers().get(header::RETRY_AFTER)
+                    .and_then(|value| value.to_str().ok())
+                    .and_then(|value| value.trim().parse::<f64>().ok())
+                    .filter(|secs| secs.is_finite() && *secs >= 0.0)
+                    .map(Duration::from_secs_f64);
+                resp.bytes().map(|bytes| {
+                    received = bytes.len();
+                    Response::new(bytes.to_vec(), status)
+                })
+            });
+            self.checkin(&key, ret.is_ok());
+            crate::stats::update(|stats| {
+                stats.http_requests += 1;
+                stats.http_wait += sending - start;
+                stats.http_headers += headers;
+                stats.http_total += start.elapsed();
+                stats.bytes_sent += sent as u64;
+                stats.bytes_received += received as u64;
+                stats.last_status = last_status;
+                stats.last_retry_after = last_retry_after;
+            });
+            ret.unwrap_or_else(|e| Response::new_err(Error::Connection(e.to_string())))
+        }
+
+        fn send_body(&self, url: &str, builder: RequestBuilder, auth_token: Option<&str>, body: Vec<u8>) -> Response {
+            let sent = body.len();
+            let builder = builder.header(header::CONTENT_TYPE, "application/msgpack").body(body);
+            self.send(url, builder, auth_token, sent)
+        }
+    }
+
+    /// The `ClientImplementation` handed to `etebase::Client`, all the clones share one pool
+    #[derive(Clone)]
+    pub struct SharedTransport(pub Arc<Transport>);
+
+    impl ClientImplementation for SharedTransport {
+        fn get(&self, url: &str, auth_token: Option<&str>) -> Response {
+            self.0.send(url, self.0.client.get(url), auth_token, 0)
+        }
+
+        fn post(&self, url: &str, auth_token: Option<&str>, body: Vec<u8>) -> Response {
+            self.0.send_body(url, self.0.client.post(url), auth_token, body)
+        }
+
+        fn put(&self, url: &str, auth_token: Option<&str>, body: Vec<u8>) -> Response {
+            self.0.send_body(url, self.0.client.put(url), auth_token, body)
+        }
+
+        fn patch(&self, url: &str, auth_token: Option<&str>, body: Vec<u8>) -> Response {
+            self.0.send_body(url, self.0.client.patch(url), auth_token, body)
+        }
+
+        fn delete(&self, url: &str, auth_token: Option<&str>) -> Response {
+            self.0.send(url, self.0.client.delete(url), auth_token, 0)
+        }
+    }
+}
+
 include!(concat!(env!("OUT_DIR"), "/glue.rs"));
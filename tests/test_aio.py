@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from etebase import aio
+
+
+class SyncItemManager:
+    def __init__(self, barrier=None, release=None):
+        self.barrier = barrier
+        self.release = release
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+        self.finished = []
+
+    def fetch(self, item_uid, fetch_options):
+        with self.lock:
+            self.started.append(item_uid)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.barrier is not None:
+                self.barrier.wait()
+            if self.release is not None:
+                self.release.wait(5)
+            else:
+                time.sleep(0.02)
+            return item_uid
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.finished.append(item_uid)
+
+
+class TestAio(unittest.TestCase):
+    def tearDown(self):
+        aio.get_executor().shutdown(wait=True)
+        aio.set_executor(None)
+
+    def test_concurrent(self):
+        # Only passes if all the calls are running at the same time
+        sync = SyncItemManager(barrier=threading.Barrier(8, timeout=5))
+        aio.set_executor(ThreadPoolExecutor(max_workers=8))
+        it_mgr = aio.ItemManager(sync)
+
+        async def main():
+            return await asyncio.gather(*(it_mgr.fetch(str(i)) for i in range(8)))
+
+        self.assertEqual([str(i) for i in range(8)], asyncio.run(main()))
+
+    def test_limit(self):
+        sync = SyncItemManager()
+        aio.set_executor(ThreadPoolExecutor(max_workers=2))
+        it_mgr = aio.ItemManager(sync)
+
+        async def main():
+            await asyncio.gather(*(it_mgr.fetch(str(i)) for i in range(6)))
+
+        asyncio.run(main())
+        self.assertEqual(2, sync.max_running)
+        self.assertEqual(6, len(sync.finished))
+
+    def test_cancel(self):
+        release = threading.Event()
+        sync = SyncItemManager(release=release)
+        aio.set_executor(ThreadPoolExecutor(max_workers=1))
+        it_mgr = aio.ItemManager(sync)
+
+        async def main():
+            running = asyncio.ensure_future(it_mgr.fetch("running"))
+            queued = asyncio.ensure_future(it_mgr.fetch("queued"))
+            while not sync.started:
+                await asyncio.sleep(0.001)
+            running.cancel()
+            queued.cancel()
+            for task in (running, queued):
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+            # The tasks are cancelled right away, while the running call is still blocked
+            self.assertEqual([], sync.finished)
+
+        asyncio.run(main())
+        release.set()
+        aio.get_executor().shutdown(wait=True)
+        # The running call completed in the background, the queued one never ran
+        self.assertEqual(["running"], sync.started)
+        self.assertEqual(["running"], sync.finished)
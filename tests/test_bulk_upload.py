@@ -0,0 +1,104 @@
+import unittest
+from etebase import ItemManager
+
+from .test_retry import ScriptedPolicy
+
+
+class InnerItem:
+    def __init__(self, uid):
+        self.uid = uid
+
+    def get_uid(self):
+        return self.uid
+
+
+class InnerListResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+class InnerItemManager:
+    def __init__(self, policy=None, responses=()):
+        """`responses` are the (status, applied) outcomes of the batch calls, then they all succeed"""
+        self.policy = policy
+        self.responses = list(responses)
+        self.uploaded = {}
+        self.batches = 0
+        self.created = 0
+
+    def create_raw(self, meta, content):
+        self.created += 1
+        if meta == b"\xc0":  # msgpack's None
+            raise ValueError("Invalid meta")
+        return InnerItem("uid{}".format(self.created))
+
+    def batch(self, items, deps, fetch_options):
+        self.batches += 1
+        if self.policy is not None:
+            self.policy.requests += 1
+        status, applied = self.responses.pop(0) if self.responses else (200, True)
+        if self.policy is not None:
+            self.policy.response = (status, None)
+        if any(item.uid in self.uploaded for item in items):
+            raise RuntimeError("Conflict")
+        if applied:
+            self.uploaded.update((item.uid, item) for item in items)
+        if status != 200:
+            raise RuntimeError("Request failed")
+
+    def fetch_multi(self, uids, fetch_options):
+        if self.policy is not None:
+            self.policy.requests += 1
+            self.policy.response = (200, None)
+        return InnerListResponse([self.uploaded[uid] for uid in uids if uid in self.uploaded])
+
+
+def make(responses, **kwargs):
+    policy = ScriptedPolicy(**kwargs)
+    inner = InnerItemManager(policy, responses)
+    return ItemManager(inner, retry_policy=policy), inner
+
+
+class TestBulkUpload(unittest.TestCase):
+    def test_upload(self):
+        it_mgr, inner = make([(503, False), (0, False)])
+        entries = (({"type": "bla"}, b"content") for _ in range(25))
+        results = it_mgr.bulk_upload(entries, chunk_size=10, max_in_flight=1)
+        self.assertEqual(list(range(25)), [result.index for result in results])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(25, len(inner.uploaded))
+        self.assertEqual(5, inner.batches)
+
+    def test_lost_response(self):
+        # The first batch went through but its response was lost: nothing is uploaded twice
+        it_mgr, inner = make([(0, True)])
+        results = it_mgr.bulk_upload([({"type": "bla"}, b"content")] * 5, chunk_size=10)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(1, inner.batches)
+        self.assertEqual(5, len(inner.uploaded))
+
+    def test_permanent_error(self):
+        it_mgr, inner = make([(400, False)])
+        results = it_mgr.bulk_upload([({"type": "bla"}, b"content")] * 5, chunk_size=10)
+        self.assertEqual(5, len(results))
+        self.assertFalse(any(result.ok for result in results))
+        self.assertEqual(400, results[0].error.http_status)
+        self.assertEqual(1, inner.batches)
+
+    def test_no_policy(self):
+        inner = InnerItemManager()
+        inner.responses = [(503, False)]
+        results = ItemManager(inner).bulk_upload([({"type": "bla"}, b"content")] * 5, chunk_size=10)
+        self.assertFalse(any(result.ok for result in results))
+        self.assertEqual(1, inner.batches)
+
+    def test_failed_creates(self):
+        it_mgr, inner = make([])
+        results = it_mgr.bulk_upload([(None, b"content")] * 3 + [({"type": "bla"}, b"content")], chunk_size=3)
+        self.assertEqual([False, False, False, True], [result.ok for result in results])
+        self.assertIsInstance(results[0].error, ValueError)
+        # The chunk where every create failed wasn't sent
+        self.assertEqual(1, inner.batches)
@@ -0,0 +1,49 @@
+import unittest
+from etebase import cached_property
+
+
+class Counted:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    @cached_property
+    def doubled(self):
+        self.calls += 1
+        return self.value * 2
+
+    @doubled.setter
+    def doubled(self, value):
+        self.__class__.doubled.cache_clear(self)
+        self.value = value // 2
+
+
+class TestCachedProperty(unittest.TestCase):
+    def test_per_instance(self):
+        first = Counted(1)
+        second = Counted(2)
+        for _ in range(3):
+            self.assertEqual(2, first.doubled)
+            self.assertEqual(4, second.doubled)
+        self.assertEqual(1, first.calls)
+        self.assertEqual(1, second.calls)
+
+    def test_setter_invalidates_only_its_instance(self):
+        first = Counted(1)
+        second = Counted(2)
+        first.doubled
+        second.doubled
+        first.doubled = 10
+        self.assertEqual(10, first.doubled)
+        self.assertEqual(2, first.calls)
+        self.assertEqual(4, second.doubled)
+        self.assertEqual(1, second.calls)
+
+    def test_read_only(self):
+        class ReadOnly:
+            @cached_property
+            def value(self):
+                return 1
+
+        with self.assertRaises(AttributeError):
+            ReadOnly().value = 2
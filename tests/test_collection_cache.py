@@ -0,0 +1,109 @@
+import unittest
+from etebase import CollectionManager
+
+
+class InnerCol:
+    def __init__(self, uid, etag, deleted=False):
+        self.uid = uid
+        self.etag = etag
+        self.deleted = deleted
+
+    def get_uid(self):
+        return self.uid
+
+    def get_etag(self):
+        return self.etag
+
+    def is_deleted(self):
+        return self.deleted
+
+
+class InnerListResponse:
+    def __init__(self, data, removed=()):
+        self.data = data
+        self.removed = removed
+
+    def get_data(self):
+        return self.data
+
+    def get_removed_memberships(self):
+        return [InnerCol(uid, None) for uid in self.removed]
+
+
+class Inner:
+    """Serves collections from `server`, counting the calls that would hit the network or derive keys"""
+
+    def __init__(self):
+        self.server = {}
+        self.fetches = 0
+        self.item_managers = 0
+
+    def fetch(self, col_uid, fetch_options):
+        self.fetches += 1
+        return InnerCol(col_uid, self.server[col_uid])
+
+    def get_item_manager(self, col):
+        self.item_managers += 1
+        return object()
+
+    def upload(self, col, fetch_options):
+        self.server[col.uid] = col.etag + "'"
+
+    def list(self, col_type, fetch_options):
+        return self.response
+
+    def cache_save_with_content(self, col):
+        return "{}|{}".format(col.uid, col.etag).encode()
+
+    def cache_load(self, cached):
+        return InnerCol(*bytes(cached).decode().split("|"))
+
+
+class TestCollectionCache(unittest.TestCase):
+    def test_disabled(self):
+        inner = Inner()
+        inner.server["col1"] = "e1"
+        col_mgr = CollectionManager(inner)
+        col_mgr.fetch("col1")
+        col_mgr.fetch("col1")
+        self.assertEqual(2, inner.fetches)
+        self.assertIsNone(col_mgr.cache_stats)
+
+    def test_fetch_and_item_manager(self):
+        inner = Inner()
+        inner.server.update({"col1": "e1", "col2": "e2"})
+        col_mgr = CollectionManager(inner)
+        col_mgr.enable_cache()
+        for _ in range(3):
+            col = col_mgr.fetch("col1")
+            self.assertEqual("e1", col.etag)
+            item_mgr = col_mgr.get_item_manager(col)
+        self.assertIs(item_mgr, col_mgr.get_item_manager(col_mgr.fetch("col1")))
+        self.assertEqual((1, 1), (inner.fetches, inner.item_managers))
+        self.assertEqual(0.75, col_mgr.cache_stats["collections"].hit_rate)
+
+        col_mgr.upload(col)
+        col = col_mgr.fetch("col1")
+        self.assertEqual("e1'", col.etag)
+        col_mgr.get_item_manager(col)
+        self.assertEqual((2, 2), (inner.fetches, inner.item_managers))
+
+    def test_list_updates(self):
+        inner = Inner()
+        inner.server.update({"col1": "e1", "col2": "e2", "col3": "e3"})
+        col_mgr = CollectionManager(inner)
+        col_mgr.enable_cache(max_size=2)
+        for uid in ["col1", "col2", "col3"]:
+            col_mgr.fetch(uid)
+        self.assertEqual(1, col_mgr.cache_stats["collections"].evictions)
+
+        inner.response = InnerListResponse([InnerCol("col2", "e4"), InnerCol("col3", "e3", deleted=True)])
+        col_mgr.list("some.coltype")
+        self.assertEqual("e4", col_mgr.fetch("col2").etag)
+        col_mgr.fetch("col3")
+        self.assertEqual(4, inner.fetches)
+
+        inner.response = InnerListResponse([], removed=["col2"])
+        col_mgr.list("some.coltype")
+        col_mgr.fetch("col2")
+        self.assertEqual(5, inner.fetches)
@@ -0,0 +1,99 @@
+import io
+import tempfile
+import tracemalloc
+import unittest
+from etebase import Item
+
+
+class Inner:
+    def __init__(self):
+        self.content = b""
+
+    def set_content(self, value):
+        self.content = bytes(value)
+
+    def get_content(self):
+        return self.content
+
+    def get_content_reader(self):
+        return io.BytesIO(self.content)
+
+
+class SizeInner:
+    """Only looks at the size of what it's given, so that all the allocations measured are the wrapper's"""
+
+    def __init__(self, content=b""):
+        self.content = content
+        self.size = None
+
+    def set_content(self, value):
+        with memoryview(value) as view:
+            self.size = view.nbytes
+
+    def get_content_reader(self):
+        return io.BytesIO(self.content)
+
+
+class NullWriter(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, b):
+        return len(b)
+
+
+def peak_allocated(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestContentFiles(unittest.TestCase):
+    def test_set_content_from(self):
+        item = Item(Inner())
+        item.set_content_from(io.BytesIO(b"from a stream"))
+        self.assertEqual(b"from a stream", item.content)
+
+        with tempfile.TemporaryFile() as f:
+            f.write(b"from a file")
+            f.seek(0)
+            item.set_content_from(f)
+            self.assertEqual(len(b"from a file"), f.tell())
+        self.assertEqual(b"from a file", item.content)
+
+        with tempfile.TemporaryFile() as f:
+            item.set_content_from(f)
+        self.assertEqual(b"", item.content)
+
+    def test_write_content_to(self):
+        item = Item(Inner())
+        item.content = bytes(range(256)) * 10
+        out = io.BytesIO()
+        item.write_content_to(out, chunk_size=100)
+        self.assertEqual(item.content, out.getvalue())
+
+    def test_position(self):
+        item = Item(Inner())
+        for fileobj in (tempfile.TemporaryFile(), io.BytesIO()):
+            with fileobj as f:
+                f.write(b"skip from here")
+                f.seek(5)
+                item.set_content_from(f)
+            self.assertEqual(b"from here", item.content)
+
+    def test_memory_ceiling(self):
+        size = 16 * 1024 * 1024
+        chunk_size = 64 * 1024
+        with tempfile.TemporaryFile() as f:
+            f.truncate(size)
+            item = Item(SizeInner())
+            # The file is mapped rather than read into memory
+            self.assertLess(peak_allocated(lambda: item.set_content_from(f)), chunk_size)
+            self.assertEqual(size, item._inner.size)
+
+        item = Item(SizeInner(bytes(size)))
+        peak = peak_allocated(lambda: item.write_content_to(NullWriter(), chunk_size))
+        self.assertLess(peak, 4 * chunk_size)
@@ -0,0 +1,20 @@
+import unittest
+from etebase import ItemListResponse, msgpack_encode
+
+
+class Inner:
+    def decrypt_all(self, with_content):
+        return [
+            ("uid1", "etag1", msgpack_encode({"name": "first"}), b"content" if with_content else None),
+            ("uid2", "etag2", msgpack_encode({"name": "second"}), None),
+        ]
+
+
+class TestDecryptAll(unittest.TestCase):
+    def test_decrypt_all(self):
+        response = ItemListResponse(Inner())
+        self.assertEqual([
+            ("uid1", "etag1", {"name": "first"}, b"content"),
+            ("uid2", "etag2", {"name": "second"}, None),
+        ], response.decrypt_all())
+        self.assertIsNone(response.decrypt_all(with_content=False)[0][3])
@@ -0,0 +1,53 @@
+import unittest
+from etebase import ItemManager
+
+
+class InnerItem:
+    def __init__(self, uid, etag):
+        self.uid = uid
+        self.etag = etag
+
+    def get_uid(self):
+        return self.uid
+
+    def get_etag(self):
+        return self.etag
+
+
+class InnerListResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+class InnerItemManager:
+    def __init__(self, etags):
+        self.etags = etags
+        self.requests = []
+
+    def fetch_multi(self, uids, fetch_options):
+        self.requests.append(uids)
+        return InnerListResponse([InnerItem(uid, self.etags[uid]) for uid in uids if uid in self.etags])
+
+
+class TestFetchMultiChanged(unittest.TestCase):
+    def test_changed(self):
+        server = {"uid{}".format(i): "etag{}".format(i) for i in range(25)}
+        local = dict(server)
+        local["uid3"] = "old"
+        local["uid20"] = "old"
+        local["gone"] = "etag"
+        inner = InnerItemManager(server)
+        it_mgr = ItemManager(inner)
+        changed = it_mgr.fetch_multi_changed(local, chunk_size=10, max_in_flight=2)
+        self.assertEqual(["uid20", "uid3"], sorted(item.uid for item in changed))
+        self.assertEqual([6, 10, 10], sorted(len(uids) for uids in inner.requests))
+
+    def test_pairs(self):
+        inner = InnerItemManager({"uid1": "etag1", "uid2": "etag2"})
+        it_mgr = ItemManager(inner)
+        pairs = iter([("uid1", "etag1"), ("uid2", "old")])
+        self.assertEqual(["uid2"], [item.uid for item in it_mgr.fetch_multi_changed(pairs)])
+        self.assertEqual([], it_mgr.fetch_multi_changed({}))
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous, only meant to catch something heavy being imported eagerly again
+IMPORT_BUDGET_MS = int(os.environ.get("ETEBASE_IMPORT_BUDGET_MS", "500"))
+
+
+def run_import(code):
+    """Run `code` in a fresh interpreter, returns the modules it loaded and their cumulative import times (us)
+
+    Modules loaded with `importlib.import_module` aren't reported by `-X importtime`, so the loaded modules are
+    taken from `sys.modules`.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return set(proc.stdout.split()), times
+
+
+class TestImport(unittest.TestCase):
+    def test_lazy(self):
+        modules, times = run_import("import etebase")
+        self.assertIn("etebase", modules)
+        self.assertNotIn("etebase.etebase_python", modules)
+        self.assertNotIn("msgpack", modules)
+        self.assertLess(times["etebase"] / 1000, IMPORT_BUDGET_MS)
+
+    def test_submodules_lazy(self):
+        modules, _ = run_import("import etebase.aio, etebase.sync, etebase.store, etebase.index, etebase.writeback")
+        self.assertNotIn("etebase.etebase_python", modules)
+        self.assertNotIn("msgpack", modules)
+
+    def test_msgpack_on_first_use(self):
+        modules, _ = run_import("import etebase; etebase.msgpack_decode(etebase.msgpack_encode({'a': 1}))")
+        self.assertIn("msgpack", modules)
+        self.assertNotIn("etebase.etebase_python", modules)
+
+    def test_getattr(self):
+        import etebase
+        with self.assertRaises(AttributeError):
+            etebase.NoSuchThing
+        self.assertIn("DEFAULT_SERVER_URL", dir(etebase))
+        self.assertIn("PrefetchOption", dir(etebase))
@@ -0,0 +1,72 @@
+import unittest
+from etebase.index import MetadataIndex
+
+
+class Meta:
+    def __init__(self, name, mtime, item_type="file"):
+        self.name = name
+        self.mtime = mtime
+        self.item_type = item_type
+
+
+class Obj:
+    def __init__(self, uid, etag, name=None, mtime=None, deleted=False):
+        self.uid = uid
+        self.etag = etag
+        self.deleted = deleted
+        self._meta = Meta(name, mtime)
+        self.decrypted = 0
+
+    @property
+    def meta_typed(self):
+        self.decrypted += 1
+        return self._meta
+
+
+class Col:
+    def __init__(self, uid):
+        self.uid = uid
+
+
+class TestMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MetadataIndex()
+        self.index.update("col1", [
+            Obj("a", "1", "Holiday photos", 100),
+            Obj("b", "1", "Tax return 2020", 200),
+            Obj("c", "1", "50%_off", 300),
+        ])
+        self.index.update("col2", [Obj("d", "1", "holiday plans", 400)])
+
+    def tearDown(self):
+        self.index.close()
+
+    def uids(self, **kwargs):
+        return [entry.uid for entry in self.index.search(**kwargs)]
+
+    def test_search(self):
+        self.assertEqual(["d", "a"], self.uids(name="HOLIDAY"))
+        self.assertEqual(["d", "a"], self.uids(name="ol"))
+        self.assertEqual(["b"], self.uids(name_prefix="tax"))
+        self.assertEqual(["c"], self.uids(name="%_"))
+        self.assertEqual(["c", "b"], self.uids(mtime_from=200, mtime_to=400))
+        self.assertEqual(["a"], self.uids(name="holiday", col_uid="col1"))
+        self.assertEqual(["d"], self.uids(limit=1))
+
+    def test_fallback(self):
+        self.index.has_fts = False
+        self.assertEqual(["d", "a"], self.uids(name="holiday"))
+
+    def test_incremental(self):
+        unchanged = Obj("a", "1", "Holiday photos", 100)
+        changed = Obj("b", "2", "Receipts", 500)
+        self.assertEqual(1, self.index.update("col1", [unchanged, changed]))
+        self.assertEqual(0, unchanged.decrypted)
+        self.assertEqual([], self.uids(name="tax"))
+        self.assertEqual(["b"], self.uids(name="receipts"))
+        self.assertEqual({"a": "1", "b": "2", "c": "1"}, self.index.etags("col1"))
+
+        self.index.on_items(Col("col1"), [], [Obj("a", "3", deleted=True)])
+        self.assertEqual(["d"], self.uids(name="holiday"))
+        self.index.remove_collection("col1")
+        self.assertEqual(1, len(self.index))
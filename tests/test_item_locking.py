@@ -0,0 +1,59 @@
+import threading
+import unittest
+from etebase import Client, Account
+
+from .test_smoketest import STORED_SESSION, COL_TYPE
+
+# Nothing listens there, so every upload fails right away, after the items were locked
+UNREACHABLE_URL = "http://127.0.0.1:9"
+
+
+class TestItemLocking(unittest.TestCase):
+    def setUp(self):
+        client = Client("python_test", UNREACHABLE_URL)
+        account = Account.restore(client, STORED_SESSION, None)
+        account.force_server_url(UNREACHABLE_URL)
+        col_mgr = account.get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Name"}, b"")
+        self.it_mgr = col_mgr.get_item_manager(col)
+        self.items = [self.it_mgr.create({"name": str(i)}, b"") for i in range(8)]
+
+    def run_threads(self, *targets):
+        threads = [threading.Thread(target=target, daemon=True) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+        self.assertFalse(any(thread.is_alive() for thread in threads), "Deadlocked")
+
+    def test_reversed_batches(self):
+        def upload(items, use_transaction):
+            for _ in range(50):
+                try:
+                    if use_transaction:
+                        self.it_mgr.transaction(items, items[:2])
+                    else:
+                        self.it_mgr.batch(items)
+                except Exception:
+                    pass
+
+        self.run_threads(lambda: upload(self.items, False), lambda: upload(self.items[::-1], False),
+                         lambda: upload(self.items[::-1], True))
+
+    def test_getters_during_upload(self):
+        uids = [item.uid for item in self.items]
+        read = []
+
+        def upload():
+            for _ in range(50):
+                try:
+                    self.it_mgr.batch(self.items[::-1])
+                except Exception:
+                    pass
+
+        def get():
+            for _ in range(50):
+                read.append([item.uid for item in self.items])
+
+        self.run_threads(upload, get)
+        self.assertEqual([uids] * 50, read)
@@ -0,0 +1,58 @@
+import unittest
+from etebase import Item, ItemListResponse
+
+
+class InnerMetadata:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def get_name(self):
+        self.calls.append("name")
+        return self.name
+
+    def get_mtime(self):
+        self.calls.append("mtime")
+        return 1234
+
+
+class InnerItem:
+    def __init__(self, name):
+        self.name = name
+        self.get_meta_calls = 0
+
+    def get_meta(self):
+        self.get_meta_calls += 1
+        return InnerMetadata(self.name)
+
+    def set_meta_raw(self, value):
+        self.name = "new"
+
+
+class InnerListResponse:
+    def meta_all(self):
+        return [InnerMetadata("first"), InnerMetadata("second")]
+
+
+class TestMetaTyped(unittest.TestCase):
+    def test_lazy_fields(self):
+        inner = InnerItem("name")
+        item = Item(inner)
+        meta = item.meta_typed
+        self.assertEqual([], meta._inner.calls)
+        self.assertEqual("name", meta.name)
+        self.assertEqual("name", meta.name)
+        self.assertEqual(["name"], meta._inner.calls)
+        self.assertIs(meta, item.meta_typed)
+        self.assertEqual(1, inner.get_meta_calls)
+
+    def test_invalidated_by_setter(self):
+        item = Item(InnerItem("name"))
+        self.assertEqual("name", item.meta_typed.name)
+        item.meta = {"name": "new"}
+        self.assertEqual("new", item.meta_typed.name)
+
+    def test_meta_typed_all(self):
+        metas = ItemListResponse(InnerListResponse()).meta_typed_all()
+        self.assertEqual(["first", "second"], [meta.name for meta in metas])
+        self.assertEqual(1234, metas[0].mtime)
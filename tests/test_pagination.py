@@ -0,0 +1,47 @@
+import unittest
+from etebase import _iter_pages
+
+
+class Options:
+    def __init__(self):
+        self.value = None
+
+    def stoken(self, value):
+        self.value = value
+        return self
+
+
+class Page:
+    def __init__(self, data, stoken, done):
+        self.data = data
+        self.stoken = stoken
+        self.done = done
+
+
+class Pages:
+    def __init__(self, num_pages):
+        self.num_pages = num_pages
+        self.requested = []
+
+    def fetch(self, options):
+        index = int(options.value or 0)
+        self.requested.append(options.value)
+        return Page([index], str(index + 1), index + 1 == self.num_pages)
+
+
+class TestPagination(unittest.TestCase):
+    def test_follows_stoken(self):
+        for prefetch_next in (False, True):
+            pages = Pages(4)
+            options = Options()
+            data = [x for page in _iter_pages(pages.fetch, options, "stoken", prefetch_next) for x in page.data]
+            self.assertEqual([0, 1, 2, 3], data)
+            self.assertEqual([None, "1", "2", "3"], pages.requested)
+            self.assertEqual("3", options.value)
+
+    def test_lazy(self):
+        pages = Pages(100)
+        it = _iter_pages(pages.fetch, Options(), "stoken", False)
+        next(it)
+        next(it)
+        self.assertEqual(2, len(pages.requested))
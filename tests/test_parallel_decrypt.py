@@ -0,0 +1,35 @@
+import unittest
+from etebase import Client, Account, FetchOptions
+
+from .test_smoketest import STORED_SESSION, SERVER_URL, COL_TYPE
+
+
+class TestParallelDecrypt(unittest.TestCase):
+    """Needs the test server, like the smoketest"""
+
+    def test_same_as_sequential(self):
+        client = Client("python_test", SERVER_URL)
+        etebase = Account.restore(client, STORED_SESSION, None)
+        etebase.force_server_url(SERVER_URL)
+        etebase.fetch_token()
+
+        col_mgr = etebase.get_collection_manager()
+        col = col_mgr.create(COL_TYPE, {"name": "Parallel"}, b"")
+        col_mgr.upload(col)
+        it_mgr = col_mgr.get_item_manager(col)
+        items = [it_mgr.create({"type": "file", "name": "item{}".format(i), "mtime": i},
+                               "content {}".format(i).encode() if i % 3 else b"")
+                 for i in range(50)]
+        it_mgr.batch(items)
+
+        response = it_mgr.list(FetchOptions().limit(100))
+        data = list(response.data)
+        self.assertEqual(50, len(data))
+        # The same items in the same order as going through `data` one by one
+        sequential = [(item.uid, item.etag, item.meta, bytes(item.content)) for item in data]
+        self.assertEqual(sequential, [(uid, etag, meta, bytes(content))
+                                      for uid, etag, meta, content in response.decrypt_all()])
+        self.assertEqual([(uid, etag, meta, None) for uid, etag, meta, _ in sequential],
+                         response.decrypt_all(with_content=False))
+        self.assertEqual([(item.meta_typed.name, item.meta_typed.mtime) for item in data],
+                         [(meta.name, meta.mtime) for meta in response.meta_typed_all()])
@@ -0,0 +1,134 @@
+import time
+import unittest
+from unittest import mock
+import etebase
+from etebase import ItemManager, RateLimiter, RetryPolicy
+
+
+class ScriptedPolicy(RetryPolicy):
+    """Gets the responses of the stub managers instead of the ones of the transport"""
+
+    def __init__(self, **kwargs):
+        super().__init__(base_delay=0.001, **kwargs)
+        self.requests = 0
+        self.response = (200, None)
+        self.delays = []
+
+    def _requests(self):
+        return self.requests
+
+    def _last_response(self):
+        return self.response
+
+    def delay(self, attempt, retry_after):
+        ret = super().delay(attempt, retry_after)
+        self.delays.append(ret)
+        return ret
+
+
+class InnerItemManager:
+    def __init__(self, policy, responses):
+        self.policy = policy
+        self.responses = list(responses)
+        self.calls = 0
+
+    def _request(self):
+        self.calls += 1
+        self.policy.requests += 1
+        self.policy.response = self.responses.pop(0)
+        if self.policy.response[0] >= 400 or self.policy.response[0] == 0:
+            raise RuntimeError("Request failed")
+
+    def fetch_multi(self, uids, fetch_options):
+        self._request()
+
+    def batch(self, items, deps, fetch_options):
+        if not items:
+            raise RuntimeError("Nothing to upload")
+        self._request()
+
+
+class Item:
+    def __init__(self):
+        self._inner = object()
+
+
+def make(responses, **kwargs):
+    policy = ScriptedPolicy(**kwargs)
+    inner = InnerItemManager(policy, responses)
+    return ItemManager(inner, retry_policy=policy), inner, policy
+
+
+class TestRetry(unittest.TestCase):
+    def test_retry_after(self):
+        it_mgr, inner, policy = make([(429, 0.01), (503, None), (200, None)])
+        it_mgr.batch([Item()])
+        self.assertEqual(3, inner.calls)
+        self.assertGreaterEqual(policy.delays[0], 0.01)
+        self.assertLessEqual(policy.delays[1], 0.002)
+
+    def test_idempotency(self):
+        it_mgr, inner, _ = make([(0, None), (502, None), (200, None)])
+        it_mgr.fetch_multi(["uid"])
+        self.assertEqual(3, inner.calls)
+
+        it_mgr, inner, _ = make([(0, None), (200, None)])
+        with self.assertRaises(RuntimeError):
+            it_mgr.batch([Item()])
+        self.assertEqual(1, inner.calls)
+
+    def test_give_up(self):
+        it_mgr, inner, _ = make([(503, None)] * 5, max_attempts=3)
+        with self.assertRaises(RuntimeError):
+            it_mgr.fetch_multi(["uid"])
+        self.assertEqual(3, inner.calls)
+
+        it_mgr, inner, _ = make([(429, 60), (200, None)], max_delay=1)
+        with self.assertRaises(RuntimeError):
+            it_mgr.fetch_multi(["uid"])
+        self.assertEqual(1, inner.calls)
+
+    def test_local_errors(self):
+        it_mgr, inner, _ = make([])
+        with self.assertRaises(RuntimeError) as cm:
+            it_mgr.batch([])
+        self.assertEqual(0, inner.calls)
+        self.assertFalse(hasattr(cm.exception, "http_status"))
+
+    def test_http_status(self):
+        it_mgr, _, _ = make([(503, None), (401, None)])
+        with self.assertRaises(RuntimeError) as cm:
+            it_mgr.fetch_multi(["uid"])
+        self.assertEqual(401, cm.exception.http_status)
+
+    def test_no_policy(self):
+        class Transport:
+            calls = 0
+
+            @classmethod
+            def thread_stats(cls):
+                cls.calls += 1
+                return [0] * 7
+
+            @classmethod
+            def last_status(cls):
+                cls.calls += 1
+                return policy.response[0]
+
+        etebase.etebase_python.Transport  # Loaded before patching, so that it doesn't replace the patch
+        _, inner, policy = make([(200, None), (401, None)])
+        it_mgr = ItemManager(inner)
+        with mock.patch.object(etebase.etebase_python, "Transport", Transport):
+            it_mgr.fetch_multi(["uid"])
+            self.assertEqual(0, Transport.calls)
+            with self.assertRaises(RuntimeError) as cm:
+                it_mgr.fetch_multi(["uid"])
+        self.assertEqual(401, cm.exception.http_status)
+        self.assertEqual(2, inner.calls)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=100, burst=2)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.025)
@@ -0,0 +1,114 @@
+import threading
+import unittest
+from etebase import SessionPool
+
+
+class Account:
+    def __init__(self, stored_session):
+        self.stored_session = stored_session
+        self.token_fetches = 0
+
+    def fetch_token(self):
+        self.token_fetches += 1
+
+    def get_collection_manager(self):
+        return ColMgr()
+
+
+class ColMgr:
+    def get_item_manager(self, col):
+        return object()
+
+
+class Col:
+    def __init__(self, uid):
+        self.uid = uid
+
+
+class Pool(SessionPool):
+    def _restore(self, stored_session):
+        return Account(stored_session)
+
+
+def http_error(message, status):
+    e = Exception(message)
+    e.http_status = status
+    return e
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_lru(self):
+        pool = Pool(None, max_size=2)
+        with pool.checkout("user1", "session1") as session:
+            self.assertEqual("session1", session.account.stored_session)
+            self.assertIs(session.collection_manager, session.collection_manager)
+            self.assertIs(session.get_item_manager(Col("col1")), session.get_item_manager(Col("col1")))
+        with pool.checkout("user2", "session2"):
+            pass
+        with pool.checkout("user1", "session1"):
+            pass
+        with pool.checkout("user3", "session3"):
+            pass
+        self.assertEqual((1, 3, 1, 0, 2), tuple(pool.stats))
+        with pool.checkout("user2", "session2") as session:
+            pass
+        # user2 was evicted, so this is a fresh session
+        self.assertEqual((1, 4, 2, 0, 2), tuple(pool.stats))
+
+    def test_refresh_on_auth_error(self):
+        pool = Pool(None)
+        calls = []
+
+        def func(session):
+            calls.append(session.account.token_fetches)
+            if session.account.token_fetches == 0:
+                raise http_error("Invalid token", 401)
+            return "ok"
+
+        self.assertEqual("ok", pool.run("user1", "session1", func))
+        self.assertEqual([0, 1], calls)
+        self.assertEqual("ok", pool.run("user1", "session1", func))
+        self.assertEqual(1, pool.stats.refreshes)
+
+        with self.assertRaises(ValueError):
+            pool.run("user1", "session1", lambda session: int("not a number"))
+        self.assertEqual(1, pool.stats.refreshes)
+
+    def test_not_auth_errors(self):
+        pool = Pool(None)
+        calls = []
+
+        def func(session, error):
+            calls.append(session)
+            raise error
+
+        # Errors mentioning tokens aren't auth errors unless the server answered 401
+        for error in (http_error("Bad stoken", 400), Exception("Unauthorized: Invalid token")):
+            with self.assertRaises(Exception):
+                pool.run("user1", "session1", lambda session: func(session, error))
+        self.assertEqual(2, len(calls))
+        self.assertEqual(0, pool.stats.refreshes)
+
+    def test_token_ttl(self):
+        pool = Pool(None, token_ttl=0)
+        with pool.checkout("user1", "session1"):
+            pass
+        with pool.checkout("user1", "session1") as session:
+            self.assertEqual(2, session.account.token_fetches)
+
+    def test_threads(self):
+        pool = Pool(None, max_size=8)
+
+        def work():
+            for i in range(200):
+                with pool.checkout("user{}".format(i % 16), "session"):
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = pool.stats
+        self.assertEqual(1600, stats.hits + stats.misses)
+        self.assertEqual(8, stats.size)
@@ -0,0 +1,52 @@
+import struct
+import unittest
+from etebase import Client, Account
+
+from .test_smoketest import STORED_SESSION, COL_TYPE
+
+MAGIC = b"ETEBSNP1"
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        # Everything here is local, no server needed
+        client = Client("python_test", "http://127.0.0.1:9")
+        account = Account.restore(client, STORED_SESSION, None)
+        col = account.get_collection_manager().create(COL_TYPE, {"name": "Name"}, b"")
+        self.it_mgr = account.get_collection_manager().get_item_manager(col)
+        self.items = [self.it_mgr.create({"name": str(i)}, "content {}".format(i).encode()) for i in range(3)]
+
+    def test_roundtrip(self):
+        snapshot = self.it_mgr.cache_save_many(self.items)
+        self.assertTrue(snapshot.startswith(MAGIC))
+        restored = self.it_mgr.cache_load_many(memoryview(snapshot))
+        self.assertEqual([item.uid for item in self.items], [item.uid for item in restored])
+        self.assertEqual([b"content 0", b"content 1", b"content 2"], [bytes(item.content) for item in restored])
+        self.assertEqual(["0", "1", "2"], [item.meta["name"] for item in restored])
+
+    def test_framing(self):
+        snapshot = self.it_mgr.cache_save_many(self.items[:1], with_content=False)
+        (length,) = struct.unpack_from("<I", snapshot, len(MAGIC))
+        self.assertEqual(len(MAGIC) + 4 + length, len(snapshot))
+        self.assertEqual(bytes(self.it_mgr.cache_save(self.items[0], with_content=False)), snapshot[len(MAGIC) + 4:])
+
+    def test_empty(self):
+        snapshot = self.it_mgr.cache_save_many([])
+        self.assertEqual(MAGIC, snapshot)
+        self.assertEqual([], self.it_mgr.cache_load_many(snapshot))
+
+    def test_bad_magic(self):
+        snapshot = self.it_mgr.cache_save_many(self.items)
+        for bad in (b"", b"ETEBSNP", b"ETEBSNP2" + snapshot[len(MAGIC):]):
+            with self.assertRaises(Exception):
+                self.it_mgr.cache_load_many(bad)
+
+    def test_truncated(self):
+        snapshot = self.it_mgr.cache_save_many(self.items)
+        # In the middle of a length, in the middle of an item and right after a length
+        for end in (len(MAGIC) + 2, len(snapshot) - 1, len(MAGIC) + 4):
+            with self.assertRaises(Exception):
+                self.it_mgr.cache_load_many(snapshot[:end])
+        # Trailing garbage isn't silently ignored either
+        with self.assertRaises(Exception):
+            self.it_mgr.cache_load_many(snapshot + b"\x01")
@@ -0,0 +1,98 @@
+import unittest
+from etebase.store import LocalStore
+
+
+class Obj:
+    def __init__(self, uid, etag, deleted=False, collection_type="some.coltype", stoken=None):
+        self.uid = uid
+        self.etag = etag
+        self.deleted = deleted
+        self.collection_type = collection_type
+        self.stoken = stoken
+
+
+class Page:
+    def __init__(self, data, stoken, done=True, removed_memberships=()):
+        self.data = data
+        self.stoken = stoken
+        self.done = done
+        self.removed_memberships = removed_memberships
+
+
+class Manager:
+    """Serves pages keyed by the stoken they were requested with"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def _iter(self, fetch_options):
+        self.requested.append(fetch_options.value)
+        return iter(self.pages.get(fetch_options.value, [Page([], fetch_options.value)]))
+
+    def iter_pages(self, *args):
+        return self._iter(args[-2])
+
+    def get_item_manager(self, col):
+        return self.item_manager
+
+    def cache_save(self, obj, with_content=True):
+        return "{}|{}|{}".format(obj.uid, obj.etag, obj.collection_type).encode()
+
+    def cache_load(self, cached):
+        uid, etag, col_type = bytes(cached).decode().split("|")
+        return Obj(uid, etag, collection_type=col_type)
+
+
+class Options:
+    def __init__(self):
+        self.value = None
+
+    def stoken(self, value):
+        self.value = value
+        return self
+
+    def copy(self):
+        ret = Options()
+        ret.value = self.value
+        return ret
+
+
+class TestLocalStore(unittest.TestCase):
+    def test_incremental_sync(self):
+        store = LocalStore(":memory:")
+        col_mgr = Manager({
+            None: [Page([Obj("col1", "e1"), Obj("col2", "e2")], "1", False), Page([Obj("col3", "e3")], "2")],
+            "2": [Page([Obj("col2", "e4", deleted=True)], "3", removed_memberships=[Obj("col3", None)])],
+        })
+        self.assertEqual(3, store.sync_collections(col_mgr, "some.coltype", Options()))
+        self.assertEqual("2", store.collections_stoken("some.coltype"))
+        self.assertEqual(2, store.sync_collections(col_mgr, "some.coltype", Options()))
+        self.assertEqual([None, "2"], col_mgr.requested)
+        self.assertEqual(["col1"], [col.uid for col in store.list_collections(col_mgr, "some.coltype")])
+        self.assertIsNone(store.get_collection(col_mgr, "col2"))
+
+    def test_items(self):
+        store = LocalStore(":memory:")
+        col_mgr = Manager({})
+        col_mgr.item_manager = Manager({
+            None: [Page([Obj("it1", "e1"), Obj("it2", "e2")], "5")],
+            "5": [Page([Obj("it1", "e3"), Obj("it2", "e4", deleted=True)], "6")],
+        })
+        col = Obj("col1", "e1", stoken="5")
+        self.assertEqual(2, store.sync_items(col_mgr, col, Options()))
+        self.assertEqual(0, store.sync_items(col_mgr, col, Options()))
+        col.stoken = "6"
+        self.assertEqual(2, store.sync_items(col_mgr, col, Options()))
+        self.assertEqual({"it1": "e3"}, store.etags("col1"))
+        self.assertEqual("e3", store.get_item(col_mgr.item_manager, "col1", "it1").etag)
+        self.assertEqual([None, "5"], col_mgr.item_manager.requested)
+
+    def test_options_unchanged(self):
+        store = LocalStore(":memory:")
+        col_mgr = Manager({None: [Page([Obj("col1", "e1")], "1")]})
+        options = Options()
+        store.sync_collections(col_mgr, "some.coltype", options)
+        store.sync_collections(col_mgr, "some.coltype", options)
+        self.assertIsNone(options.value)
+        self.assertEqual([None, "1"], col_mgr.requested)
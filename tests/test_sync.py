@@ -0,0 +1,103 @@
+import time
+import unittest
+from etebase.sync import AccountSyncer
+
+
+class Obj:
+    def __init__(self, uid, deleted=False, stoken=None):
+        self.uid = uid
+        self.deleted = deleted
+        self.stoken = stoken
+
+
+class Page:
+    def __init__(self, data, stoken, done=True, removed_memberships=()):
+        self.data = data
+        self.stoken = stoken
+        self.done = done
+        self.removed_memberships = removed_memberships
+
+
+class Manager:
+    """Serves pages keyed by the stoken they were requested with"""
+
+    def __init__(self, pages, delay=0.0, fail=False):
+        self.pages = pages
+        self.delay = delay
+        self.fail = fail
+        self.item_managers = {}
+
+    def iter_pages(self, *args):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Failed")
+        stoken = args[-2].value
+        return iter(self.pages.get(stoken, [Page([], stoken)]))
+
+    def get_item_manager(self, col):
+        return self.item_managers[col.uid]
+
+
+class Options:
+    def __init__(self, value):
+        self.value = value
+
+
+class Syncer(AccountSyncer):
+    def _fetch_options(self, stoken):
+        return Options(stoken)
+
+
+class TestAccountSyncer(unittest.TestCase):
+    def test_sync(self):
+        col_mgr = Manager({
+            None: [Page([Obj("col1", stoken="2"), Obj("col2", stoken="1")], "c1")],
+            "c1": [Page([Obj("col2", deleted=True)], "c2", removed_memberships=[Obj("col1")])],
+        })
+        col_mgr.item_managers = {
+            "col1": Manager({None: [Page([Obj("it1"), Obj("it2")], "1", False), Page([Obj("it1", True)], "2")]}),
+            "col2": Manager({None: [Page([Obj("it3")], "1")]}),
+        }
+        changes = []
+        removed = []
+        checkpoints = {}
+        syncer = Syncer(col_mgr, "some.coltype", checkpoints,
+                        on_items=lambda col, changed, deleted: changes.append(
+                            (col.uid, [x.uid for x in changed], [x.uid for x in deleted])),
+                        on_collection_removed=removed.append)
+        result = syncer.sync()
+        self.assertTrue(result.ok)
+        self.assertEqual((2, 4), (result.collections, result.items))
+        self.assertEqual(sorted([("col1", ["it1", "it2"], []), ("col1", [], ["it1"]), ("col2", ["it3"], [])]),
+                         sorted(changes))
+        self.assertEqual({"collections": "c1", "items:col1": "2", "items:col2": "1"}, checkpoints)
+
+        # Collections that are already up to date are skipped
+        self.assertEqual(0, syncer.sync_collection(Obj("col1", stoken="2")))
+
+        result = syncer.sync()
+        self.assertEqual((2, 0), (result.collections, result.items))
+        self.assertEqual(["col1", "col2"], removed)
+        self.assertEqual({"collections": "c2"}, checkpoints)
+
+    def test_parallel(self):
+        cols = [Obj("col{}".format(i), stoken="1") for i in range(8)]
+        col_mgr = Manager({None: [Page(cols, "c1")]})
+        col_mgr.item_managers = {col.uid: Manager({None: [Page([Obj("it")], "1")]}, delay=0.2) for col in cols}
+        start = time.monotonic()
+        result = Syncer(col_mgr, "some.coltype", max_workers=8).sync()
+        self.assertEqual(8, result.items)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_failure(self):
+        col_mgr = Manager({None: [Page([Obj("col1"), Obj("col2")], "c1")]})
+        col_mgr.item_managers = {
+            "col1": Manager({None: [Page([Obj("it1")], "1")]}),
+            "col2": Manager({}, fail=True),
+        }
+        checkpoints = {}
+        result = Syncer(col_mgr, "some.coltype", checkpoints).sync()
+        self.assertFalse(result.ok)
+        self.assertEqual(["col2"], list(result.errors))
+        # The collection list isn't moved forward so col2 is retried on the next sync
+        self.assertEqual({"items:col1": "1"}, checkpoints)
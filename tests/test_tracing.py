@@ -0,0 +1,139 @@
+import contextlib
+import contextvars
+import threading
+import unittest
+from unittest import mock
+import etebase
+from etebase import ItemManager
+
+
+class RequestCounter(threading.local):
+    requests = 0
+
+
+class Native:
+    """The bindings, with thread stats that count the requests of `InnerItemManager`"""
+    def __init__(self, native):
+        self._native = native
+        self.counter = RequestCounter()
+        self.Transport = self
+
+    def __getattr__(self, name):
+        return getattr(self._native, name)
+
+    def thread_stats(self):
+        return [0, self.counter.requests, 0, 0, 0, 0, 0]
+
+
+class InnerListResponse:
+    def get_data(self):
+        return []
+
+
+class InnerItemManager:
+    def __init__(self, counter=None):
+        self.counter = counter
+
+    def batch(self, items, deps, fetch_options):
+        if not items:
+            raise RuntimeError("Nothing to upload")
+
+    def fetch_multi(self, uids, fetch_options):
+        if self.counter is not None:
+            self.counter.requests += 1
+        return InnerListResponse()
+
+
+class Item:
+    def __init__(self):
+        self._inner = object()
+
+
+class OtelSpan:
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.attributes = {}
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class BrokenOtelSpan(OtelSpan):
+    def set_attribute(self, key, value):
+        raise ValueError("Broken")
+
+
+class OtelTracer:
+    """Keeps the current span in a context variable, like OpenTelemetry does"""
+    def __init__(self, span_class=OtelSpan):
+        self.span_class = span_class
+        self.spans = []
+        self.current = contextvars.ContextVar("current", default=None)
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name):
+        span = self.span_class(name, self.current.get())
+        self.spans.append(span)
+        token = self.current.set(span)
+        try:
+            yield span
+        finally:
+            self.current.reset(token)
+
+
+class TestTracing(unittest.TestCase):
+    def test_callback(self):
+        spans = []
+        it_mgr = ItemManager(InnerItemManager(), spans.append)
+        it_mgr.batch([Item(), Item()])
+        with self.assertRaises(RuntimeError):
+            it_mgr.batch([])
+        self.assertEqual(["ItemManager.batch", "ItemManager.batch"], [span.name for span in spans])
+        self.assertEqual([2, 0], [span.items for span in spans])
+        self.assertIsNone(spans[0].error)
+        self.assertIsInstance(spans[1].error, RuntimeError)
+        self.assertGreaterEqual(spans[0].duration, spans[0].native_time)
+        self.assertEqual(2, spans[0].attributes["etebase.items"])
+
+    def test_opentelemetry(self):
+        tracer = OtelTracer()
+        ItemManager(InnerItemManager(), tracer).batch([Item()])
+        self.assertEqual(["ItemManager.batch"], [span.name for span in tracer.spans])
+        self.assertEqual(1, tracer.spans[0].attributes["etebase.items"])
+        self.assertIn("etebase.http.time", tracer.spans[0].attributes)
+
+    def test_disabled(self):
+        ItemManager(InnerItemManager()).batch([Item()])
+
+    def test_broken_tracer(self):
+        def tracer(span):
+            raise ValueError("Broken")
+
+        for tracer in (tracer, OtelTracer(BrokenOtelSpan)):
+            it_mgr = ItemManager(InnerItemManager(), tracer)
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual([], list(it_mgr.fetch_multi(["uid"]).data))
+            with self.assertWarns(RuntimeWarning), self.assertRaises(RuntimeError):
+                it_mgr.batch([])
+
+    def test_worker_threads(self):
+        etebase.etebase_python.Transport  # Loaded before patching, so that it doesn't replace the patch
+        native = Native(etebase.etebase_python)
+        spans = []
+        with mock.patch.object(etebase, "etebase_python", native):
+            it_mgr = ItemManager(InnerItemManager(native.counter), spans.append)
+            it_mgr.fetch_multi_changed({"uid{}".format(i): "etag" for i in range(30)}, chunk_size=10, max_in_flight=3)
+            # The requests were made by the worker threads
+            self.assertEqual(0, native.counter.requests)
+            it_mgr.fetch_multi(["uid"])
+        self.assertEqual({"ItemManager.fetch_multi_changed": 3, "ItemManager.fetch_multi": 1},
+                         {span.name: span.http_requests for span in spans})
+        self.assertEqual(["ItemManager.fetch_multi_changed"] * 3 + [None, None], [span.parent for span in spans])
+
+        tracer = OtelTracer()
+        ItemManager(InnerItemManager(), tracer).fetch_multi_changed({"uid1": "etag", "uid2": "etag"}, chunk_size=1)
+        outer = tracer.spans[0]
+        self.assertEqual("ItemManager.fetch_multi_changed", outer.name)
+        self.assertEqual([outer, outer], [span.parent for span in tracer.spans[1:]])
+        self.assertIsNone(tracer.current.get())
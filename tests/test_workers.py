@@ -0,0 +1,66 @@
+import os
+import unittest
+from etebase.sync import SyncResult
+from etebase.workers import HashRing, WorkerPool
+
+STORED_SESSION = "gqd2ZXJzaW9uAa1lbmNyeXB0ZWREYXRhxQGr_KWyDChQ6tXOJwJKf0Kw3QyR99itPIF3vZ5w6pVXSIq7AWul3fIXjIZOsBEwTVRumw7e9Af38D5oIL2VLNPLlmTOMjzIvuB00z3zDMFbH8pwrg2p_FvAhLHGjUGoXzU2XIxS4If7rQUfEz1zWkHPqWMrj4hACML5fks302dOUw7OsSMekcQaaVqMyj82MY3lG2qj8CL6ykSED7nW6OYWwMBJ1rSDGXhQRd5JuCGl6kgAHxKS6gkkIAWeUKjC6-Th2etk1XPKDiks0SZrQpmuXG8h_TBdd4igjRUqnIk09z5wvJFViXIU4M3pQomyFPk3Slh7KHvWhzxG0zbC2kUngQZ5h-LbVTLuT_TQWjYmHiOIihenrzl7z9MLebUq6vuwusZMRJ1Atau0Y2HcOzulYt4tLRP49d56qFEId3R4xomZ666hy-EFodsbzpxEKHeBUro3_gifOOKR8zkyLKTRz1UipZfKvnWk_RHFgZlSClRsXyaP34wstUavSiz-HNmTEmflNQKM7Awfel108FcSbW9NQAogW2Y2copP-P-R-DiHThrXmgDsWkTQFA"
+
+
+def fake_sync(session, col_type, checkpoints):
+    if checkpoints.get("die"):
+        os._exit(1)
+    result = SyncResult()
+    result.items = int(checkpoints.get("collections", 0)) + 1
+    checkpoints["collections"] = str(result.items)
+    return result
+
+
+class TestHashRing(unittest.TestCase):
+    def test_rebalance(self):
+        keys = ["account{}".format(i) for i in range(1000)]
+        ring = HashRing(range(4))
+        before = {key: ring.node_for(key) for key in keys}
+        counts = [list(before.values()).count(node) for node in range(4)]
+        self.assertTrue(all(150 < count < 350 for count in counts), counts)
+
+        ring.remove(2)
+        after = {key: ring.node_for(key) for key in keys}
+        self.assertEqual(3, len(ring))
+        self.assertNotIn(2, after.values())
+        self.assertTrue(all(after[key] == node for key, node in before.items() if node != 2))
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_sync(self):
+        accounts = {"account{}".format(i): (STORED_SESSION, {"collections": str(i)}) for i in range(10)}
+        with WorkerPool("some.coltype", num_workers=2, sync=fake_sync) as pool:
+            results = pool.sync(accounts)
+        self.assertEqual(set(accounts), set(results))
+        self.assertIsNone(results["account3"].error)
+        self.assertEqual(4, results["account3"].items)
+        self.assertEqual({"collections": "4"}, results["account3"].checkpoints)
+
+    def test_dead_workers(self):
+        accounts = {"account{}".format(i): (STORED_SESSION, {}) for i in range(20)}
+        accounts["bad"] = (STORED_SESSION, {"die": "1"})
+        with WorkerPool("some.coltype", num_workers=3, sync=fake_sync) as pool:
+            results = pool.sync(accounts)
+            self.assertEqual(3, pool.num_workers)
+            self.assertTrue(all(worker.process.is_alive() for worker in pool._workers.values()))
+            # The replacement takes over the accounts of the dead worker
+            del accounts["bad"]
+            self.assertEqual(set(accounts), set(pool.sync(accounts)))
+        self.assertEqual("The worker died", results.pop("bad").error)
+        self.assertEqual(20, len(results))
+        self.assertTrue(all(result.error is None for result in results.values()))
+
+    def test_killed_between_syncs(self):
+        accounts = {"account{}".format(i): (STORED_SESSION, {}) for i in range(10)}
+        with WorkerPool("some.coltype", num_workers=2, sync=fake_sync) as pool:
+            for worker in pool._workers.values():
+                worker.process.terminate()
+                worker.process.join()
+            results = pool.sync(accounts)
+            self.assertEqual(2, pool.num_workers)
+        self.assertEqual(set(accounts), set(results))
+        self.assertTrue(all(result.error is None for result in results.values()))
@@ -0,0 +1,35 @@
+import unittest
+from etebase import Item, ItemListResponse
+
+
+class Inner:
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    def get_data(self):
+        self.calls += 1
+        return self.data
+
+
+class TestWrappers(unittest.TestCase):
+    def test_slots(self):
+        item = Item(object())
+        self.assertFalse(hasattr(item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            item.something = 1
+
+    def test_lazy_data(self):
+        natives = [object() for _ in range(5)]
+        inner = Inner(natives)
+        response = ItemListResponse(inner)
+        data = response.data
+        self.assertIs(data, response.data)
+        self.assertEqual(5, len(data))
+        self.assertEqual([None] * 5, data._wrapped)
+        self.assertIs(natives[3], data[3]._inner)
+        self.assertIs(data[3], data[-2])
+        self.assertEqual(natives[1:3], [item._inner for item in data[1:3]])
+        self.assertEqual(natives, [item._inner for item in data])
+        self.assertEqual(list(data), list(response.data))
+        self.assertEqual(1, inner.calls)
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+import unittest
+from etebase.writeback import WriteBehindQueue
+
+
+class Obj:
+    def __init__(self, uid, etag="0", content=""):
+        self.uid = uid
+        self.etag = etag
+        self.content = content
+
+
+class Manager:
+    def __init__(self):
+        self.server = {}
+        self.calls = []
+        self.down = False
+
+    def transaction(self, items, deps):
+        self.calls.append([item.uid for item in items])
+        if self.down:
+            raise RuntimeError("Connection refused")
+        for item in items + (deps or []):
+            if self.server.get(item.uid, ("0", None))[0] != item.etag:
+                raise RuntimeError("Conflict: wrong etag for " + item.uid)
+        for item in items:
+            item.etag = str(int(item.etag) + 1)
+            self.server[item.uid] = (item.etag, item.content)
+
+    def cache_save(self, item):
+        return "{}|{}|{}".format(item.uid, item.etag, item.content).encode()
+
+    def cache_load(self, cached):
+        return Obj(*bytes(cached).decode().split("|"))
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    def test_coalesce(self):
+        mgr = Manager()
+        queue = WriteBehindQueue(mgr, max_delay=None)
+        item = Obj("a")
+        for i in range(5):
+            item.content = str(i)
+            queue.put(item)
+        queue.put(Obj("b"))
+        self.assertEqual(2, len(queue))
+        self.assertEqual(["a", "b"], queue.flush().uploaded)
+        self.assertEqual([["a", "b"]], mgr.calls)
+        self.assertEqual(("1", "4"), mgr.server["a"])
+        self.assertEqual(0, len(queue))
+
+    def test_conflicts(self):
+        mgr = Manager()
+        mgr.server["c"] = ("5", "theirs")
+        conflicts = []
+        queue = WriteBehindQueue(mgr, max_delay=None, on_conflict=lambda item, e: conflicts.append(item.uid))
+        for uid in "abcd":
+            queue.put(Obj(uid))
+        result = queue.flush()
+        self.assertEqual(["a", "b", "d"], sorted(result.uploaded))
+        self.assertEqual(["c"], list(result.conflicts))
+        self.assertEqual(["c"], conflicts)
+        self.assertEqual(0, len(queue))
+
+    def test_deps(self):
+        mgr = Manager()
+        mgr.server["parent"] = ("1", "")
+        queue = WriteBehindQueue(mgr, max_delay=None)
+        queue.put(Obj("a"), deps=[Obj("parent", "0")])
+        self.assertEqual(["a"], list(queue.flush().conflicts))
+
+    def test_errors_keep_pending(self):
+        mgr = Manager()
+        mgr.down = True
+        queue = WriteBehindQueue(mgr, max_delay=None)
+        queue.put(Obj("a"))
+        with self.assertRaises(RuntimeError):
+            queue.flush()
+        self.assertEqual(1, len(queue))
+        mgr.down = False
+        self.assertEqual(["a"], queue.flush().uploaded)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "pending.db")
+            mgr = Manager()
+            queue = WriteBehindQueue(mgr, path, max_delay=None)
+            queue.put(Obj("a", content="edited"))
+            queue.close(flush=False)
+
+            queue = WriteBehindQueue(mgr, path, max_delay=None)
+            self.assertEqual(1, len(queue))
+            queue.close()
+            self.assertEqual(("1", "edited"), mgr.server["a"])
+            queue = WriteBehindQueue(mgr, path, max_delay=None)
+            self.assertEqual(0, len(queue))
+            queue.close()
+
+    def test_background_flush(self):
+        mgr = Manager()
+        with WriteBehindQueue(mgr, max_pending=3, max_delay=10) as queue:
+            for uid in "abc":
+                queue.put(Obj(uid))
+            deadline = time.monotonic() + 5
+            while len(queue) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(0, len(queue))
+        self.assertEqual([["a", "b", "c"]], mgr.calls)